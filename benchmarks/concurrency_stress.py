@@ -0,0 +1,105 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+Stress test of the concurrent mode of `JsonFile`.
+
+Several processes, each with reader and writer threads, share one file for
+a fixed duration. Writers increment their own counter in a transaction
+(lock, reload if changed, change, write); readers read a counter with
+`get_entry`. The throughput of reads and writes is reported, and the final
+counters are checked against the number of writes, so a lost update fails
+the run.
+
+Usage:
+    python benchmarks/concurrency_stress.py [--processes 4] [--readers 8] [--writers 2]
+                                            [--duration 3] [--write-mode atomic]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ooj.file import JsonFile  # noqa: E402
+
+
+def worker(fp: str, process: int, readers: int, writers: int, duration: float,
+           write_mode: str, results: multiprocessing.Queue) -> None:
+    """ Runs the threads of one process and puts its (reads, writes) into the queue. """
+    file = JsonFile(fp, concurrent=True, write_mode=write_mode)
+    deadline = time.perf_counter() + duration
+    reads = [0] * readers
+    writes = [0] * writers
+
+    def read(slot: int) -> None:
+        while time.perf_counter() < deadline:
+            file.get_entry(f"p{process}w0")
+            reads[slot] += 1
+
+    def write(slot: int) -> None:
+        key = f"p{process}w{slot}"
+        while time.perf_counter() < deadline:
+            with file.transaction():
+                file.set_entry(key, file.get_entry(key) + 1)
+            writes[slot] += 1
+
+    threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+    threads += [threading.Thread(target=write, args=(slot,)) for slot in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    file.close()
+    results.put((sum(reads), sum(writes)))
+
+
+def run(processes: int, readers: int, writers: int, duration: float, write_mode: str) -> Tuple[int, int, bool]:
+    """ Returns the total reads, the total writes and whether no update was lost. """
+    with tempfile.TemporaryDirectory() as directory:
+        fp = os.path.join(directory, "state.json")
+        JsonFile(fp).write({f"p{p}w{w}": 0 for p in range(processes) for w in range(max(writers, 1))})
+
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [
+            context.Process(target=worker, args=(fp, p, readers, writers, duration, write_mode, results))
+            for p in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        totals = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+
+        reads = sum(total[0] for total in totals)
+        writes = sum(total[1] for total in totals)
+        consistent = sum(JsonFile(fp).read().values()) == writes
+        return reads, writes, consistent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--write-mode", choices=("direct", "atomic"), default="atomic")
+    args = parser.parse_args()
+
+    reads, writes, consistent = run(args.processes, args.readers, args.writers, args.duration, args.write_mode)
+    print(f"{'processes':>9} {'readers':>8} {'writers':>8} {'reads/s':>10} {'writes/s':>10} {'consistent':>11}")
+    print(f"{args.processes:>9} {args.readers:>8} {args.writers:>8} {reads / args.duration:>10.0f} "
+          f"{writes / args.duration:>10.0f} {str(consistent):>11}")
+    if not consistent:
+        sys.exit("Lost updates detected.")
+
+
+if __name__ == "__main__":
+    main()
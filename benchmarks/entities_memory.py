@@ -0,0 +1,78 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+Measures the memory used by the trees built with `TreeConverter.to_root_tree`.
+
+For every size, a nested document with about that many nodes (entries and
+subtrees, ten children per subtree) is converted to a `RootTree`, and the
+memory allocated by the conversion is reported in bytes per node.
+
+Usage:
+    python benchmarks/entities_memory.py [--sizes 10000 100000 1000000] [--fanout 10]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ooj.entities import TreeConverter  # noqa: E402
+
+
+def build_document(nodes: int, fanout: int) -> Tuple[Dict[str, Any], int]:
+    """ Builds a nested document with about `nodes` keys; returns it with its exact key count. """
+    count = 0
+    root: Dict[str, Any] = {}
+    level = [root]
+
+    while count < nodes:
+        next_level = []
+        for container in level:
+            for i in range(fanout):
+                if count >= nodes:
+                    break
+                count += 1
+                if count % 3:
+                    container[f"key{i}"] = count
+                else:
+                    child = container[f"tree{i}"] = {}
+                    next_level.append(child)
+        if not next_level:
+            break
+        level = next_level
+
+    return root, count
+
+
+def measure(nodes: int, fanout: int) -> Tuple[int, int]:
+    """ Returns the node count and the bytes allocated to convert the document. """
+    document, count = build_document(nodes, fanout)
+    gc.collect()
+
+    tracemalloc.start()
+    tree = TreeConverter.to_root_tree(document)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del tree
+    return count, allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--fanout", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>10} {'total (MiB)':>12} {'bytes/node':>11}")
+    for size in args.sizes:
+        count, allocated = measure(size, args.fanout)
+        print(f"{count:>10} {allocated / 2 ** 20:>12.1f} {allocated / count:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+Measures `diff` and `apply_patch` on documents with small changes.
+
+For every size, a nested document of records (`fanout` children per
+object, so its depth grows with the logarithm of the size) is converted to
+two trees, a few records of the second tree
+are changed, and the time to diff the trees and to apply the patch is
+reported. The content hashes are computed before the timed run, like after
+a previous diff or `content_hash` call, so unchanged subtrees are skipped
+and the diff time follows the number of changes rather than the size. A
+diff of the plain dictionaries is shown for comparison.
+
+Usage:
+    python benchmarks/patch_diff.py [--sizes 10000 100000 1000000] [--changes 10] [--fanout 32]
+"""
+
+import argparse
+import copy
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ooj.entities import TreeConverter  # noqa: E402
+from ooj.patch import apply_patch, diff  # noqa: E402
+
+
+def record_path(index: int, depth: int, fanout: int) -> Tuple[str, ...]:
+    """ Returns the keys of the record: its digits in base `fanout`, most significant first. """
+    keys = []
+    for _ in range(depth):
+        index, digit = divmod(index, fanout)
+        keys.append(f"n{digit}")
+    return tuple(reversed(keys))
+
+
+def build_document(records: int, fanout: int) -> Tuple[Dict[str, Any], int]:
+    """ Builds a document with `records` records, `fanout` children per object; returns it with its depth. """
+    depth = max(1, math.ceil(math.log(records, fanout)))
+    root: Dict[str, Any] = {}
+    for index in range(records):
+        *parents, key = record_path(index, depth, fanout)
+        node = root
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = {"id": index, "tags": ["a", "b"], "score": index / 2}
+    return root, depth
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def measure(records: int, changes: int, fanout: int) -> Dict[str, float]:
+    source, depth = build_document(records, fanout)
+    target = copy.deepcopy(source)
+    paths = [record_path(index, depth, fanout) for index in random.Random(records).sample(range(records), changes)]
+
+    source_tree = TreeConverter.to_root_tree(source)
+    target_tree = TreeConverter.to_root_tree(target)
+    source_tree.content_hash, target_tree.content_hash
+
+    for path in paths:
+        record = target
+        for key in path:
+            record = record[key]
+        record["score"] = -1
+        target_tree[path + ("score",)] = -1
+
+    start = time.perf_counter()
+    patch = diff(source_tree, target_tree)
+    tree_diff = time.perf_counter() - start
+
+    return {
+        "operations": len(patch),
+        "tree diff": tree_diff,
+        "dict diff": timed(diff, source, target),
+        "apply": timed(apply_patch, source_tree, patch),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--fanout", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'ops':>5} {'tree diff (ms)':>15} {'dict diff (ms)':>15} {'apply (ms)':>11}")
+    for size in args.sizes:
+        result = measure(size, args.changes, args.fanout)
+        print(f"{size:>10} {result['operations']:>5} {result['tree diff'] * 1000:>15.2f} "
+              f"{result['dict diff'] * 1000:>15.2f} {result['apply'] * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,24 @@ from .entities import (BaseTree, Entry,
                        Tree, TreeConverter)
 from .exceptions.exceptions import (SchemaException,
                                     ValidationException,
-                                    FileExtensionException)
-from .file import JsonFile
-from .serializer import Serializer
+                                    FileExtensionException,
+                                    PatchException,
+                                    QueryException)
+from .file import JsonFile, JsonLinesFile
+from .async_file import AsyncJsonFile
+from .serializer import CompiledDeserializer, Serializer
 from .schema import Schema
 from .field import Field
+from .patch import apply_patch, diff
+from .query import Query
 from .url import JsonURL
+from .http_cache import HttpCache
 
 __all__ = [
-    "JsonBase", "CyclicFieldError", "FileExtensionException", 
-    "NotSerializableException", "JsonFile", "BaseTree", "Entry", 
+    "JsonBase", "CyclicFieldError", "FileExtensionException", "PatchException", 
+    "QueryException", "Query", 
+    "NotSerializableException", "JsonFile", "AsyncJsonFile", "JsonLinesFile", "BaseTree", "Entry", 
     "JsonEntity", "RootTree", "Tree", "TreeConverter", 
-    "Field", "Schema", "Serializer", "JsonURL"
+    "Field", "Schema", "Serializer", "CompiledDeserializer", "JsonURL", "HttpCache",
+    "diff", "apply_patch"
 ]
\ No newline at end of file
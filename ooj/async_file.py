@@ -0,0 +1,202 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .entities import Entry, RootTree, _copy_plain
+from .file import JsonFile
+
+
+class AsyncJsonFile:
+    """
+    An asyncio front end of `JsonFile`. File I/O and JSON encoding and
+    decoding run in a bounded thread pool, so the event loop is never
+    blocked by them.
+
+    Concurrent writers are coalesced: `set_entry`, `del_entry` and `write`
+    change the in-memory buffer and wake a single background writer, which
+    encodes and writes the latest buffer. Changes that arrive while a write
+    is in progress wait for it and are then written together by the next
+    one, and every call returns once a write that includes its change has
+    finished.
+
+    Overlapping loads share one in-flight operation: concurrent `read` calls
+    parse the file once, and the buffer used by `get_entry` and the mutating
+    methods is loaded once.
+
+    The methods must be called from a single event loop.
+
+    Attributes:
+        file (JsonFile): The underlying file; its synchronous methods block.
+    """
+
+    def __init__(self,
+                 fp: Union[str, Path],
+                 executor: Optional[Executor] = None,
+                 max_workers: int = 2,
+                 **kwargs):
+        """
+        Initializes an AsyncJsonFile instance.
+
+        Args:
+            fp (Union[str, Path]): The path to the JSON file.
+            executor (Optional[Executor]): The executor for the blocking work. A thread
+                pool with `max_workers` threads is created (and shut down by `close`) if None.
+            max_workers (int): The size of the created thread pool. Defaults to 2.
+            **kwargs: The other arguments of `JsonFile` (encoding, indent, write_mode, codec, ...).
+
+        Raises:
+            ValueError: If the write mode is "write_behind"; writes are already coalesced.
+                Or if the concurrent mode is enabled; the buffer is changed without its locks.
+        """
+        if kwargs.get("write_mode") == "write_behind":
+            raise ValueError("AsyncJsonFile coalesces writes itself and can not use the write_behind mode.")
+        if kwargs.get("concurrent"):
+            raise ValueError("AsyncJsonFile can not use the concurrent mode.")
+
+        self.file = JsonFile(fp, **kwargs)
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix=f"ooj-async-{self.file.fp.name}")
+
+        # In-flight loads shared by overlapping callers, keyed by the operation.
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Mutations and the writer exclude each other with this lock, so a
+        # write always encodes a consistent buffer.
+        self._mutex: Optional[asyncio.Lock] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._writing = False
+        self._dirty = False
+
+    @property
+    def fp(self) -> Path:
+        """ Returns the path to the file. """
+        return self.file.fp
+
+    async def read(self) -> Dict:
+        """
+        Reads and decodes the file. Overlapping calls share one load and
+        receive the same dictionary, which must not be modified.
+        """
+        return await self._shared("read", self.file.read)
+
+    async def get_entry(self, key_s: Union[List[str], str]) -> Any:
+        """ Returns the value at the key path, loading the buffer first if needed. """
+        data = await self._load()
+        for key in self.file._normalize_keys(key_s):
+            if not isinstance(data, dict) or key not in data:
+                self.file._handle_exception(KeyError(f"Key '{key}' not found."))
+                return
+            data = data[key]
+        return data
+
+    async def set_entry(self, key_s: Union[List[str], str], value: Union[Any, Entry, RootTree]) -> None:
+        """ Sets the value at the key path and returns once the change is written. """
+        key_s = self.file._normalize_keys(key_s)
+        if isinstance(value, (Entry, RootTree)):
+            value = _copy_plain(value._shared_dict())
+
+        async with self._get_mutex():
+            buffer = await self._load()
+            self.file._set_in_buffer(key_s, value, buffer)
+        await self._schedule_write()
+
+    async def del_entry(self, key_s: Union[List[str], str]) -> None:
+        """ Deletes the key path and returns once the change is written. """
+        key_s = self.file._normalize_keys(key_s)
+        async with self._get_mutex():
+            buffer = await self._load()
+            if not self.file._del_in_buffer(key_s, buffer):
+                return
+        await self._schedule_write()
+
+    async def write(self, data: Union[Dict, RootTree]) -> None:
+        """ Replaces the data and returns once it is written. """
+        if isinstance(data, RootTree):
+            data = data.to_dict()
+        elif not isinstance(data, dict):
+            self.file._handle_exception(TypeError(f'Type {type(data)} not supported in write method.'))
+            return
+
+        async with self._get_mutex():
+            self.file._replace_buffer(data)
+        await self._schedule_write()
+
+    async def flush(self) -> None:
+        """ Waits until the pending changes are written. """
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    async def close(self) -> None:
+        """ Writes the pending changes, closes the file and shuts down the created thread pool. """
+        try:
+            await self.flush()
+        finally:
+            await self._run(self.file.close)
+            if self._owns_executor:
+                self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> 'AsyncJsonFile':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def _get_mutex(self) -> asyncio.Lock:
+        # Created lazily, so the lock belongs to the loop that uses the file.
+        if self._mutex is None:
+            self._mutex = asyncio.Lock()
+        return self._mutex
+
+    async def _run(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _shared(self, name: str, function: Callable, *args) -> Any:
+        """ Runs the function in the executor, joining the call already in flight under the same name. """
+        future = self._inflight.get(name)
+        if future is None:
+            future = asyncio.ensure_future(self._run(function, *args))
+            self._inflight[name] = future
+            future.add_done_callback(lambda _: self._inflight.pop(name, None))
+        # A cancelled caller must not cancel the load of the others.
+        return await asyncio.shield(future)
+
+    async def _load(self) -> Dict:
+        """
+        Returns the buffer. The freshness check stats the file, so it runs in
+        the executor too, together with the load of a missing or stale buffer.
+        """
+        buffer = self.file._get_buffer()
+        # While a write is in progress, the file may not match the buffer yet.
+        if buffer is not None and self._writing:
+            return buffer
+        return await self._shared("load", self.file._ensure_buffer)
+
+    async def _schedule_write(self) -> None:
+        """ Marks the buffer dirty, starts the writer if idle and waits for it. """
+        self._dirty = True
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._write_loop())
+        await asyncio.shield(self._writer)
+
+    async def _write_loop(self) -> None:
+        """ Writes the latest buffer until no change is pending. """
+        while self._dirty:
+            self._dirty = False
+            try:
+                # Mutations wait until the snapshot is encoded and written, so
+                # they never see the file half-way through the write.
+                async with self._get_mutex():
+                    self._writing = True
+                    try:
+                        payload = await self._run(self.file._encode, self.file._get_buffer())
+                        await self._run(self.file._write_payload, payload)
+                    finally:
+                        self._writing = False
+            except BaseException:
+                # The changes are still in the buffer; the next write retries them.
+                self._dirty = True
+                raise
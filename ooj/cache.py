@@ -0,0 +1,98 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of an LRUCache, shaped like `functools.lru_cache` info.
+    """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    A small thread-safe least-recently-used cache with a bounded size.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """
+        Initializes an LRUCache instance.
+
+        Args:
+            maxsize (int): The maximum number of entries. Defaults to 256.
+        """
+        if maxsize < 1:
+            raise ValueError(f"The cache size must be positive, got {maxsize}.")
+
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Returns the cached value for the key and marks it as recently used.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Optional[Any]): The value returned on a miss.
+
+        Returns:
+            Any: The cached value or the default.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """ Removes the key from the cache and returns its value. """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """ Removes all entries and resets the statistics. """
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """ Returns the hit/miss statistics of the cache. """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
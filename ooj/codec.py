@@ -0,0 +1,279 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+Pluggable JSON encoding and decoding backends.
+
+The standard library `json` module is always available. The default codec,
+"auto", decodes with the fastest importable backend (`orjson`, `ujson`) and
+encodes with the standard library, so the written documents do not depend on
+what is installed. Decoding errors are always reported as `json.JSONDecodeError`.
+
+The accelerated codecs can also be selected explicitly to encode faster. They
+fall back to the standard library for text with non-ASCII characters, for an
+indent other than 2 (orjson) and for values they can not encode, and reject
+values the standard library rejects, but their output is not the same in every
+case: floats with an exponent are formatted differently (`1e16` instead of
+`1e+16`), and orjson writes NaN and Infinity as null and encodes UUID and Enum
+values natively.
+
+An indent of None means compact output without any whitespace, which is the
+same in every backend.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, List, Optional, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - depends on the environment
+    ujson = None
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def _is_utf8(encoding: str) -> bool:
+    return codecs.lookup(encoding).name == "utf-8"
+
+
+class JsonCodec:
+    """
+    The interface of a JSON backend. The base implementation uses the
+    standard library `json` module.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        """
+        Encodes the object as JSON text.
+
+        Args:
+            obj (Any): The object to encode.
+            indent (Optional[int]): The indentation; None means compact output.
+
+        Returns:
+            str: The JSON text.
+        """
+        if indent is None:
+            return json.dumps(obj, separators=_COMPACT_SEPARATORS)
+        return json.dumps(obj, indent=indent)
+
+    def dumpb(self, obj: Any, indent: Optional[int] = None, encoding: str = "utf-8") -> bytes:
+        """
+        Encodes the object as JSON bytes.
+
+        Args:
+            obj (Any): The object to encode.
+            indent (Optional[int]): The indentation; None means compact output.
+            encoding (str): The encoding of the bytes. Defaults to "utf-8".
+
+        Returns:
+            bytes: The encoded JSON text.
+        """
+        return self.dumps(obj, indent).encode(encoding)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview], encoding: str = "utf-8") -> Any:
+        """
+        Decodes JSON text or bytes.
+
+        Args:
+            data (Union[str, bytes, bytearray, memoryview]): The JSON document.
+            encoding (str): The encoding of bytes input. Defaults to "utf-8".
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON.
+        """
+        if not isinstance(data, str):
+            data = bytes(data).decode(encoding)
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibCodec(JsonCodec):
+    """ The standard library `json` backend. """
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    The `orjson` backend. Supports compact output and an indent of 2; other
+    indents and values orjson can not encode are handled by the standard library.
+    Datetime, dataclass and subclass values are passed to the standard library
+    as well, which rejects them like it always does.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("The orjson package is not installed.")
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        data = self._dumpb(obj, indent)
+        if data is None:
+            return JsonCodec.dumps(self, obj, indent)
+        return data.decode("utf-8")
+
+    def dumpb(self, obj: Any, indent: Optional[int] = None, encoding: str = "utf-8") -> bytes:
+        data = self._dumpb(obj, indent) if _is_utf8(encoding) else None
+        if data is None:
+            return JsonCodec.dumps(self, obj, indent).encode(encoding)
+        return data
+
+    @staticmethod
+    def _dumpb(obj: Any, indent: Optional[int]) -> Optional[bytes]:
+        """ Returns the orjson output, or None if orjson can not produce the same document. """
+        if indent not in (None, 2):
+            return None
+        try:
+            data = orjson.dumps(obj, default=_reject, option=_ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+        except TypeError:
+            return None
+        # orjson can not escape non-ASCII characters like the standard library.
+        return data if data.isascii() else None
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview], encoding: str = "utf-8") -> Any:
+        if not isinstance(data, str) and not _is_utf8(encoding):
+            data = bytes(data).decode(encoding)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Report the error exactly like the standard library does.
+            return JsonCodec.loads(self, data, encoding)
+
+
+def _reject(obj: Any) -> Any:
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Hands the types orjson encodes natively but the standard library does not to `_reject`.
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if orjson is not None else 0
+)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    The `ujson` backend. Values ujson can not encode or decode are handled
+    by the standard library.
+    """
+
+    name = "ujson"
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("The ujson package is not installed.")
+
+    def dumps(self, obj: Any, indent: Optional[int] = None) -> str:
+        if indent is None:
+            try:
+                text = ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+                # Non-ASCII text is escaped by the standard library, like orjson output.
+                if text.isascii():
+                    return text
+            except (TypeError, OverflowError):
+                pass
+        return JsonCodec.dumps(self, obj, indent)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview], encoding: str = "utf-8") -> Any:
+        if not isinstance(data, str) and not _is_utf8(encoding):
+            data = bytes(data).decode(encoding)
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data, encoding)
+
+
+class AutoCodec(JsonCodec):
+    """
+    The default codec: decodes with the fastest importable backend and encodes
+    with the standard library, so the output is the same with or without an
+    accelerator installed.
+    """
+
+    name = "auto"
+
+    def __init__(self):
+        available = available_codecs()
+        self._decoder = get_codec(next(name for name in _AUTO_ORDER if name in available))
+
+    @property
+    def decoder(self) -> JsonCodec:
+        """ Returns the codec used for decoding. """
+        return self._decoder
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview], encoding: str = "utf-8") -> Any:
+        return self._decoder.loads(data, encoding)
+
+
+_CODECS: Dict[str, Type[JsonCodec]] = {
+    "json": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+}
+
+# The decoder preference order of the "auto" codec.
+_AUTO_ORDER = ("orjson", "ujson", "json")
+
+_instances: Dict[str, JsonCodec] = {}
+_default: Union[str, JsonCodec] = "auto"
+
+
+def available_codecs() -> List[str]:
+    """ Returns the names of the codecs whose backend is importable. """
+    modules = {"json": json, "orjson": orjson, "ujson": ujson}
+    return [name for name in _CODECS if modules[name] is not None]
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """
+    Returns a codec instance.
+
+    Args:
+        codec (Union[str, JsonCodec, None]): A codec instance, a codec name
+            ("json", "orjson", "ujson" or "auto", which decodes with the fastest
+            importable one), or None for the default codec.
+
+    Returns:
+        JsonCodec: The codec.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the backend of the named codec is not installed.
+    """
+    if codec is None:
+        codec = _default
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec != "auto" and codec not in _CODECS:
+        raise ValueError(f"Unknown JSON codec '{codec}', expected one of {['auto', *_CODECS]}.")
+
+    instance = _instances.get(codec)
+    if instance is None:
+        instance = _instances[codec] = AutoCodec() if codec == "auto" else _CODECS[codec]()
+    return instance
+
+
+def set_default_codec(codec: Union[str, JsonCodec]) -> None:
+    """
+    Sets the codec used by JsonFile, JsonLinesFile, JsonURL, Schema and
+    Serializer when no codec is passed explicitly.
+
+    Args:
+        codec (Union[str, JsonCodec]): A codec instance or name, see `get_codec`.
+    """
+    global _default
+    get_codec(codec)
+    _default = codec
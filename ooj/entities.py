@@ -1,101 +1,789 @@
 # (c) KiryxaTech, 2024. Apache License 2.0
 
+import copy
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+def _scalar_bytes(value: Any) -> bytes:
+    """
+    Returns a canonical byte form of a scalar, tagged with its JSON type, so
+    `True`, `1` and `1.0` map to different bytes although they are equal in Python.
+    """
+    if isinstance(value, bool):
+        return b"B1" if value else b"B0"
+    if isinstance(value, int):
+        return b"I" + repr(value).encode()
+    if isinstance(value, float):
+        return b"F" + repr(value).encode()
+    if isinstance(value, str):
+        return b"S" + value.encode("utf-8", "surrogatepass")
+    if value is None:
+        return b"Z"
+    return b"R" + repr(value).encode("utf-8", "surrogatepass")
+
+
+def _key_bytes(key: Any) -> bytes:
+    """ Returns the byte form of an object key, tagged with its type, so `1` and `"1"` differ. """
+    if type(key) is str:
+        return b"S" + key.encode("utf-8", "surrogatepass")
+    return _scalar_bytes(key)
+
+
+def _combine(children: Iterable[Tuple[bytes, bytes]]) -> bytes:
+    """ Hashes the (key bytes, digest) pairs of a mapping independently of their order. """
+    digest = hashlib.blake2b(b"T", digest_size=16)
+    for key_bytes, child_digest in sorted(children):
+        digest.update(len(key_bytes).to_bytes(8, "little"))
+        digest.update(key_bytes)
+        digest.update(child_digest)
+    return digest.digest()
+
+
+def _copy_plain(value: Any) -> Any:
+    """ Copies the dictionaries and lists of a JSON-like value with an explicit stack; scalars are shared. """
+    if not isinstance(value, (dict, list)):
+        return value
+
+    # Containers are copied shallowly first, then their nested containers are replaced by copies.
+    root = dict(value) if isinstance(value, dict) else list(value)
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in items:
+            if isinstance(item, dict):
+                item = container[key] = dict(item)
+                stack.append(item)
+            elif isinstance(item, list):
+                item = container[key] = list(item)
+                stack.append(item)
+    return root
+
+
+def _to_plain(array: list) -> list:
+    """ Copies a (nested) array, converting the entities inside it to their shared dictionaries. """
+    return [
+        item._shared_dict() if isinstance(item, JsonEntity)
+        else _to_plain(item) if isinstance(item, list)
+        else item
+        for item in array
+    ]
+
+
+def _copy_node(node: 'JsonEntity', key: str) -> 'JsonEntity':
+    """ Returns an independent copy of an entry or tree, stored under the key. """
+    if isinstance(node, BaseTree):
+        return TreeConverter.to_tree(key, copy.deepcopy(node._shared_dict()))
+    return Entry(key, copy.deepcopy(node._plain_value()))
+
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class _Keyed:
+    """ An entry inside a plain container, which hashes as the object `{key: value}`. """
+    __slots__ = ("entry",)
+
+    def __init__(self, entry: 'Entry') -> None:
+        self.entry = entry
+
+
+def _digest_children(node: Any) -> Tuple[Optional[str], List[bytes], List[Any]]:
+    """
+    Returns the kind of a node ("T" for objects, "L" for arrays, "V" for the
+    value of an entry, None for scalars), the key bytes and the children to hash.
+    """
+    # Plain values come first: checks against the entity classes are slower.
+    node_type = type(node)
+    if node_type is dict:
+        return "T", [_key_bytes(key) for key in node], [
+            _Keyed(item) if isinstance(item, Entry) else item for item in node.values()
+        ]
+    if node_type is list:
+        return "L", [], [_Keyed(item) if isinstance(item, Entry) else item for item in node]
+    if node_type in _SCALAR_TYPES:
+        return None, [], []
+    if isinstance(node, BaseTree):
+        if node._source is not None:
+            node = node._source
+        else:
+            return "T", [_key_bytes(key) for key in node._children], list(node._children.values())
+    if isinstance(node, Entry):
+        return "V", [], [node._value]
+    if isinstance(node, _Keyed):
+        return "T", [_key_bytes(node.entry._key)], [node.entry]
+    if isinstance(node, dict):
+        return "T", [_key_bytes(key) for key in node], [
+            _Keyed(item) if isinstance(item, Entry) else item for item in node.values()
+        ]
+    if isinstance(node, (list, tuple)):
+        return "L", [], [_Keyed(item) if isinstance(item, Entry) else item for item in node]
+    return None, [], []
+
+
+def _finish_digest(kind: str, keys: List[bytes], digests: List[bytes]) -> bytes:
+    if kind == "T":
+        return _combine(zip(keys, digests))
+    if kind == "L":
+        hasher = hashlib.blake2b(b"L", digest_size=16)
+        for digest in digests:
+            hasher.update(digest)
+        return hasher.digest()
+    return digests[0]
+
+
+def _value_digest(value: Any) -> bytes:
+    """
+    Returns the content digest of a plain JSON-like value, of a tree, or of
+    the value of an entry. The digests of trees and entries are cached on
+    them. The walk uses an explicit stack, so deep documents do not hit the
+    recursion limit.
+    """
+    kind, keys, children = _digest_children(value)
+    if kind is None:
+        return hashlib.blake2b(_scalar_bytes(value), digest_size=16).digest()
+
+    # Frames of [node, kind, keys, children, next child, child digests].
+    stack = [[value, kind, keys, children, 0, []]]
+    while True:
+        frame = stack[-1]
+        children, index, digests = frame[3], frame[4], frame[5]
+        while index < len(children):
+            child = children[index]
+            index += 1
+            child_type = type(child)
+            if child_type in _SCALAR_TYPES:
+                digests.append(hashlib.blake2b(_scalar_bytes(child), digest_size=16).digest())
+                continue
+            # Entries with scalar values are the most common children of trees.
+            if child_type is Entry and child._hash is None and type(child._value) in _SCALAR_TYPES:
+                child._hash = hashlib.blake2b(_scalar_bytes(child._value), digest_size=16).digest()
+            if isinstance(child, (Entry, BaseTree)) and child._hash is not None:
+                digests.append(child._hash)
+                continue
+            kind, keys, grandchildren = _digest_children(child)
+            if kind is None:
+                digests.append(hashlib.blake2b(_scalar_bytes(child), digest_size=16).digest())
+                continue
+            frame[4] = index
+            stack.append([child, kind, keys, grandchildren, 0, []])
+            break
+        else:
+            stack.pop()
+            node = frame[0]
+            digest = _finish_digest(frame[1], frame[2], digests)
+            if isinstance(node, (Entry, BaseTree)):
+                node._hash = digest
+            if not stack:
+                return digest
+            stack[-1][5].append(digest)
+
+
+def _as_mapping(value: Any) -> Optional[Dict[str, Any]]:
+    """ Returns an object-like value as a mapping of keys to values (subtrees stay wrapped), or None. """
+    if isinstance(value, BaseTree):
+        if value._source is not None:
+            return value._source
+        return {
+            key: child._value if isinstance(child, Entry) else child
+            for key, child in value._children.items()
+        }
+    if isinstance(value, Entry):
+        return {value._key: value._value}
+    if isinstance(value, dict):
+        return value
+    return None
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """
+    Compares entities and plain values the way their `to_dict()` results
+    would compare, with an explicit stack and stopping at the first difference.
+    """
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        if type(a) in _SCALAR_TYPES and type(b) in _SCALAR_TYPES:
+            if a != b:
+                return False
+            continue
+        if (isinstance(a, JsonEntity) and isinstance(b, JsonEntity)
+                and a._hash is not None and b._hash is not None and a._digest() == b._digest()):
+            continue
+
+        a_mapping, b_mapping = _as_mapping(a), _as_mapping(b)
+        if a_mapping is not None or b_mapping is not None:
+            if a_mapping is None or b_mapping is None or len(a_mapping) != len(b_mapping):
+                return False
+            for key, item in a_mapping.items():
+                if key not in b_mapping:
+                    return False
+                stack.append((item, b_mapping[key]))
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                return False
+            stack.extend(zip(a, b))
+        elif isinstance(a, (list, JsonEntity)) or isinstance(b, (list, JsonEntity)) or a != b:
+            return False
+    return True
 
 
 class JsonEntity(ABC):
+    """
+    Entities compare structurally with each other and with dictionaries, in
+    the way their `to_dict()` results would compare, but without building
+    them and stopping at the first difference.
+
+    `content_hash` is a Merkle-style digest of the content: a tree combines
+    the digests of its children, and every digest is cached until the node
+    or one of its descendants changes. The digest tells the JSON types of
+    scalars apart, so `True`, `1` and `1.0` hash differently. Equal entities
+    whose hashes are cached compare in constant time, and comparing
+    `content_hash` values tells whether a tree has changed. Mutating a value in place (e.g. a list stored
+    in an entry) is not tracked; assign a new value instead.
+    """
+
+    # Entities are created in large numbers by TreeConverter, so none of
+    # them carries a per-instance __dict__.
+    __slots__ = ("_parent", "_hash")
+
     def __str__(self):
-        return str(self.to_dict())
-    
+        return str(self._shared_dict())
+
     def __eq__(self, value: Union[Dict[str, Any], 'JsonEntity']) -> bool:
-        return str(self) == str(value)
-        
+        if not isinstance(value, (JsonEntity, dict)):
+            return NotImplemented
+        if self is value:
+            return True
+        # Equal digests imply equal content; different ones may still be
+        # equal in Python, e.g. `1 == 1.0`.
+        if (isinstance(value, JsonEntity) and self._hash is not None and value._hash is not None
+                and self._digest() == value._digest()):
+            return True
+        return self._equals(value)
+
     def __ne__(self, value: Union[Dict[str, Any], 'JsonEntity']) -> bool:
-        return str(self) != str(value)
-    
+        result = self.__eq__(value)
+        return result if result is NotImplemented else not result
+
+    # Entities are mutable.
+    __hash__ = None
+
+    @property
+    def content_hash(self) -> str:
+        """ Returns the hex digest of the content; cached until the entity changes. """
+        return self._digest().hex()
+
     @abstractmethod
     def to_dict(self) -> Dict: pass
 
+    @abstractmethod
+    def _shared_dict(self) -> Dict:
+        """ Returns the dictionary of the entity without copying it; it must not be modified. """
+
+    @abstractmethod
+    def _equals(self, value: Union[Dict[str, Any], 'JsonEntity']) -> bool: pass
+
+    @abstractmethod
+    def _digest(self) -> bytes: pass
+
+    def _invalidate(self) -> None:
+        """ Drops the cached hashes and dictionaries of the entity and its ancestors. """
+        self._drop_caches()
+        node = self._parent
+        while node is not None and node._drop_caches():
+            node = node._parent
+
+    def _drop_caches(self) -> bool:
+        """
+        Drops the cached values of this node; returns False if nothing was
+        cached, since then none of its ancestors has cached values either.
+        """
+        self._hash = None
+        return True
+
 
 class Entry(JsonEntity):
+    # `_nested` is True when the value is an array that contains entities.
+    __slots__ = ("_key", "_value", "_nested")
+
     def __init__(self, key: str, value: Any) -> None:
-        self.key = key
-        self.value = value
+        self._parent = None
+        self._hash = None
+        self._key = key
+        self._value = value
+        self._nested = isinstance(value, list) and self._adopt(value)
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @key.setter
+    def key(self, key: str) -> None:
+        old_key, self._key = self._key, key
+        if self._parent is not None:
+            self._parent._rekey(old_key, self)
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+        self._nested = isinstance(value, list) and self._adopt(value)
+        # An entry caches no dictionary, so the invalidation always
+        # continues to the parent.
+        self._invalidate()
 
     def __str__(self):
-        return str(self.to_dict())
-    
+        return str(self._shared_dict())
+
     def __iter__(self):
         return iter(self.to_dict().items())
-    
+
     def to_dict(self):
-        return {self.key: self.value}
+        if self._nested:
+            # The trees inside the array share their cached dictionaries.
+            return {self._key: _copy_plain(self._plain_value())}
+        return {self._key: self._value}
+
+    def _shared_dict(self) -> Dict:
+        return {self._key: self._plain_value()}
+
+    def _plain_value(self) -> Any:
+        """ Returns the value with the trees inside arrays converted to dictionaries. """
+        if not self._nested:
+            return self._value
+        return _to_plain(self._value)
+
+    def _adopt(self, array: list) -> bool:
+        """ Links the entities inside the (nested) array to the entry; returns True if there are any. """
+        found = False
+        arrays = [array]
+        while arrays:
+            for item in arrays.pop():
+                if isinstance(item, JsonEntity):
+                    item._parent = self
+                    found = True
+                elif isinstance(item, list):
+                    arrays.append(item)
+        return found
+
+    def _equals(self, value: Union[Dict[str, Any], JsonEntity]) -> bool:
+        return _equal(self, value)
+
+    def _value_digest(self) -> bytes:
+        """ Returns the cached digest of the entry value. """
+        if self._hash is None:
+            self._hash = _value_digest(self)
+        return self._hash
+
+    def _digest(self) -> bytes:
+        return _combine([(_key_bytes(self._key), self._value_digest())])
+
+
+KeyPath = Union[str, Tuple[str, ...], List[str]]
+
+
+class TreeChildren(Sequence):
+    """
+    A live, read-only view of the children of a tree in insertion order.
+    The tree is changed with `add`, `remove` or by assigning `tree.tree`.
+    """
+
+    __slots__ = ("_tree",)
+
+    def __init__(self, tree: 'BaseTree') -> None:
+        self._tree = tree
+
+    def __len__(self) -> int:
+        return len(self._tree._entries)
+
+    def __getitem__(self, index):
+        children = list(self._tree._entries.values())
+        return children[index]
+
+    def __iter__(self) -> Iterator[Union[Entry, 'BaseTree']]:
+        return iter(self._tree._entries.values())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (TreeChildren, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TreeChildren({list(self)!r})"
+
+    def _read_only(self, *args, **kwargs) -> None:
+        raise TypeError("The children of a tree are read-only; use add(), remove() or assign tree.tree.")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = _read_only
 
 
 class BaseTree(JsonEntity):
+    """
+    A tree of entries and subtrees indexed by key. Children keep their
+    insertion order; adding a child with an existing key replaces it in place.
+
+    Children can be accessed by key or by path: `tree["a", "b"]`,
+    `tree[["a", "b"]]` or `tree["a.b"]` (a dotted path is only split when
+    no child has the whole string as its key). Reading a path returns the
+    value of an entry or the subtree itself.
+
+    A node belongs to one tree at a time: adding a node that belongs to
+    another tree adds a copy of it, and assigning a RootTree adds a copy of
+    its children. Remove a node from its tree first to move it.
+
+    A lazy tree (see `TreeConverter`) keeps its source dictionary in
+    `_source` and converts its children on first access.
+
+    `to_dict()` caches the dictionary of every subtree. A change marks the
+    changed tree and its ancestors dirty, so the next call rebuilds only the
+    dictionaries on the changed path and reuses the others, and returns a
+    copy of the cached dictionary, so the caller may change it freely.
+    """
+
+    __slots__ = ("_children", "_source", "_dict")
+
     def __init__(self, *entries: Union[Entry, 'BaseTree']) -> None:
-        self.tree: List[Union[Entry, 'BaseTree']] = list(entries)
+        self._parent = None
+        self._hash = None
+        self._source: Union[Dict[str, Any], None] = None
+        self._dict: Union[Dict[str, Any], None] = None
+        self._children: Dict[str, Union[Entry, 'BaseTree']] = {}
+        for entry in entries:
+            self.add(entry)
+
+    @property
+    def _entries(self) -> Dict[str, Union[Entry, 'BaseTree']]:
+        """ Returns the children index, converting the source of a lazy tree first. """
+        if self._source is not None:
+            self._materialize()
+        return self._children
+
+    def _drop_caches(self) -> bool:
+        if self._hash is None and self._dict is None:
+            return False
+        self._hash = None
+        self._dict = None
+        return True
+
+    def _materialize(self) -> None:
+        """ Converts the children of a lazy tree; grandchildren stay lazy. """
+        source, self._source = self._source, None
+        # Children without cached values are created, so the cached values of
+        # this tree and its ancestors can not be kept.
+        self._invalidate()
+        TreeConverter._convert_level(self, source, None, lazy=True)
 
     def __str__(self) -> str:
-        return str(self.to_dict())
+        return str(self._shared_dict())
+
+    @property
+    def tree(self) -> TreeChildren:
+        """
+        Returns a live, read-only view of the children in insertion order.
+        Mutating the view raises TypeError; change the tree with `add`,
+        `remove` or by assigning a new list of children.
+        """
+        return TreeChildren(self)
+
+    @tree.setter
+    def tree(self, entries: Iterable[Union[Entry, 'BaseTree']]) -> None:
+        entries = list(entries)
+        for entry in self._entries.values():
+            entry._parent = None
+        self._children = {}
+        self._invalidate()
+        for entry in entries:
+            self.add(entry)
 
     def add(self, entry: Union[Entry, 'BaseTree']):
-        self.tree.append(entry)
+        key = getattr(entry, "key", None)
+        if not isinstance(entry, (Entry, BaseTree)) or key is None:
+            raise TypeError(f"Only entries and keyed trees can be added, got {type(entry).__name__}.")
+        self._attach(key, entry)
 
     def remove(self, key: str):
-        self.tree = [entry for entry in self.tree if not (isinstance(entry, Entry) and entry.key == key)]
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry._parent = None
+            self._invalidate()
+
+    def get(self, key_s: KeyPath, default: Any = None) -> Any:
+        """ Returns the value or subtree at the key path, or the default if it is missing. """
+        try:
+            return self[key_s]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key_s: KeyPath) -> Any:
+        child = self._child(key_s)
+        return child.value if isinstance(child, Entry) else child
+
+    def __setitem__(self, key_s: KeyPath, value: Any) -> None:
+        """
+        Sets the value at the key path, creating missing subtrees. Entries and
+        trees are stored under the last key, dictionaries become subtrees and
+        other values update or create an entry.
+        """
+        keys = self._split(key_s)
+        parent = self
+        for key in keys[:-1]:
+            child = parent._entries.get(key)
+            if not isinstance(child, BaseTree):
+                child = Tree(key)
+                parent._attach(key, child)
+            parent = child
+
+        key = keys[-1]
+        if isinstance(value, RootTree):
+            # The children stay with the root tree.
+            parent._attach(key, _copy_node(value, key))
+        elif isinstance(value, Tree):
+            if value._parent is None:
+                value.key = key
+            parent._attach(key, value)
+        elif isinstance(value, Entry):
+            parent._attach(key, value if value.key == key else _copy_node(value, key))
+        elif isinstance(value, dict):
+            parent._attach(key, TreeConverter.to_tree(key, value))
+        else:
+            child = parent._entries.get(key)
+            if isinstance(child, Entry):
+                child.value = value
+            else:
+                parent._attach(key, Entry(key, value))
+
+    def __delitem__(self, key_s: KeyPath) -> None:
+        keys = self._split(key_s)
+        parent = self._child(keys[:-1]) if len(keys) > 1 else self
+        if not isinstance(parent, BaseTree) or keys[-1] not in parent._entries:
+            raise KeyError(keys[-1])
+        parent.remove(keys[-1])
+
+    def __contains__(self, key_s: KeyPath) -> bool:
+        try:
+            self._child(key_s)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        if self._source is not None:
+            return len(self._source)
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        # A tree is an object, so an empty one is still truthy.
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def _attach(self, key: str, entry: Union[Entry, 'BaseTree']) -> None:
+        """ Stores the child under the key and links it to this tree; a child of another tree is copied. """
+        previous = self._entries.get(key)
+        if previous is not entry and entry._parent is not None:
+            entry = _copy_node(entry, key)
+        if previous is not None and previous is not entry:
+            previous._parent = None
+        self._entries[key] = entry
+        entry._parent = self
+        self._invalidate()
+
+    def _rekey(self, old_key: str, entry: Union[Entry, 'BaseTree']) -> None:
+        """ Moves a renamed child to its new key, keeping its position. """
+        if self._entries.get(old_key) is not entry:
+            return
+        self._children = {
+            (entry.key if key == old_key else key): child
+            for key, child in self._entries.items()
+            if key != entry.key or key == old_key
+        }
+        self._invalidate()
+
+    def _split(self, key_s: KeyPath) -> List[str]:
+        """ Converts a key, a dotted path or a sequence of keys to a list of keys. """
+        if isinstance(key_s, str):
+            if key_s in self._entries or "." not in key_s:
+                return [key_s]
+            return key_s.split(".")
+        keys = list(key_s)
+        if not keys:
+            raise KeyError("The key path is empty.")
+        return keys
+
+    def _child(self, key_s: KeyPath) -> Union[Entry, 'BaseTree']:
+        """ Returns the entry or subtree at the key path. """
+        node = self
+        for key in self._split(key_s):
+            if not isinstance(node, BaseTree):
+                raise KeyError(key)
+            try:
+                node = node._entries[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return node
+
+    def _equals(self, value: Union[Dict[str, Any], JsonEntity]) -> bool:
+        return _equal(self, value)
+
+    def _digest(self) -> bytes:
+        if self._hash is None:
+            self._hash = _value_digest(self)
+        return self._hash
 
     def to_dict(self) -> Dict:
-        dictionary = {}
+        """ Returns the tree as a new dictionary, which the caller may change freely. """
+        return _copy_plain(self._shared_dict())
+
+    def _shared_dict(self) -> Dict:
+        # An untouched lazy tree shares its source dictionary.
+        if self._source is not None:
+            return self._source
+        if self._dict is not None:
+            return self._dict
 
-        for entry in self.tree:
-            if isinstance(entry, Entry):
-                dictionary.update(entry.to_dict())
-            elif isinstance(entry, BaseTree):
-                dictionary[entry.key] = entry.to_dict()
+        # Build the dirty subtrees bottom-up with an explicit stack.
+        stack = [self]
+        while stack:
+            tree = stack[-1]
+            dirty = [
+                entry for entry in tree._children.values()
+                if isinstance(entry, BaseTree) and entry._source is None and entry._dict is None
+            ]
+            if dirty:
+                stack.extend(dirty)
+                continue
 
-        return dictionary
+            dictionary = {}
+            for key, entry in tree._children.items():
+                if isinstance(entry, Entry):
+                    dictionary[key] = entry._plain_value()
+                else:
+                    dictionary[key] = entry._shared_dict()
+
+            tree._dict = dictionary
+            stack.pop()
+
+        return self._dict
 
 
 class RootTree(BaseTree):
+    __slots__ = ()
+
     def __init__(self, *entries: Union[Entry, 'BaseTree']) -> None:
         super().__init__(*entries)
 
 
 class Tree(BaseTree):
+    __slots__ = ("_key",)
+
     def __init__(self, key: str, *entries: Union[Entry, 'BaseTree']) -> None:
+        self._key = key
         super().__init__(*entries)
-        self.key = key
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @key.setter
+    def key(self, key: str) -> None:
+        old_key, self._key = self._key, key
+        if self._parent is not None:
+            self._parent._rekey(old_key, self)
 
 
 class TreeConverter:
+    """
+    Converts dictionaries to trees. Nested dictionaries become `Tree`s and
+    dictionaries inside arrays become `RootTree` items. The conversion uses
+    an explicit stack, so the depth of a document is not limited by the
+    recursion limit.
+
+    With `lazy=True`, a tree keeps a reference to its source dictionary and
+    converts the children of a level only when they are first accessed, so
+    wrapping a huge decoded document is instant. An untouched lazy tree
+    returns the source dictionary itself from `to_dict()`.
+    """
+
     @classmethod
-    def to_root_tree(cls, json_data: dict) -> RootTree:
+    def to_root_tree(cls, json_data: dict, lazy: bool = False) -> RootTree:
         root_tree = RootTree()
-        
-        for key, value in json_data.items():
-            if isinstance(value, dict):
-                subtree = cls.to_tree(key, value)
-                root_tree.add(subtree)
-            else:
-                root_tree.add(Entry(key, value))
-
+        cls._fill(root_tree, json_data, lazy)
         return root_tree
 
     @classmethod
-    def to_tree(cls, key: str, json_data: dict) -> Tree:
+    def to_tree(cls, key: str, json_data: dict, lazy: bool = False) -> Tree:
         tree = Tree(key)
-        
-        for entry_key, entry_value in json_data.items():
-            if isinstance(entry_value, dict):
-                subtree = cls.to_tree(entry_key, entry_value)
-                tree.add(subtree)
-            else:
-                tree.add(Entry(entry_key, entry_value))
-        
+        cls._fill(tree, json_data, lazy)
         return tree
     
     @classmethod
     def to_dict(cls, json_object: Union[Entry, Tree, RootTree]) -> Dict:
-        return dict(json_object)
\ No newline at end of file
+        return json_object.to_dict()
+
+    @classmethod
+    def _fill(cls, tree: BaseTree, json_data: dict, lazy: bool) -> None:
+        """ Converts the dictionary into the children of an empty tree. """
+        if lazy:
+            tree._source = json_data
+            return
+
+        stack = [(tree, json_data)]
+        while stack:
+            tree, json_data = stack.pop()
+            cls._convert_level(tree, json_data, stack, lazy=False)
+
+    @classmethod
+    def _convert_level(cls, tree: BaseTree, json_data: dict, stack: Optional[list], lazy: bool) -> None:
+        """
+        Converts one level of the dictionary into the children of the tree.
+        Nested dictionaries become lazy trees or are pushed on the stack.
+        """
+        children = tree._children
+        for key, value in json_data.items():
+            if isinstance(value, dict):
+                child = Tree(key)
+                if lazy:
+                    child._source = value
+                else:
+                    stack.append((child, value))
+            elif isinstance(value, list):
+                child = Entry(key, cls._convert_array(value, stack, lazy))
+            else:
+                child = Entry(key, value)
+
+            child._parent = tree
+            children[key] = child
+
+    @classmethod
+    def _convert_array(cls, array: list, stack: Optional[list], lazy: bool) -> list:
+        """ Copies a (nested) array, turning the dictionaries inside it into root trees. """
+        result = []
+        arrays = [(result, array)]
+        while arrays:
+            target, source = arrays.pop()
+            for item in source:
+                if isinstance(item, dict):
+                    tree = RootTree()
+                    if lazy:
+                        tree._source = item
+                    else:
+                        stack.append((tree, item))
+                    target.append(tree)
+                elif isinstance(item, list):
+                    nested = []
+                    target.append(nested)
+                    arrays.append((nested, item))
+                else:
+                    target.append(item)
+        return result
@@ -1,5 +1,7 @@
 from .exceptions import (
     SchemaException,
     ValidationException,
-    FileExtensionException
+    FileExtensionException,
+    PatchException,
+    QueryException
 )
\ No newline at end of file
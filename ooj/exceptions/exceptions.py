@@ -15,4 +15,17 @@ class SchemaException(Exception):
 class ValidationException(Exception):
     def __init__(self, message: str = None) -> None:
         self.message = message or "The data does not match the schema."
+        super().__init__(message)
+
+
+class PatchException(Exception):
+    def __init__(self, message: str = None) -> None:
+        self.message = message or "The patch can not be applied."
+        super().__init__(message)
+
+
+
+class QueryException(Exception):
+    def __init__(self, message: str = None) -> None:
+        self.message = message or "The query is invalid."
         super().__init__(message)
\ No newline at end of file
@@ -1,33 +1,133 @@
 # (c) KiryxaTech, 2024. Apache License 2.0
 
-import json
-from typing import Any, Dict, List, Union
+import hashlib
+import os
+import threading
+from array import array
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from pathlib import Path
 
+from . import stream
+from .codec import JsonCodec, get_codec
 from .base import JsonBase, Readable, Writable
-from .entities import RootTree, Entry, TreeConverter
+from .entities import RootTree, Entry, TreeConverter, _copy_plain
 from .exceptions import FileExtensionException
+from .locking import ProcessLock, ReadWriteLock
+from .offset_index import OffsetIndex
+from .patch import apply_patch, diff
+from .query import Query
+from .record_index import RecordIndex
+from .storage import Journal, WriteBehindFlusher, atomic_write
+
+
+def _stat_signature(fp: Path):
+    """ Returns the (mtime_ns, size, inode) of the file, or None if it is missing. """
+    try:
+        stat = os.stat(fp)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+_NO_LOCK = nullcontext()
 
 
 class JsonFile(JsonBase, Readable, Writable):
+    WRITE_MODES = ("direct", "atomic", "write_behind")
+    READ_MODES = ("buffer", "mmap")
+
+    # The ratio threshold is ignored for journals smaller than this.
+    JOURNAL_MIN_COMPACT_SIZE = 64 * 1024
+
     def __init__(self,
                  fp: Union[str, Path],
                  encoding: str = "utf-8",
                  indent: int = 4,
-                 ignore_errors: List[Exception] = None):
+                 ignore_errors: List[Exception] = None,
+                 write_mode: str = "direct",
+                 flush_interval: float = 1.0,
+                 flush_threshold: int = 100,
+                 fsync: bool = True,
+                 journal: bool = False,
+                 journal_max_size: int = 4 * 1024 * 1024,
+                 journal_max_ratio: float = 1.0,
+                 read_mode: str = "buffer",
+                 index_keys: Optional[List[List[str]]] = None,
+                 persist_index: bool = False,
+                 codec: Union[str, JsonCodec, None] = None,
+                 concurrent: bool = False):
         """
         Arguments:
         - fp (Union[str, Path]): Path to save data (if None, data is not saved)
         - encoding (str): Encoding for reading/writing files
-        - indent (int): Indentation for JSON formatting
+        - indent (int): Indentation for JSON formatting; None writes compact JSON without whitespace
         - ignore_errors (List[Exceptions]): List of exceptions to ignore during read/write operations
+        - write_mode (str): How writes reach the disk:
+            "direct" - the file is rewritten in place (default);
+            "atomic" - the data is written to a temporary file, fsynced and renamed over the file;
+            "write_behind" - writes only update the buffer, and a background thread
+            atomically flushes the latest buffer (see `flush_interval` and `flush_threshold`)
+        - flush_interval (float): Maximal delay in seconds of a write-behind flush
+        - flush_threshold (int): Number of pending writes that triggers an immediate write-behind flush
+        - fsync (bool): Whether atomic and write-behind writes are flushed to disk with fsync
+        - journal (bool): Whether `set_entry`/`del_entry` append small patch records to a
+            sidecar journal (`<file>.journal`) instead of rewriting the file. The journal is
+            replayed over the file on open and compacted into it when it grows too large
+        - journal_max_size (int): Journal size in bytes that triggers a compaction
+        - journal_max_ratio (float): Journal size relative to the file size that triggers
+            a compaction (once the journal is at least `JOURNAL_MIN_COMPACT_SIZE` bytes)
+        - read_mode (str): How `get_entry` reads a file whose buffer is not loaded:
+            "buffer" - the whole file is decoded into the buffer (default);
+            "mmap" - the file is memory-mapped and only the bytes of the requested
+            value are decoded, using a byte-offset index of the top-level keys;
+            writes then always replace the file atomically, as in the "atomic" write mode
+        - index_keys (List[List[str]]): Key paths of nested objects whose keys are
+            indexed too in the "mmap" read mode, e.g. `[["users"]]`
+        - persist_index (bool): Whether the "mmap" offset index is saved next to
+            the file (`<file>.offsets.json`) and reused while the file is unchanged
+        - codec (Union[str, JsonCodec]): JSON backend ("json", "orjson", "ujson", "auto"
+            or a codec instance); None means the default codec (see `ooj.codec.set_default_codec`)
+        - concurrent (bool): Whether the file is shared by threads and processes. Reads
+            take a shared lock and mutations an exclusive one: a reader/writer lock
+            between the threads and an `fcntl` lock on `<file>.lock` between the
+            processes. Every mutation reloads the file first if another process changed it
         """
         
         self._fp = Path(fp)
         self._encoding = encoding
         self._indent = indent
+        self._codec = get_codec(codec)
         self.ignore_errors = ignore_errors or []
 
+        if write_mode not in self.WRITE_MODES:
+            raise ValueError(f"Unknown write mode '{write_mode}', expected one of {self.WRITE_MODES}.")
+        if journal and write_mode == "write_behind":
+            raise ValueError("The journal can not be combined with the write_behind mode.")
+        if read_mode not in self.READ_MODES:
+            raise ValueError(f"Unknown read mode '{read_mode}', expected one of {self.READ_MODES}.")
+        if journal and read_mode == "mmap":
+            raise ValueError("The journal can not be combined with the mmap read mode.")
+        if concurrent and write_mode == "write_behind":
+            raise ValueError("The concurrent mode can not be combined with the write_behind mode.")
+        self._write_mode = write_mode
+        self._fsync = fsync
+
+        # Guards the buffer against concurrent mutation and background flushes.
+        self._lock = threading.RLock()
+
+        # Locks of the concurrent mode. They are always taken before `_lock`.
+        self._rw_lock = None
+        self._process_lock = None
+        if concurrent:
+            self._rw_lock = ReadWriteLock()
+            self._process_lock = ProcessLock(self.lock_fp)
+
+        self._flusher = None
+        if write_mode == "write_behind":
+            self._flusher = WriteBehindFlusher(self._flush_buffer, flush_interval, flush_threshold,
+                                               name=f"ooj-write-behind-{self._fp.name}")
+
         JsonBase.__init__(self, {})
         Readable.__init__(self, self._fp)
         Writable.__init__(self, self._fp)
@@ -35,17 +135,50 @@ class JsonFile(JsonBase, Readable, Writable):
         # Checking the file path for the validity of the extension.
         if not str(self._fp).endswith(".json"):
             self._handle_exception(
-                FileExtensionException(f"The file {self.save_path} not JSON file.")
+                FileExtensionException(f"The file {self._fp} not JSON file.")
             )
         
-        # Buffer for faster access to the dictionary.
-        self.__buffer = {}
+        # Buffer for faster access to the dictionary. It is loaded lazily on
+        # first access and reloaded only when the file signature changes.
+        self.__buffer = None
+        self._signature = None
+
+        # Transaction state: nesting depth, pending changes and the undo log
+        # of (container, key, existed, old value) records.
+        self._transaction_depth = 0
+        self._transaction_dirty = False
+        self._transaction_rewrite = False
+        self._undo_log: List[tuple] = []
+
+        # Journal of patch records and the records of the current transaction.
+        self._journal = None
+        self._journal_pending: List[tuple] = []
+        self._journal_max_size = journal_max_size
+        self._journal_max_ratio = journal_max_ratio
+        self._base_size = 0
+        if journal:
+            self._journal = Journal(self._fp.with_name(self._fp.name + ".journal"),
+                                    encoding=self._encoding, fsync=fsync, codec=self._codec)
+
+        # Byte-offset index for point lookups without loading the buffer.
+        self._offset_index = None
+        if read_mode == "mmap":
+            self._offset_index = OffsetIndex(self._fp, index_keys, encoding=self._encoding,
+                                             persist=persist_index)
+
+        # Secondary indexes of record arrays, keyed by (array path, key path).
+        self._record_indexes: Dict[tuple, RecordIndex] = {}
 
     @property
     def fp(self):
         """ Returns the path to the file. """
         return self._fp
 
+    @property
+    def lock_fp(self) -> Path:
+        """ Returns the path to the lock file of the concurrent mode. """
+        return self._fp.with_name(self._fp.name + ".lock")
+
     @property
     def exists(self) -> bool:
         """ Returns True if the file is found, otherwise False. """
@@ -54,6 +187,16 @@ class JsonFile(JsonBase, Readable, Writable):
         except OSError as e:
             self._handle_exception(e)
 
+    @property
+    def data(self) -> Dict:
+        """
+        Returns the buffered file data, re-reading the file only if it has
+        changed since the last read or write. Use `set_entry`/`del_entry` to
+        change it.
+        """
+        with self._shared_access():
+            return self._ensure_buffer()
+
     def create(self):
         """ Creates a file anyway. """
         if self._fp:
@@ -71,10 +214,21 @@ class JsonFile(JsonBase, Readable, Writable):
             self.create()
 
     def delete(self):
-        """ Deletes the file anyway. """
+        """
+        Deletes the file anyway. The lock file of the concurrent mode is kept,
+        since other processes may still be using it.
+        """
+        self.flush()
         if self._fp:
             try:
-                self._fp.unlink(missing_ok=True)
+                if self._journal is not None:
+                    self._journal.truncate()
+                if self._offset_index is not None:
+                    self._offset_index.close()
+                    self._offset_index.index_fp.unlink(missing_ok=True)
+                self.indexes_fp.unlink(missing_ok=True)
+                with self._exclusive_access():
+                    self._fp.unlink(missing_ok=True)
             except FileNotFoundError as e:
                 self._handle_exception(e)
 
@@ -84,47 +238,244 @@ class JsonFile(JsonBase, Readable, Writable):
 
     def write(self, data: Union[Dict, RootTree]):
         """ Writes a dictionary to a file. """
-        if self._fp:
-            try:
-                with self._fp.open('w', encoding=self._encoding) as f:
-                    if isinstance(data, RootTree):
-                        data = data.to_dict()
-                    elif not isinstance(data, dict):
-                        self._handle_exception(TypeError(f'Type {type(data)} not supported in write method.'))
-                    json.dump(data, f, indent=self._indent)
+        if isinstance(data, RootTree):
+            data = data.to_dict()
+        elif not isinstance(data, dict):
+            self._handle_exception(TypeError(f'Type {type(data)} not supported in write method.'))
+            return
+
+        with self._exclusive_access(), self._lock:
+            if self._transaction_depth:
+                if data is not self.__buffer:
+                    self._undo_log.append((None, None, True, self.__buffer))
+                    self.__update_buffer_from_dict(data)
+                self._transaction_dirty = True
+                self._transaction_rewrite = True
+                return
 
+            if self._flusher is not None:
                 self.__update_buffer_from_dict(data)
+                self._flusher.mark_dirty()
+                return
+
+            if self._fp:
+                try:
+                    payload = self._encode(data)
+                    self._write_payload(payload)
+                    self.__update_buffer_from_dict(data)
+                except Exception as e:
+                    self._handle_exception(e)
+
+    def compact(self):
+        """
+        Writes the buffer as the new base file and empties the journal.
+        Happens automatically when the journal exceeds its size or ratio threshold.
+        """
+        with self._exclusive_access():
+            self.write(self._ensure_buffer())
+
+    def flush(self):
+        """ Writes the pending write-behind changes to the file right away. """
+        if self._flusher is not None:
+            try:
+                self._flusher.flush()
             except Exception as e:
                 self._handle_exception(e)
 
+    def close(self):
+        """
+        Flushes the pending write-behind changes, stops the background flusher,
+        releases the memory map of the "mmap" read mode and closes the lock file
+        of the concurrent mode.
+        """
+        if self._offset_index is not None:
+            self._offset_index.close()
+        if self._flusher is not None:
+            try:
+                self._flusher.close()
+            except Exception as e:
+                self._handle_exception(e)
+        if any(index.persist for index in self._record_indexes.values()):
+            self.save_indexes()
+        if self._process_lock is not None:
+            self._process_lock.close()
+
+    def __enter__(self) -> 'JsonFile':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _encode(self, data: Dict) -> bytes:
+        """ Encodes the data as the file content. """
+        return self._codec.dumpb(data, self._indent, self._encoding)
+
+    def _write_payload(self, payload: bytes) -> None:
+        """
+        Writes the encoded data as the new file content according to the write mode.
+        With a journal or in the "mmap" read mode the file is always replaced
+        atomically: truncating a memory-mapped file in place would let readers
+        of the old map fail with SIGBUS or see torn data.
+        """
+        if self._write_mode == "atomic" or self._journal is not None or self._offset_index is not None:
+            atomic_write(self._fp, payload, self._fsync)
+            self._base_size = len(payload)
+        else:
+            with self._fp.open('wb') as f:
+                f.write(payload)
+
+        # The new base contains every journaled change.
+        if self._journal is not None:
+            self._journal.truncate()
+        if self._process_lock is not None:
+            self._process_lock.bump()
+        self._signature = self._file_signature()
+
+    def _flush_buffer(self):
+        """ Atomically writes the current buffer; used by the write-behind flusher. """
+        with self._lock:
+            payload = self._encode(self.__buffer)
+        atomic_write(self._fp, payload, self._fsync)
+        self._signature = self._file_signature()
+
     def read(self) -> Dict:
-        """ Reads data from a file and returns a dictionary. """
-        if not self.exists:
-            return {}
+        """
+        Reads data from a file and returns a dictionary.
+        With a journal, the journal records are replayed over the file data.
+        """
+        with self._shared_access():
+            if self._journal is not None:
+                return self._read_with_journal()
+            if not self.exists:
+                return {}
+            try:
+                with self._fp.open('rb') as f:
+                    return self._codec.loads(f.read(), self._encoding)
+            except Exception as e:
+                self._handle_exception(e)
+                return {}
+
+    def _read_with_journal(self) -> Dict:
+        """ Reads the base file and replays the journal over it. """
         try:
-            with self._fp.open('r', encoding=self._encoding) as f:
-                return json.load(f)
+            data = {}
+            if self.exists:
+                with self._fp.open('rb') as f:
+                    content = f.read()
+                self._base_size = len(content)
+                data = self._codec.loads(content, self._encoding)
+            return self._journal.replay(data)
         except Exception as e:
             self._handle_exception(e)
             return {}
         
-    def read_tree(self) -> RootTree:
+    def read_tree(self, lazy: bool = False) -> RootTree:
+        """
+        Reads the file as a RootTree.
+
+        Arguments:
+        - lazy (bool): Whether the tree converts its subtrees only on first access
+        (see `TreeConverter`).
+        """
         json_data = self.read()
-        return TreeConverter.to_root_tree(json_data)
+        return TreeConverter.to_root_tree(json_data, lazy=lazy)
+
+    def iter_events(self, chunk_size: int = stream.DEFAULT_CHUNK_SIZE) -> Iterator[stream.Event]:
+        """
+        Parses the file incrementally and yields `(path, event, value)` events
+        (`start_map`, `key`, `end_map`, `start_array`, `end_array`, `value`).
+        Pending write-behind changes and journal records are written to the
+        file first.
+
+        In the concurrent mode, the shared lock is held until the iteration
+        ends or the iterator is closed.
+
+        Arguments:
+        - chunk_size (int): The number of characters read from the file at once.
+        """
+        self._sync_base()
+        with self._shared_access(), self._fp.open('r', encoding=self._encoding) as f:
+            yield from stream.iter_events(f, chunk_size)
+
+    def iter_items(self,
+                   key_s: Union[List[Union[str, int]], str, None] = None,
+                   chunk_size: int = stream.DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+        """
+        Iterates the items of the array at the key path, reading the file in
+        chunks and decoding only one item at a time. For an object at the key
+        path, `(key, value)` pairs are yielded. Pending write-behind changes and
+        journal records are written to the file first. In the concurrent mode, the
+        shared lock is held until the iteration ends or the iterator is closed.
+
+        Arguments:
+        - key_s (Union[List[Union[str, int]], str, None]): A key or a list of keys and
+        array indexes leading to the container. None means the document root.
+        - chunk_size (int): The number of characters read from the file at once.
+        """
+        keys_path = self._normalize_keys(key_s) if key_s is not None else []
+        self._sync_base()
+        with self._shared_access(), self._fp.open('r', encoding=self._encoding) as f:
+            yield from stream.iter_items(f, keys_path, chunk_size)
+
+    def read_entry(self,
+                   key_s: Union[List[Union[str, int]], str],
+                   chunk_size: int = stream.DEFAULT_CHUNK_SIZE) -> Any:
+        """
+        Decodes only the value at the key path straight from the file, without
+        loading the whole document, and stops reading right after it. Pending
+        write-behind changes and journal records are written to the file first.
+
+        Arguments:
+        - key_s (Union[List[Union[str, int]], str]): A key or a list of keys and
+        array indexes leading to the value.
+        - chunk_size (int): The number of characters read from the file at once.
+        """
+        keys_path = self._normalize_keys(key_s)
+        try:
+            self._sync_base()
+            with self._shared_access(), self._fp.open('r', encoding=self._encoding) as f:
+                return stream.read_entry(f, keys_path, chunk_size)
+        except Exception as e:
+            self._handle_exception(e)
+
+    def _sync_base(self) -> None:
+        """
+        Brings the file up to date before it is parsed directly: writes the
+        pending write-behind changes and compacts a non-empty journal.
+        """
+        if self._flusher is None and self._journal is None:
+            return
+        with self._exclusive_access():
+            journaled = False
+            if self._journal is not None:
+                try:
+                    journaled = self._journal.fp.stat().st_size > 0
+                except FileNotFoundError:
+                    pass
+            if self._transaction_depth and (journaled or (self._flusher is not None and self._flusher.pending)):
+                raise RuntimeError("The file can not be streamed inside a transaction "
+                                   "while it has journaled or pending write-behind changes.")
+            self.flush()
+            if journaled:
+                self.compact()
 
     def _normalize_keys(self, keys_path: Union[List[str], str]) -> List[str]:
         """ Checks whether the keys are valid. """
         return [keys_path] if isinstance(keys_path, str) else keys_path
 
-    def _navigate_to_key(self, keys_path: List[str], create_if_missing: bool = False) -> dict:
+    def _navigate_to_key(self, keys_path: List[str], create_if_missing: bool = False,
+                         data: Optional[Dict] = None) -> dict:
         """
         Finds the path to the key and creates it
         if the create_if_missing argument = False.
+        The buffer is used unless the data is given.
         """
-        data = self.__buffer
+        if data is None:
+            data = self._ensure_buffer()
         for key in keys_path[:-1]:
             if key not in data or not isinstance(data[key], dict):
                 if create_if_missing:
+                    self._record_undo(data, key)
                     data[key] = {}
                 else:
                     self._handle_exception(KeyError(f"Key '{key}' not found or is not a dictionary."))
@@ -144,27 +495,304 @@ class JsonFile(JsonBase, Readable, Writable):
         key_s = self._normalize_keys(key_s)
         
         if isinstance(value, (Entry, RootTree)):
-            value = value.to_dict()
+            value = _copy_plain(value._shared_dict())
 
-        data = self._navigate_to_key(key_s, create_if_missing=True)
-        data[key_s[-1]] = value
-        self.write(self.__buffer)
+        with self._exclusive_access(), self._lock:
+            self._set_in_buffer(key_s, value)
+            self._commit_change("set", key_s, value)
 
     def get_entry(self, key_s: Union[List[str], str]) -> Any:
         key_s = self._normalize_keys(key_s)
-        data = self._navigate_to_key(key_s)
-        if key_s[-1] in data:
-            return data[key_s[-1]]
+
+        with self._shared_access():
+            # In the mmap read mode, decode only the requested value unless an
+            # up-to-date buffer is already loaded.
+            if self._offset_index is not None and not self._is_buffer_current():
+                try:
+                    return self._offset_index.get(key_s)
+                except Exception as e:
+                    self._handle_exception(e)
+                    return
+
+            data = self._navigate_to_key(key_s)
+            if key_s[-1] in data:
+                return data[key_s[-1]]
         self._handle_exception(KeyError(f"Key '{key_s[-1]}' not found."))
 
     def del_entry(self, key_s: Union[List[str], str]) -> None:
         key_s = self._normalize_keys(key_s)
-        data = self._navigate_to_key(key_s)
-        if key_s[-1] in data:
-            del data[key_s[-1]]
-        else:
+        with self._exclusive_access(), self._lock:
+            if not self._del_in_buffer(key_s):
+                return
+            self._commit_change("del", key_s)
+
+    def _set_in_buffer(self, key_s: List[str], value: Any, buffer: Optional[Dict] = None) -> None:
+        """ Sets the value at the key path in the buffer only (the given, already loaded one if any). """
+        data = self._navigate_to_key(key_s, create_if_missing=True, data=buffer)
+        self._record_undo(data, key_s[-1])
+        data[key_s[-1]] = value
+        self._mark_indexes_stale(key_s)
+
+    def _del_in_buffer(self, key_s: List[str], buffer: Optional[Dict] = None) -> bool:
+        """ Deletes the key path from the buffer only; returns False if it is missing. """
+        data = self._navigate_to_key(key_s, data=buffer)
+        if key_s[-1] not in data:
             self._handle_exception(KeyError(f"Key '{key_s[-1]}' not found."))
-        self.write(data)
+            return False
+        self._record_undo(data, key_s[-1])
+        del data[key_s[-1]]
+        self._mark_indexes_stale(key_s)
+        return True
+
+    def query(self, expression: Union[str, Query]) -> List[Any]:
+        """
+        Returns the values matching a JSONPath-style query, e.g. `"$.users[?(@.age > 30)].name"`.
+        The expression is compiled once and cached; see `Query`.
+        """
+        query = Query.compile(expression)
+        with self._shared_access():
+            return query.find(self._ensure_buffer())
+
+    def iter_query(self, expression: Union[str, Query]) -> Iterator[Any]:
+        """
+        Yields the values matching a query one by one, without building a list.
+        In the concurrent mode, the shared lock is held until the iteration
+        ends or the iterator is closed, so the buffer does not change under it.
+        """
+        query = Query.compile(expression)
+        return self._iter_query(query)
+
+    def _iter_query(self, query: Query) -> Iterator[Any]:
+        with self._shared_access():
+            yield from query.iter(self._ensure_buffer())
+
+    def apply_patch(self, patch: List[Dict[str, Any]]) -> None:
+        """
+        Applies a JSON Patch (RFC 6902) to the data in place and writes the
+        result once. The patch is all or nothing: if an operation fails, the
+        buffer is rolled back and the file is left untouched.
+
+        Arguments:
+        - patch (List[Dict[str, Any]]): The patch operations, e.g. the result of `diff`.
+        """
+        with self._exclusive_access(), self._lock:
+            try:
+                with self.transaction():
+                    apply_patch(self._ensure_buffer(), patch, self._undo_log)
+                    self._mark_indexes_stale()
+                    self._transaction_dirty = True
+                    self._transaction_rewrite = True
+            except Exception as e:
+                self._handle_exception(e)
+
+    def diff(self, data: Union[Dict, RootTree]) -> List[Dict[str, Any]]:
+        """ Returns the JSON Patch that turns the data of the file into the given data. """
+        with self._shared_access():
+            return diff(self._ensure_buffer(), data)
+
+    @property
+    def indexes_fp(self) -> Path:
+        """ Returns the path to the persisted record indexes. """
+        return self._fp.with_name(self._fp.name + ".indexes.json")
+
+    def create_index(self,
+                     array_path: Union[List[str], str],
+                     key_path: Union[List[str], str],
+                     unique: bool = False,
+                     persist: bool = False) -> RecordIndex:
+        """
+        Creates (or returns the existing) hash index of a field of the records
+        in an array, for constant-time lookups by the field value.
+
+        Arguments:
+        - array_path (Union[List[str], str]): The keys leading to the array, e.g. "users".
+        - key_path (Union[List[str], str]): The keys leading to the field inside a record, e.g. "id".
+        - unique (bool): Whether a field value may belong to one record only;
+            duplicates raise ValueError.
+        - persist (bool): Whether the index is saved in `<file>.indexes.json` and
+            reused while the file is unchanged.
+
+        Example:
+        ```python
+        users = json_file.create_index("users", "id", unique=True)
+        user = users.get(42)
+        users.insert({"id": 43, "name": "Bob"})
+        ```
+        """
+        array_path = self._normalize_keys(array_path)
+        key_path = self._normalize_keys(key_path)
+
+        with self._exclusive_access(), self._lock:
+            index = self._record_indexes.get((tuple(array_path), tuple(key_path)))
+            if index is not None and index.unique == unique:
+                index.persist = index.persist or persist
+                return index
+
+            index = RecordIndex(self, array_path, key_path, unique, persist)
+            if not (persist and self._load_index(index)):
+                index.rebuild()
+            self._record_indexes[index.name] = index
+            if persist:
+                self.save_indexes()
+            return index
+
+    def drop_index(self, array_path: Union[List[str], str], key_path: Union[List[str], str]) -> None:
+        """ Removes the index of the field, if there is one. """
+        name = (tuple(self._normalize_keys(array_path)), tuple(self._normalize_keys(key_path)))
+        with self._exclusive_access(), self._lock:
+            index = self._record_indexes.pop(name, None)
+            if index is not None and index.persist:
+                self.save_indexes()
+
+    def save_indexes(self) -> None:
+        """
+        Saves the persisted record indexes to `<file>.indexes.json`. Pending
+        write-behind changes are flushed first; inside a transaction nothing
+        is saved, since the file does not contain the changes yet.
+        """
+        self.flush()
+        with self._exclusive_access(), self._lock:
+            if self._transaction_depth:
+                return
+            indexes = [index.to_json() for index in self._record_indexes.values() if index.persist]
+            try:
+                if indexes:
+                    atomic_write(self.indexes_fp, self._codec.dumpb(indexes), self._fsync)
+                else:
+                    self.indexes_fp.unlink(missing_ok=True)
+            except Exception as e:
+                self._handle_exception(e)
+
+    def _load_index(self, index: RecordIndex) -> bool:
+        """ Loads a persisted index that matches the current file; returns True on success. """
+        if self._transaction_depth:
+            return False
+        self.flush()
+        try:
+            persisted = self._codec.loads(self.indexes_fp.read_bytes())
+        except (OSError, ValueError):
+            return False
+        return any(index.load(data) for data in persisted if isinstance(data, dict))
+
+    def _indexes_of(self, array_path: List[str]) -> List[RecordIndex]:
+        """ Returns the record indexes of the array at the path. """
+        return [index for index in self._record_indexes.values() if index.array_path == array_path]
+
+    def _mark_indexes_stale(self, key_s: Optional[List[str]] = None) -> None:
+        """ Marks the record indexes whose array is at or below the key path (or all) for a rebuild. """
+        for index in self._record_indexes.values():
+            if key_s is None or index.array_path[:len(key_s)] == list(key_s):
+                index.mark_stale()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups mutations into a single write. Inside the context, `set_entry`,
+        `del_entry` and `write` only change the in-memory buffer; the file is
+        written once when the outermost transaction exits. If an exception is
+        raised, the buffer is rolled back to its state at the start of the
+        transaction and the file is left untouched.
+
+        Transactions can be nested; an inner transaction that fails only
+        rolls back its own changes.
+
+        Example:
+        ```python
+        with json_file.transaction():
+            for i in range(1000):
+                json_file.set_entry(["items", str(i)], i)
+        ```
+
+        In the concurrent mode, the transaction holds the exclusive lock, so
+        reads and changes inside it see no change of other threads or processes.
+        """
+        with self._exclusive_access(), self._lock:
+            self._ensure_buffer()
+            undo_mark = len(self._undo_log)
+            journal_mark = len(self._journal_pending)
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._rollback(undo_mark)
+                del self._journal_pending[journal_mark:]
+                raise
+            finally:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self._undo_log.clear()
+
+            if not self._transaction_depth and self._transaction_dirty:
+                records, self._journal_pending = self._journal_pending, []
+                rewrite, self._transaction_rewrite = self._transaction_rewrite, False
+                self._transaction_dirty = False
+
+                if self._journal is not None and not rewrite:
+                    self._append_journal(records)
+                else:
+                    self.write(self.__buffer)
+
+    def _commit_change(self, op: str, key_s: List[str], value: Any = None) -> None:
+        """ Persists a single buffer change: as a journal record or by rewriting the file. """
+        self._commit_changes([(op, key_s, value)])
+
+    def _commit_changes(self, records: List[tuple]) -> None:
+        """ Persists the `(op, key path, value)` buffer changes with one journal append or file write. """
+        records = [(op, list(key_s), value) for op, key_s, value in records]
+        if self._journal is None:
+            self.write(self.__buffer)
+        elif self._transaction_depth:
+            self._journal_pending.extend(records)
+            self._transaction_dirty = True
+        else:
+            self._append_journal(records)
+
+    def _append_journal(self, records: List[tuple]) -> None:
+        """ Appends the records to the journal and compacts it when it grows too large. """
+        try:
+            self._journal.extend(records)
+            if self._process_lock is not None:
+                self._process_lock.bump()
+            self._signature = self._file_signature()
+        except Exception as e:
+            self._handle_exception(e)
+            return
+
+        size = self._journal.size
+        if size > self._journal_max_size or (
+            size >= self.JOURNAL_MIN_COMPACT_SIZE and size > self._journal_max_ratio * self._base_size
+        ):
+            self.compact()
+
+    def _record_undo(self, container: dict, key: str) -> None:
+        """ Remembers the current value of `container[key]` inside a transaction. """
+        if self._transaction_depth:
+            self._undo_log.append((container, key, key in container, container.get(key)))
+
+    def _record_array_undo(self, array: list) -> None:
+        """ Remembers the items of an array changed in place inside a transaction. """
+        if self._transaction_depth:
+            self._undo_log.append((array, None, True, list(array)))
+
+    def _rollback(self, undo_mark: int) -> None:
+        """ Reverts the buffer changes recorded after the undo mark. """
+        while len(self._undo_log) > undo_mark:
+            container, key, existed, old_value = self._undo_log.pop()
+            if container is None:
+                self.__update_buffer_from_dict(old_value)
+            elif isinstance(container, list):
+                container[:] = old_value
+            elif existed:
+                container[key] = old_value
+            else:
+                container.pop(key, None)
+
+        self._mark_indexes_stale()
+
+        if self._transaction_depth == 1:
+            # The outermost transaction restored the buffer it started with.
+            self._transaction_dirty = False
+            self._transaction_rewrite = False
 
     def update_buffer_from_file(self):
         """
@@ -172,7 +800,72 @@ class JsonFile(JsonBase, Readable, Writable):
         This is useful if the file has been changed externally and the buffer 
         needs to be synced with the file.
         """
-        self.__buffer = self.read()
+        with self._shared_access(), self._lock:
+            signature = self._file_signature()
+            self.__buffer = self.read()
+            self._signature = signature
+
+    def _ensure_buffer(self) -> Dict:
+        """
+        Returns the buffer, loading it on first access and re-reading the file
+        only when its signature (mtime, size and inode) has changed. Inside a
+        transaction and in write-behind mode the loaded buffer is authoritative.
+        """
+        buffer = self.__buffer
+        if buffer is not None and (self._transaction_depth or self._flusher is not None):
+            return buffer
+
+        signature = self._file_signature()
+        if buffer is None or signature != self._signature:
+            with self._lock:
+                if self.__buffer is None or signature != self._signature:
+                    self.__buffer = self.read() if signature is not None else {}
+                    self._signature = signature
+                buffer = self.__buffer
+        return buffer
+
+    def _is_buffer_current(self) -> bool:
+        """ Returns True if the buffer is loaded and reflects the file. """
+        if self.__buffer is None:
+            return False
+        if self._transaction_depth or self._flusher is not None:
+            return True
+        return self._file_signature() == self._signature
+
+    def _file_signature(self):
+        """
+        Returns the (mtime_ns, size, inode) of the file and the journal, or None if missing.
+        In the concurrent mode, the write generation of the lock file is added too.
+        """
+        signature = _stat_signature(self._fp)
+        if self._journal is not None:
+            journal_signature = _stat_signature(self._journal.fp)
+            if signature is None and journal_signature is None:
+                return None
+            signature = signature, journal_signature
+        if signature is not None and self._process_lock is not None:
+            return signature, self._process_lock.generation()
+        return signature
+
+    def _shared_access(self):
+        """ Returns the context of a read: the shared locks in the concurrent mode. """
+        if self._rw_lock is None:
+            return _NO_LOCK
+        return self._locked_access(exclusive=False)
+
+    def _exclusive_access(self):
+        """ Returns the context of a mutation: the exclusive locks in the concurrent mode. """
+        if self._rw_lock is None:
+            return _NO_LOCK
+        return self._locked_access(exclusive=True)
+
+    @contextmanager
+    def _locked_access(self, exclusive: bool) -> Iterator[None]:
+        # Threads are ordered first, so the process lock is used by one
+        # writer or by readers only.
+        thread_lock = self._rw_lock.write_locked() if exclusive else self._rw_lock.read_locked()
+        with thread_lock, self._process_lock.locked(exclusive):
+            yield
 
     def _handle_exception(self, e: Exception):
         """
@@ -185,6 +878,14 @@ class JsonFile(JsonBase, Readable, Writable):
         if not any(isinstance(e, ignore_error) for ignore_error in self.ignore_errors):
             raise e
 
+    def _get_buffer(self) -> Optional[Dict]:
+        """ Returns the loaded buffer as it is, or None if it is not loaded. """
+        return self.__buffer
+
+    def _replace_buffer(self, dictionary: Dict) -> None:
+        """ Replaces the buffer without writing the file. """
+        self.__update_buffer_from_dict(dictionary)
+
     def __update_buffer_from_dict(self, dictionary: Dict):
         """
         Updates the internal buffer with the given dictionary.
@@ -192,4 +893,312 @@ class JsonFile(JsonBase, Readable, Writable):
         Arguments:
         - dictionary (Dict): The dictionary to update the buffer with.
         """
-        self.__buffer = dictionary
\ No newline at end of file
+        self.__buffer = dictionary
+
+
+class JsonLinesFile(Readable, Writable):
+    """
+    A JSON Lines file (one JSON document per line) for append-heavy data
+    such as event logs.
+
+    Records are appended with a single small write instead of rewriting the
+    file. Random access by position uses a line-offset index that is built
+    lazily, kept up to date by appends and persisted next to the file, so a
+    reopened file only scans the lines appended since the index was saved.
+
+    The persisted index stores the (inode, mtime_ns, size) of the file and a
+    digest of the indexed part. It is reused as is while the file is
+    unchanged; after a change, only if the indexed part still has the same
+    digest, i.e. the file was only appended to. Otherwise it is rebuilt.
+    """
+
+    EXTENSIONS = (".jsonl", ".ndjson")
+
+    # The header of the persisted index: a format marker, the indexed size,
+    # the inode, mtime_ns and size of the file and the 16-byte digest of the
+    # indexed part, as 64-bit words followed by the offsets.
+    _INDEX_MAGIC = int.from_bytes(b"OOJLIDX1", "little")
+    _INDEX_HEADER_WORDS = 7
+
+    def __init__(self,
+                 fp: Union[str, Path],
+                 encoding: str = "utf-8",
+                 ignore_errors: List[Exception] = None,
+                 persist_index: bool = True,
+                 codec: Union[str, JsonCodec, None] = None):
+        """
+        Arguments:
+        - fp (Union[str, Path]): Path to the JSON Lines file
+        - encoding (str): Encoding for reading/writing records
+        - ignore_errors (List[Exceptions]): List of exceptions to ignore during read/write operations
+        - persist_index (bool): Whether to save the line-offset index next to the file
+        - codec (Union[str, JsonCodec]): JSON backend; None means the default codec
+        """
+        self._fp = Path(fp)
+        self._encoding = encoding
+        self._codec = get_codec(codec)
+        self.ignore_errors = ignore_errors or []
+        self._persist_index = persist_index
+
+        Readable.__init__(self, self._fp)
+        Writable.__init__(self, self._fp)
+
+        if not str(self._fp).endswith(self.EXTENSIONS):
+            self._handle_exception(
+                FileExtensionException(f"The file {self._fp} not JSON Lines file.")
+            )
+
+        # Byte offsets of the record lines and the file size they cover.
+        self._offsets: Optional[array] = None
+        self._indexed_size = 0
+        # The running digest of the indexed part, or None until it is needed.
+        self._prefix_hash = None
+
+    @property
+    def fp(self):
+        """ Returns the path to the file. """
+        return self._fp
+
+    @property
+    def index_fp(self) -> Path:
+        """ Returns the path to the persisted line-offset index. """
+        return self._fp.with_name(self._fp.name + ".idx")
+
+    @property
+    def exists(self) -> bool:
+        """ Returns True if the file is found, otherwise False. """
+        try:
+            return self._fp.exists()
+        except OSError as e:
+            self._handle_exception(e)
+
+    def create(self):
+        """ Creates an empty file anyway. """
+        try:
+            self._fp.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self._handle_exception(e)
+        self.write([])
+
+    def create_if_not_exists(self):
+        """ Creates a file if it does not exist. """
+        if not self.exists:
+            self.create()
+
+    def delete(self):
+        """ Deletes the file and its index anyway. """
+        self._reset_index()
+        self._fp.unlink(missing_ok=True)
+
+    def clear(self):
+        """ Cleaning the file. """
+        self.write([])
+
+    def append(self, record: Any) -> None:
+        """ Appends one record to the end of the file. """
+        self.extend([record])
+
+    def extend(self, records: Iterable[Any]) -> None:
+        """ Appends the records to the end of the file with a single write. """
+        lines = [self._encode(record) for record in records]
+        if not lines:
+            return
+
+        payload = b"".join(lines)
+        try:
+            with self._fp.open('ab') as f:
+                offset = f.tell()
+                f.write(payload)
+        except Exception as e:
+            self._handle_exception(e)
+            return
+
+        if self._offsets is None:
+            return
+        if offset == self._indexed_size:
+            for line in lines:
+                self._offsets.append(offset)
+                offset += len(line)
+            self._indexed_size = offset
+            if self._prefix_hash is not None:
+                self._prefix_hash.update(payload)
+        else:
+            # The file was appended to by someone else since it was indexed.
+            self._scan_tail()
+
+    def write(self, records: Iterable[Any]):
+        """
+        Rewrites the file with the given records. All records are encoded before
+        the file is touched, and the new content replaces the file atomically,
+        so a failure leaves the old records in place.
+        """
+        try:
+            payload = b"".join([self._encode(record) for record in records])
+            atomic_write(self._fp, payload, fsync=False)
+        except Exception as e:
+            self._handle_exception(e)
+            return
+        self._reset_index()
+
+    def read(self) -> List[Any]:
+        """ Reads all records from the file and returns them as a list. """
+        return list(self)
+
+    def get(self, index: int) -> Any:
+        """ Returns the record at the given position, reading only its line. """
+        offsets = self._ensure_index()
+        if not -len(offsets) <= index < len(offsets):
+            # Pick up the lines appended by other writers before giving up.
+            self._scan_tail()
+        try:
+            offset = offsets[index]
+        except IndexError:
+            self._handle_exception(IndexError(f"Record index {index} out of range."))
+            return None
+
+        with self._fp.open('rb') as f:
+            f.seek(offset)
+            return self._codec.loads(f.readline(), self._encoding)
+
+    def save_index(self) -> None:
+        """ Saves the line-offset index next to the file. """
+        offsets = self._ensure_index()
+        try:
+            if self._prefix_hash is None:
+                self._prefix_hash = self._hash_prefix(self._indexed_size)
+            stat = self._fp.stat()
+            data = array('Q', [self._INDEX_MAGIC, self._indexed_size,
+                               stat.st_ino, stat.st_mtime_ns, stat.st_size])
+            data.frombytes(self._prefix_hash.digest())
+            data.extend(offsets)
+            with self.index_fp.open('wb') as f:
+                data.tofile(f)
+        except OSError as e:
+            self._handle_exception(e)
+
+    def __len__(self) -> int:
+        return len(self._ensure_index())
+
+    def __getitem__(self, index: int) -> Any:
+        return self.get(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Streams the records of the file one line at a time. """
+        if not self.exists:
+            return
+        with self._fp.open('rb') as f:
+            for line in f:
+                if line.strip():
+                    yield self._codec.loads(line, self._encoding)
+
+    def _encode(self, record: Any) -> bytes:
+        """ Encodes a record as a single line. """
+        return self._codec.dumpb(record, None, self._encoding) + b"\n"
+
+    def _ensure_index(self) -> array:
+        """
+        Returns the line-offset index, loading the persisted index and
+        scanning only the lines written after it.
+        """
+        if self._offsets is None:
+            self._offsets, self._indexed_size = self._load_persisted_index()
+            self._scan_tail()
+        return self._offsets
+
+    def _scan_tail(self) -> None:
+        """ Indexes the complete lines written after the indexed part of the file. """
+        if not self.exists:
+            return
+
+        position = self._indexed_size
+        with self._fp.open('rb') as f:
+            f.seek(position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A partially written last line is not a record yet.
+                    break
+                if line.strip():
+                    self._offsets.append(position)
+                if self._prefix_hash is not None:
+                    self._prefix_hash.update(line)
+                position += len(line)
+
+        if position != self._indexed_size:
+            self._indexed_size = position
+            if self._persist_index:
+                self.save_index()
+
+    def _load_persisted_index(self):
+        """
+        Loads the saved index if it still matches the beginning of the file:
+        the file is unchanged since the index was saved, or its indexed part
+        has the saved digest. Sets the running digest of the indexed part.
+        """
+        self._prefix_hash = hashlib.blake2b(digest_size=16)
+        offsets = array('Q')
+        if not self._persist_index or not self.index_fp.exists() or not self.exists:
+            return offsets, 0
+
+        try:
+            with self.index_fp.open('rb') as f:
+                offsets.frombytes(f.read())
+            stat = self._fp.stat()
+        except (OSError, ValueError):
+            return array('Q'), 0
+
+        header = self._INDEX_HEADER_WORDS
+        if len(offsets) < header or offsets[0] != self._INDEX_MAGIC:
+            return array('Q'), 0
+
+        indexed_size, inode, mtime_ns, size = offsets[1:5]
+        digest = offsets[5:header].tobytes()
+        del offsets[:header]
+        if stat.st_ino != inode or stat.st_size < indexed_size:
+            return array('Q'), 0
+
+        if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+            # Unchanged; the digest is computed only if the index is saved again.
+            self._prefix_hash = None
+            return offsets, indexed_size
+
+        try:
+            prefix_hash = self._hash_prefix(indexed_size)
+        except OSError:
+            return array('Q'), 0
+        if prefix_hash.digest() != digest:
+            return array('Q'), 0
+        self._prefix_hash = prefix_hash
+        return offsets, indexed_size
+
+    def _hash_prefix(self, size: int):
+        """ Returns the running digest of the first `size` bytes of the file. """
+        prefix_hash = hashlib.blake2b(digest_size=16)
+        with self._fp.open('rb') as f:
+            while size > 0:
+                chunk = f.read(min(size, 1 << 20))
+                if not chunk:
+                    break
+                prefix_hash.update(chunk)
+                size -= len(chunk)
+        return prefix_hash
+
+    def _reset_index(self) -> None:
+        """ Drops the in-memory and persisted index. """
+        self._offsets = None
+        self._indexed_size = 0
+        self._prefix_hash = None
+        try:
+            self.index_fp.unlink(missing_ok=True)
+        except OSError as e:
+            self._handle_exception(e)
+
+    def _handle_exception(self, e: Exception):
+        """
+        Handles exceptions during file operations. If the exception is not one of
+        those specified in `ignore_errors`, the exception will be raised.
+        
+        Arguments:
+        - e (Exception): The exception to be handled.
+        """
+        if not any(isinstance(e, ignore_error) for ignore_error in self.ignore_errors):
+            raise e
@@ -0,0 +1,174 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Union
+
+from .cache import CacheInfo, LRUCache
+from .codec import JsonCodec, get_codec
+from .storage import atomic_write
+
+
+class CachedResponse(NamedTuple):
+    """
+    A cached JSON response: the parsed data and its validators.
+    """
+    url: str
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def validators(self) -> Dict[str, str]:
+        """ Returns the headers of a conditional request for the response. """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    A cache of JSON responses for `JsonURL`, kept in memory and optionally
+    on disk.
+
+    A response younger than the TTL is served without a network call. An
+    older one is revalidated with a conditional request (`If-None-Match` /
+    `If-Modified-Since`); on `304 Not Modified` its parsed data is reused and
+    its age is reset. The disk cache keeps the raw response body next to a
+    small metadata file, so a revalidation rewrites only the metadata and
+    another process decodes the body once.
+
+    The cached data is shared by every `JsonURL` that reads it and must not
+    be modified.
+
+    Attributes:
+        directory (Optional[Path]): The directory of the disk cache, or None.
+        ttl (float): The number of seconds a response is served without revalidation.
+    """
+
+    def __init__(self,
+                 directory: Optional[Union[str, Path]] = None,
+                 ttl: float = 60.0,
+                 maxsize: int = 256,
+                 codec: Union[str, JsonCodec, None] = None):
+        """
+        Initializes an HttpCache instance.
+
+        Args:
+            directory (Optional[Union[str, Path]]): The directory of the disk cache. Only
+                the memory cache is used if None.
+            ttl (float): The number of seconds a response is served without revalidation;
+                0 revalidates every time. Defaults to 60.
+            maxsize (int): The maximum number of responses kept in memory. Defaults to 256.
+            codec (Union[str, JsonCodec, None]): The JSON backend of the disk cache.
+        """
+        self.directory = Path(directory).expanduser() if directory is not None else None
+        self.ttl = ttl
+        self._codec = get_codec(codec)
+        self._memory = LRUCache(maxsize)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """ Returns the cached response of the URL from memory or disk, or None. """
+        response = self._memory.get(url)
+        if response is None and self.directory is not None:
+            response = self._load(url)
+            if response is not None:
+                self._memory.set(url, response)
+        return response
+
+    def is_fresh(self, response: CachedResponse) -> bool:
+        """ Returns True if the response can be served without revalidation. """
+        return time.time() - response.stored_at < self.ttl
+
+    def set(self,
+            url: str,
+            data: Any,
+            content: bytes,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CachedResponse:
+        """
+        Stores a response.
+
+        Args:
+            url (str): The requested URL.
+            data (Any): The parsed body.
+            content (bytes): The raw body, written to the disk cache.
+            etag (Optional[str]): The `ETag` header of the response.
+            last_modified (Optional[str]): The `Last-Modified` header of the response.
+        """
+        response = CachedResponse(url, data, etag, last_modified, time.time())
+        self._memory.set(url, response)
+        if self.directory is not None:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                atomic_write(self._body_fp(url), content, fsync=False)
+                self._save_meta(response)
+            except OSError:
+                # The disk cache is an optimization; the memory cache still works.
+                pass
+        return response
+
+    def revalidated(self, response: CachedResponse) -> CachedResponse:
+        """ Resets the age of a response confirmed by `304 Not Modified`. """
+        response = response._replace(stored_at=time.time())
+        self._memory.set(response.url, response)
+        if self.directory is not None:
+            try:
+                self._save_meta(response)
+            except OSError:
+                pass
+        return response
+
+    def pop(self, url: str) -> None:
+        """ Removes the response of the URL from memory and disk. """
+        self._memory.pop(url)
+        if self.directory is not None:
+            self._meta_fp(url).unlink(missing_ok=True)
+            self._body_fp(url).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """ Removes every cached response from memory and disk. """
+        self._memory.clear()
+        if self.directory is not None and self.directory.exists():
+            for fp in self.directory.glob("*.meta.json"):
+                fp.unlink(missing_ok=True)
+            for fp in self.directory.glob("*.body.json"):
+                fp.unlink(missing_ok=True)
+
+    def info(self) -> CacheInfo:
+        """ Returns the hit/miss statistics of the memory cache. """
+        return self._memory.info()
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_fp(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.meta.json"
+
+    def _body_fp(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.body.json"
+
+    def _save_meta(self, response: CachedResponse) -> None:
+        meta = {
+            "url": response.url,
+            "etag": response.etag,
+            "last_modified": response.last_modified,
+            "stored_at": response.stored_at
+        }
+        atomic_write(self._meta_fp(response.url), self._codec.dumpb(meta), fsync=False)
+
+    def _load(self, url: str) -> Optional[CachedResponse]:
+        """ Reads a response from the disk cache; a missing or broken entry is a miss. """
+        try:
+            meta = self._codec.loads(self._meta_fp(url).read_bytes())
+            if meta.get("url") != url:
+                return None
+            data = self._codec.loads(self._body_fp(url).read_bytes())
+        except (OSError, ValueError, AttributeError):
+            return None
+        return CachedResponse(url, data, meta.get("etag"), meta.get("last_modified"),
+                              float(meta.get("stored_at", 0)))
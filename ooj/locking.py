@@ -0,0 +1,209 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class ReadWriteLock:
+    """
+    A reader/writer lock for threads: any number of readers, or one writer.
+
+    Both sides are reentrant, and a thread that holds the write lock may
+    also read. Waiting writers block new readers, so a steady stream of
+    readers can not starve them, and readers blocked by a writer are let in
+    before the next writer, so a steady stream of writers can not starve
+    readers either. A reader can not upgrade to a writer.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        # Readers that waited for the last write go ahead of the next writer:
+        # the number of finished writes and of such readers not yet in.
+        self._writes = 0
+        self._admitted_readers = 0
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        with self._condition:
+            if me in self._readers:
+                self._readers[me] += 1
+                return
+            writes = self._writes
+            self._waiting_readers += 1
+            try:
+                while self._writer is not None or (self._waiting_writers and self._writes == writes):
+                    self._condition.wait()
+            finally:
+                self._waiting_readers -= 1
+                if self._writes != writes:
+                    self._admitted_readers -= 1
+                    if not self._admitted_readers:
+                        self._condition.notify_all()
+            self._readers[me] = 1
+
+    def release_read(self) -> None:
+        me = threading.get_ident()
+        with self._condition:
+            self._readers[me] -= 1
+            if not self._readers[me]:
+                del self._readers[me]
+                if not self._readers:
+                    self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Raises:
+            RuntimeError: If the thread holds the read lock.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("A read lock can not be upgraded to a write lock.")
+
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers or self._admitted_readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._writes += 1
+                self._admitted_readers = self._waiting_readers
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        # The writer already excludes everyone else.
+        if self._writer == threading.get_ident():
+            yield
+            return
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ProcessLock:
+    """
+    An advisory `fcntl.flock` lock on a sidecar file, shared between processes.
+
+    The lock is counted, so nested acquisitions in the process only lock the
+    file once. Threads must be coordinated by a `ReadWriteLock` first: while
+    a thread holds the exclusive lock, no other thread of the process may use
+    this lock. A forked child reopens the lock file instead of sharing the
+    lock of its parent. Without `fcntl` (on Windows) the lock does nothing.
+
+    The lock file also stores a write generation, which writers increment
+    under the exclusive lock, so readers notice every write of another
+    process even when the stat signature of the data file does not change.
+
+    Attributes:
+        fp (Path): The path to the lock file.
+    """
+
+    def __init__(self, fp: Union[str, Path]) -> None:
+        self.fp = Path(fp)
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+        self._count = 0
+        self._exclusive = False
+        self._mutex = threading.Lock()
+
+    def acquire(self, exclusive: bool) -> None:
+        with self._mutex:
+            fd = self._open()
+            if self._count and (self._exclusive or not exclusive):
+                self._count += 1
+                return
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._exclusive = exclusive
+            self._count += 1
+
+    def release(self) -> None:
+        with self._mutex:
+            self._count -= 1
+            if not self._count:
+                self._exclusive = False
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def locked(self, exclusive: bool) -> Iterator[None]:
+        self.acquire(exclusive)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def generation(self) -> int:
+        """ Returns the write generation stored in the lock file. """
+        with self._mutex:
+            fd = self._open()
+            data = os.pread(fd, 8, 0) if fd is not None else b""
+        return int.from_bytes(data, "little") if len(data) == 8 else 0
+
+    def bump(self) -> None:
+        """ Increments the write generation; the caller holds the exclusive lock. """
+        with self._mutex:
+            fd = self._open()
+            if fd is None:
+                return
+            data = os.pread(fd, 8, 0)
+            generation = int.from_bytes(data, "little") if len(data) == 8 else 0
+            os.pwrite(fd, (generation + 1).to_bytes(8, "little"), 0)
+
+    def close(self) -> None:
+        """ Closes the lock file; it is reopened by the next acquisition. """
+        with self._mutex:
+            if self._fd is not None and not self._count:
+                os.close(self._fd)
+                self._fd = None
+
+    def _open(self) -> Optional[int]:
+        """ Returns the descriptor of the lock file, opening it if needed. """
+        if fcntl is None:
+            return None
+        if self._fd is not None and self._pid != os.getpid():
+            # A forked child shares the open file of its parent, and with it
+            # the lock; closing the copy leaves the lock of the parent alone.
+            os.close(self._fd)
+            self._fd = None
+            self._count = 0
+            self._exclusive = False
+        if self._fd is None:
+            self._fd = os.open(self.fp, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
@@ -0,0 +1,241 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]+")
+
+KeysPath = Tuple[Union[str, int], ...]
+
+
+class OffsetIndex:
+    """
+    A byte-offset index of the values of a JSON file, read through `mmap`.
+
+    The index covers the top-level keys of the document and the children of
+    the selected nested containers. A lookup decodes only the bytes of the
+    deepest indexed value on the requested path, so point lookups in huge
+    files touch only the bytes they need. The index is rebuilt when the file
+    changes and can be persisted next to the file (`<file>.offsets.json`).
+
+    Attributes:
+        fp (Path): The path to the JSON file.
+    """
+
+    def __init__(self,
+                 fp: Union[str, Path],
+                 nested_keys: Optional[Iterable[Sequence[Union[str, int]]]] = None,
+                 encoding: str = "utf-8",
+                 persist: bool = False):
+        """
+        Initializes an OffsetIndex instance.
+
+        Args:
+            fp (Union[str, Path]): The path to the JSON file.
+            nested_keys (Optional[Iterable[Sequence[Union[str, int]]]]): Key paths of the
+                nested objects or arrays whose children are indexed too.
+            encoding (str): The encoding of the file. Defaults to "utf-8".
+            persist (bool): Whether to save the index next to the file. Defaults to False.
+        """
+        self.fp = Path(fp)
+        self._encoding = encoding
+        self._persist = persist
+
+        self._nested = sorted({tuple(keys) for keys in (nested_keys or [])}, key=repr)
+        self._prefixes = {keys[:n] for keys in self._nested for n in range(1, len(keys) + 1)}
+
+        self._entries: Dict[KeysPath, Tuple[int, int]] = {}
+        self._signature = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def index_fp(self) -> Path:
+        """ Returns the path to the persisted index. """
+        return self.fp.with_name(self.fp.name + ".offsets.json")
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._entries)
+
+    def __contains__(self, keys_path: Sequence[Union[str, int]]) -> bool:
+        self.refresh()
+        return tuple(keys_path) in self._entries
+
+    def get(self, keys_path: Sequence[Union[str, int]]) -> Any:
+        """
+        Decodes the value at the key path from the deepest indexed value on it.
+
+        Args:
+            keys_path (Sequence[Union[str, int]]): The keys (and array indexes) leading to the value.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            KeyError: If there is no value at the path.
+        """
+        self.refresh()
+        path = tuple(keys_path)
+
+        for length in range(len(path), 0, -1):
+            span = self._entries.get(path[:length])
+            if span is None:
+                continue
+
+            value = self._decode(*span)
+            for key in path[length:]:
+                try:
+                    value = value[key]
+                except (KeyError, IndexError, TypeError):
+                    raise KeyError(f"Key '{key}' not found.") from None
+            return value
+
+        if not path:
+            return self._decode(0, len(self._mmap)) if self._mmap is not None else {}
+        raise KeyError(f"Key '{path[0]}' not found.")
+
+    def refresh(self) -> None:
+        """ Loads or rebuilds the index if the file has changed since it was built. """
+        signature = self._file_signature()
+        if signature == self._signature and (self._mmap is not None or signature is None):
+            return
+
+        self.close()
+        self._signature = signature
+        self._entries = {}
+        if signature is None or signature[1] == 0:
+            return
+
+        with self.fp.open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if not self._load():
+            self._build()
+            if self._persist:
+                self.save()
+
+    def save(self) -> None:
+        """ Saves the index next to the file. """
+        data = {
+            "signature": list(self._signature or ()),
+            "nested": [list(keys) for keys in self._nested],
+            "entries": [[list(path), start, end] for path, (start, end) in self._entries.items()]
+        }
+        with self.index_fp.open('w', encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def close(self) -> None:
+        """ Releases the memory map of the file. """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _decode(self, start: int, end: int) -> Any:
+        text = self._mmap[start:end].decode(self._encoding)
+        return self._decoder.raw_decode(text)[0]
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.fp)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load(self) -> bool:
+        """ Loads the persisted index if it matches the file and the nested keys. """
+        if not self._persist:
+            return False
+        try:
+            with self.index_fp.open('r', encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (tuple(data.get("signature", ())) != tuple(self._signature)
+                or [tuple(keys) for keys in data.get("nested", [])] != self._nested):
+            return False
+
+        self._entries = {tuple(path): (start, end) for path, start, end in data["entries"]}
+        return True
+
+    def _build(self) -> None:
+        """ Scans the file once and records the spans of the indexed values. """
+        pos = self._skip_whitespace(0)
+        if pos < len(self._mmap) and self._mmap[pos:pos + 1] in (b"{", b"["):
+            self._index_container((), pos)
+
+    def _index_container(self, path: KeysPath, pos: int) -> int:
+        """ Records the spans of the container children; returns the end of the container. """
+        data = self._mmap
+        is_map = data[pos:pos + 1] == b"{"
+        closing = b"}" if is_map else b"]"
+        index = 0
+
+        pos = self._skip_whitespace(pos + 1)
+        if data[pos:pos + 1] == closing:
+            return pos + 1
+
+        while True:
+            if is_map:
+                match = _STRING.match(data, pos)
+                if match is None:
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", "", pos)
+                key = json.loads(match.group().decode(self._encoding))
+                pos = self._skip_whitespace(match.end())
+                if data[pos:pos + 1] != b":":
+                    raise json.JSONDecodeError("Expecting ':' delimiter", "", pos)
+                pos = self._skip_whitespace(pos + 1)
+            else:
+                key = index
+                index += 1
+
+            child_path = path + (key,)
+            if child_path in self._prefixes and data[pos:pos + 1] in (b"{", b"["):
+                end = self._index_container(child_path, pos)
+            else:
+                end = self._skip_value(pos)
+            self._entries[child_path] = (pos, end)
+
+            pos = self._skip_whitespace(end)
+            delimiter = data[pos:pos + 1]
+            if delimiter == closing:
+                return pos + 1
+            if delimiter != b",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", "", pos)
+            pos = self._skip_whitespace(pos + 1)
+
+    def _skip_value(self, pos: int) -> int:
+        """ Returns the end offset of the value that starts at `pos`. """
+        data = self._mmap
+        first = data[pos:pos + 1]
+
+        if first == b'"':
+            match = _STRING.match(data, pos)
+        elif first in (b"{", b"["):
+            depth = 0
+            for match in _STRUCTURE.finditer(data, pos):
+                token = match.group()
+                if token in (b"{", b"["):
+                    depth += 1
+                elif token in (b"}", b"]"):
+                    depth -= 1
+                    if not depth:
+                        return match.end()
+            match = None
+        else:
+            match = _SCALAR.match(data, pos)
+
+        if match is None:
+            raise json.JSONDecodeError("Expecting value", "", pos)
+        return match.end()
+
+    def _skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self._mmap, pos).end()
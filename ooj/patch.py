@@ -0,0 +1,437 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+JSON Patch (RFC 6902) support for dictionaries and trees.
+
+`diff` computes a patch that turns one document into another, and
+`apply_patch` applies a patch in place. Both work on plain dictionaries
+and on `RootTree`s. When both sides of a comparison are trees, subtrees
+with equal content hashes are skipped without being visited, so diffing two
+versions of a tree whose hashes are cached costs time proportional to the
+changed region rather than to the document.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .entities import BaseTree, Entry, JsonEntity, TreeConverter, _SCALAR_TYPES, _to_plain
+from .exceptions.exceptions import PatchException
+
+Document = Union[Dict[str, Any], BaseTree]
+Operation = Dict[str, Any]
+
+_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+def escape_token(key: Any) -> str:
+    """ Escapes a key as a JSON Pointer reference token. """
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    Splits a JSON Pointer into its unescaped reference tokens.
+
+    Raises:
+        PatchException: If the pointer is neither empty nor starts with "/".
+    """
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise PatchException(f"Invalid JSON Pointer '{pointer}'.")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def diff(source: Document, target: Document) -> List[Operation]:
+    """
+    Computes a JSON Patch that turns the source document into the target.
+
+    Objects are compared key by key, arrays keep their common prefix and
+    suffix and differ element by element in the middle, and anything else
+    that differs is replaced. Subtrees of two trees with equal content hashes
+    are skipped, as are values that are the same object.
+
+    Args:
+        source (Union[Dict[str, Any], BaseTree]): The original document.
+        target (Union[Dict[str, Any], BaseTree]): The changed document.
+
+    Returns:
+        List[Dict[str, Any]]: The patch operations; the values are plain copies.
+    """
+    patch: List[Operation] = []
+    stack: List[Tuple[str, Any, Any]] = [("", source, target)]
+
+    while stack:
+        path, a, b = stack.pop()
+        if _same(a, b):
+            continue
+
+        a_children, b_children = _mapping(a), _mapping(b)
+        if a_children is not None and b_children is not None:
+            for key in a_children:
+                if key not in b_children:
+                    patch.append({"op": "remove", "path": f"{path}/{escape_token(key)}"})
+            for key, b_child in b_children.items():
+                child_path = f"{path}/{escape_token(key)}"
+                if key not in a_children:
+                    patch.append({"op": "add", "path": child_path, "value": _plain(b_child)})
+                elif not _same(a_children[key], b_child):
+                    stack.append((child_path, a_children[key], b_child))
+            continue
+
+        a_value, b_value = _unwrap(a), _unwrap(b)
+        if isinstance(a_value, list) and isinstance(b_value, list):
+            _diff_arrays(path, a_value, b_value, patch, stack)
+        else:
+            patch.append({"op": "replace", "path": path, "value": _plain(b)})
+
+    return patch
+
+
+def _diff_arrays(path: str, a: list, b: list, patch: List[Operation], stack: list) -> None:
+    """
+    Diffs two arrays. The elements in the middle that both arrays have are
+    diffed in place; the extra elements are removed or added at the end of
+    the middle, so the indexes of the diffed elements never shift.
+    """
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and _same(a[start], b[start]):
+        start += 1
+
+    a_end, b_end = len(a), len(b)
+    while a_end > start and b_end > start and _same(a[a_end - 1], b[b_end - 1]):
+        a_end -= 1
+        b_end -= 1
+
+    common = min(a_end, b_end) - start
+    for offset in range(common):
+        index = start + offset
+        stack.append((f"{path}/{index}", a[index], b[index]))
+
+    for index in range(a_end - 1, start + common - 1, -1):
+        patch.append({"op": "remove", "path": f"{path}/{index}"})
+    for index in range(start + common, b_end):
+        patch.append({"op": "add", "path": f"{path}/{index}", "value": _plain(b[index])})
+
+
+def _unwrap(value: Any) -> Any:
+    return value.value if isinstance(value, Entry) else value
+
+
+def _mapping(value: Any) -> Optional[Dict[str, Any]]:
+    """ Returns the children of an object (entries stay wrapped), or None for other values. """
+    if isinstance(value, BaseTree):
+        # An untouched lazy tree is diffed through its source, without converting it.
+        return value._source if value._source is not None else value._entries
+    value = _unwrap(value)
+    return value if isinstance(value, dict) else None
+
+
+def _digest(value: Any) -> bytes:
+    return value._value_digest() if isinstance(value, Entry) else value._digest()
+
+
+def _same(a: Any, b: Any, numeric: bool = False) -> bool:
+    """
+    Returns True if the values are equal JSON values. Scalars must also have
+    the same JSON type, so `True`, `1` and `1.0` differ, also inside containers.
+    With `numeric`, numbers are compared by value like the "test" operation of
+    RFC 6902 does, so `1` equals `1.0`; booleans still differ from numbers.
+    """
+    # Values that differ for Python differ as JSON values too; only the equal
+    # ones are walked to tell the scalar types apart.
+    if not isinstance(a, JsonEntity) and not isinstance(b, JsonEntity):
+        try:
+            if a != b:
+                return False
+        except RecursionError:
+            pass
+
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        value_type = type(a)
+        if value_type is type(b):
+            if value_type is dict:
+                if a.keys() != b.keys():
+                    return False
+                stack.extend(zip(a.values(), map(b.__getitem__, a)))
+                continue
+            if value_type is list:
+                if len(a) != len(b):
+                    return False
+                stack.extend(zip(a, b))
+                continue
+            if value_type in _SCALAR_TYPES:
+                if a != b:
+                    return False
+                continue
+
+        if not numeric and isinstance(a, JsonEntity) and isinstance(b, JsonEntity):
+            # The digests are tagged with the JSON types of the scalars.
+            if _digest(a) != _digest(b):
+                return False
+            continue
+
+        a, b = _unwrap(a), _unwrap(b)
+        if isinstance(a, BaseTree):
+            a = a._shared_dict()
+        if isinstance(b, BaseTree):
+            b = b._shared_dict()
+
+        if isinstance(a, dict) and isinstance(b, dict):
+            if a.keys() != b.keys():
+                return False
+            stack.extend((item, b[key]) for key, item in a.items())
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                return False
+            stack.extend(zip(a, b))
+        elif numeric and _is_number(a) and _is_number(b):
+            if a != b:
+                return False
+        elif type(a) is not type(b) or a != b:
+            return False
+    return True
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _plain(value: Any) -> Any:
+    """ Returns an independent plain copy of a value, entity or array. """
+    if isinstance(value, Entry):
+        value = value.value
+    if isinstance(value, JsonEntity):
+        value = value._shared_dict()
+    elif isinstance(value, list):
+        value = _to_plain(value)
+    return copy.deepcopy(value)
+
+
+def apply_patch(document: Document, patch: List[Operation], undo_log: Optional[list] = None) -> Document:
+    """
+    Applies a JSON Patch to a dictionary or a tree in place.
+
+    The operations are applied in order. If one fails, the operations before
+    it stay applied; `JsonFile.apply_patch` runs the patch in a transaction
+    to roll them back.
+
+    Args:
+        document (Union[Dict[str, Any], BaseTree]): The document to change.
+        patch (List[Dict[str, Any]]): The patch operations.
+        undo_log (Optional[list]): Receives `(container, key, existed, old_value)`
+            records of the changed dictionary keys, and `(array, None, True, copy)`
+            records of the changed arrays, to revert a plain document.
+
+    Returns:
+        Union[Dict[str, Any], BaseTree]: The document.
+
+    Raises:
+        PatchException: If an operation is malformed, a path does not exist
+            or a "test" operation fails.
+    """
+    for operation in patch:
+        op = _member(operation, "op")
+        path = parse_pointer(_member(operation, "path"))
+
+        if op == "add":
+            _add(document, path, copy.deepcopy(_member(operation, "value")), undo_log)
+        elif op == "remove":
+            _remove(document, path, undo_log)
+        elif op == "replace":
+            _replace(document, path, copy.deepcopy(_member(operation, "value")), undo_log)
+        elif op in ("move", "copy"):
+            from_path = parse_pointer(_member(operation, "from"))
+            if op == "move":
+                if from_path == path:
+                    continue
+                if path[:len(from_path)] == from_path:
+                    raise PatchException(f"Can not move '{operation['from']}' into one of its children.")
+                value = _remove(document, from_path, undo_log)
+            else:
+                value = _plain(_get(document, from_path))
+            _add(document, path, value, undo_log)
+        elif op == "test":
+            if not _same(_get(document, path), _member(operation, "value"), numeric=True):
+                raise PatchException(f"Test failed at '{operation['path']}'.")
+        else:
+            raise PatchException(f"Unknown patch operation '{op}', expected one of {list(_OPERATIONS)}.")
+
+    return document
+
+
+def _member(operation: Operation, name: str) -> Any:
+    try:
+        return operation[name]
+    except (KeyError, TypeError):
+        raise PatchException(f"The operation {operation!r} has no '{name}' member.") from None
+
+
+def _locate(document: Document, path: List[str]) -> Tuple[Any, str, Optional[Entry]]:
+    """
+    Returns the container of the last token of the path, the last token and
+    the innermost entry on the way, whose array values are changed in place.
+    """
+    node, entry = document, None
+    for token in path[:-1]:
+        node = _child(node, token)
+        if isinstance(node, Entry):
+            entry, node = node, node.value
+    return node, path[-1], entry
+
+
+def _child(container: Any, token: str) -> Any:
+    """ Returns the child at the token; entries of trees are returned as they are. """
+    if isinstance(container, list):
+        return container[_index(container, token)]
+    if isinstance(container, BaseTree):
+        children = container._entries
+    elif isinstance(container, dict):
+        children = container
+    else:
+        raise PatchException(f"Can not resolve '{token}' in a {type(container).__name__}.")
+
+    if token not in children:
+        raise PatchException(f"Key '{token}' not found.")
+    return children[token]
+
+
+def _index(array: list, token: str, insert: bool = False) -> int:
+    """ Converts an array token to an index; "-" is the end of the array when inserting. """
+    if insert and token == "-":
+        return len(array)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchException(f"Invalid array index '{token}'.")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not insert):
+        raise PatchException(f"Array index '{token}' is out of range.")
+    return index
+
+
+def _get(document: Document, path: List[str]) -> Any:
+    node = document
+    for token in path:
+        node = _unwrap(_child(_unwrap(node), token))
+    return node
+
+
+def _record(undo_log: Optional[list], container: Any, key: Any) -> None:
+    if undo_log is None:
+        return
+    if isinstance(container, list):
+        undo_log.append((container, None, True, list(container)))
+    else:
+        undo_log.append((container, key, key in container, container.get(key)))
+
+
+def _touch(container: Any, entry: Optional[Entry]) -> None:
+    """ Re-links an entry array changed in place, so the caches of the tree are dropped. """
+    if entry is not None and not isinstance(container, BaseTree):
+        entry.value = entry.value
+
+
+def _tree_item(document: Document, value: Any) -> Any:
+    """ Converts a value stored in an array of a tree the way `TreeConverter` does. """
+    if not isinstance(document, BaseTree):
+        return value
+    if isinstance(value, dict):
+        return TreeConverter.to_root_tree(value)
+    if isinstance(value, list):
+        return _tree_node("", value).value
+    return value
+
+
+def _tree_node(key: str, value: Any) -> Union[Entry, BaseTree]:
+    """ Converts a value to the child of a tree stored under the key. """
+    if isinstance(value, dict):
+        return TreeConverter.to_tree(key, value)
+    if isinstance(value, list):
+        holder = TreeConverter.to_root_tree({key: value})
+        return holder._children[key]
+    return Entry(key, value)
+
+
+def _replace_root(document: Document, value: Any, undo_log: Optional[list]) -> None:
+    if not isinstance(value, dict):
+        raise PatchException("The whole document can only be replaced with an object.")
+    if isinstance(document, BaseTree):
+        document.tree = TreeConverter.to_root_tree(value).tree
+        return
+    for key in list(document):
+        _record(undo_log, document, key)
+        del document[key]
+    for key, item in value.items():
+        _record(undo_log, document, key)
+        document[key] = item
+
+
+def _add(document: Document, path: List[str], value: Any, undo_log: Optional[list]) -> None:
+    if not path:
+        _replace_root(document, value, undo_log)
+        return
+
+    container, token, entry = _locate(document, path)
+    if isinstance(container, BaseTree):
+        container._attach(token, _tree_node(token, value))
+    elif isinstance(container, dict):
+        _record(undo_log, container, token)
+        container[token] = value
+    elif isinstance(container, list):
+        index = _index(container, token, insert=True)
+        _record(undo_log, container, token)
+        container.insert(index, _tree_item(document, value))
+    else:
+        raise PatchException(f"Can not add '{token}' to a {type(container).__name__}.")
+    _touch(container, entry)
+
+
+def _remove(document: Document, path: List[str], undo_log: Optional[list]) -> Any:
+    """ Removes the value at the path and returns it as a plain value. """
+    if not path:
+        raise PatchException("The whole document can not be removed.")
+
+    container, token, entry = _locate(document, path)
+    if isinstance(container, BaseTree):
+        value = _plain(_child(container, token))
+        container.remove(token)
+    elif isinstance(container, dict):
+        _child(container, token)
+        _record(undo_log, container, token)
+        value = container.pop(token)
+    elif isinstance(container, list):
+        index = _index(container, token)
+        _record(undo_log, container, token)
+        value = container.pop(index)
+        if isinstance(document, BaseTree):
+            value = _plain(value)
+    else:
+        raise PatchException(f"Can not remove '{token}' from a {type(container).__name__}.")
+    _touch(container, entry)
+    return value
+
+
+def _replace(document: Document, path: List[str], value: Any, undo_log: Optional[list]) -> None:
+    if not path:
+        _replace_root(document, value, undo_log)
+        return
+
+    container, token, entry = _locate(document, path)
+    if isinstance(container, BaseTree):
+        _child(container, token)
+        container._attach(token, _tree_node(token, value))
+    elif isinstance(container, dict):
+        _child(container, token)
+        _record(undo_log, container, token)
+        container[token] = value
+    elif isinstance(container, list):
+        index = _index(container, token)
+        _record(undo_log, container, token)
+        container[index] = _tree_item(document, value)
+    else:
+        raise PatchException(f"Can not replace '{token}' in a {type(container).__name__}.")
+    _touch(container, entry)
@@ -0,0 +1,444 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+A JSONPath-style query language for dictionaries, trees and JsonFile data.
+
+Supported syntax:
+    $                   the document root (optional at the start)
+    .name, ['name']     a member of an object
+    .*, [*]             every member of an object or item of an array
+    [0], [-1]           an array item, counted from the end when negative
+    [1:5], [::2]        an array slice with Python semantics
+    [0,2], ['a','b']    a union of indexes or names
+    ..name, ..*, ..[0]  recursive descent: the selector applied to every
+                        node of the subtree, the node itself included
+    [?(@.price < 10)]   the members or items matching a filter
+
+Filters compare relative paths (`@.a.b`, `@['a'][0]`, `@` itself) with
+strings, numbers, `true`, `false` and `null` using `==`, `!=`, `<`, `<=`,
+`>` and `>=`, test the existence of a path (`[?(@.isbn)]`) and combine
+conditions with `&&`, `||`, `!` and parentheses.
+
+A compiled `Query` is a chain of generator steps, so `iter` yields the
+matches one by one without building intermediate lists.
+"""
+
+import operator
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .cache import CacheInfo, LRUCache
+from .entities import BaseTree, Entry
+from .exceptions.exceptions import QueryException
+
+Path = Tuple[Union[str, int], ...]
+Match = Tuple[Path, Any]
+Selector = Callable[[Path, Any], Iterator[Match]]
+Predicate = Callable[[Any], bool]
+
+_NAME = re.compile(r"[^\s.\[\]()'\"=!<>&|,:?@$]+")
+_INDEX = re.compile(r"-?\d+")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_COMPARISONS = {
+    "==": operator.eq, "!=": operator.ne,
+    "<=": operator.le, ">=": operator.ge,
+    "<": operator.lt, ">": operator.gt,
+}
+_LITERALS = {"true": True, "false": False, "null": None}
+_MISSING = object()
+
+
+def _members(node: Any) -> Iterator[Tuple[Union[str, int], Any]]:
+    """ Yields the (key, value) pairs of an object or the (index, item) pairs of an array. """
+    if isinstance(node, BaseTree):
+        for key, child in node._entries.items():
+            yield key, child.value if isinstance(child, Entry) else child
+    elif isinstance(node, dict):
+        yield from node.items()
+    elif isinstance(node, list):
+        yield from enumerate(node)
+
+
+def _member(node: Any, key: Union[str, int]) -> Any:
+    """ Returns the member or item at the key, or `_MISSING`. """
+    if isinstance(node, list):
+        if isinstance(key, int) and -len(node) <= key < len(node):
+            return node[key]
+        return _MISSING
+    if isinstance(node, BaseTree):
+        child = node._entries.get(key, _MISSING)
+        return child.value if isinstance(child, Entry) else child
+    if isinstance(node, dict):
+        return node.get(key, _MISSING)
+    return _MISSING
+
+
+def _name_selector(name: str) -> Selector:
+    def select(path: Path, node: Any) -> Iterator[Match]:
+        if not isinstance(node, list):
+            value = _member(node, name)
+            if value is not _MISSING:
+                yield path + (name,), value
+    return select
+
+
+def _index_selector(index: int) -> Selector:
+    def select(path: Path, node: Any) -> Iterator[Match]:
+        if isinstance(node, list) and -len(node) <= index < len(node):
+            position = index % len(node)
+            yield path + (position,), node[position]
+    return select
+
+
+def _slice_selector(start: Optional[int], stop: Optional[int], step: Optional[int]) -> Selector:
+    if step == 0:
+        raise QueryException("The slice step can not be zero.")
+
+    def select(path: Path, node: Any) -> Iterator[Match]:
+        if isinstance(node, list):
+            for position in range(*slice(start, stop, step).indices(len(node))):
+                yield path + (position,), node[position]
+    return select
+
+
+def _wildcard_selector(path: Path, node: Any) -> Iterator[Match]:
+    for key, value in _members(node):
+        yield path + (key,), value
+
+
+def _union_selector(selectors: List[Selector]) -> Selector:
+    def select(path: Path, node: Any) -> Iterator[Match]:
+        for selector in selectors:
+            yield from selector(path, node)
+    return select
+
+
+def _filter_selector(predicate: Predicate) -> Selector:
+    def select(path: Path, node: Any) -> Iterator[Match]:
+        for key, value in _members(node):
+            if predicate(value):
+                yield path + (key,), value
+    return select
+
+
+def _child_step(selector: Selector) -> Callable[[Iterator[Match]], Iterator[Match]]:
+    def step(matches: Iterator[Match]) -> Iterator[Match]:
+        for path, node in matches:
+            yield from selector(path, node)
+    return step
+
+
+def _descendant_step(selector: Selector) -> Callable[[Iterator[Match]], Iterator[Match]]:
+    def step(matches: Iterator[Match]) -> Iterator[Match]:
+        for path, node in matches:
+            # Pre-order walk with an explicit stack, so depth is not limited by recursion.
+            stack = [(path, node)]
+            while stack:
+                path, node = stack.pop()
+                yield from selector(path, node)
+                children = [(path + (key,), value) for key, value in _members(node)]
+                stack.extend(reversed(children))
+    return step
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return False
+    # JSON booleans are not numbers.
+    if isinstance(left, bool) != isinstance(right, bool):
+        return op == "!="
+    try:
+        return bool(_COMPARISONS[op](left, right))
+    except TypeError:
+        return False
+
+
+class _Parser:
+    """ A recursive descent parser that compiles an expression into query steps. """
+
+    def __init__(self, expression: str) -> None:
+        self.text = expression
+        self.pos = 0
+
+    def error(self, message: str) -> QueryException:
+        return QueryException(f"{message} at position {self.pos} of '{self.text}'.")
+
+    def skip_spaces(self) -> None:
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+
+    def peek(self, token: str) -> bool:
+        return self.text.startswith(token, self.pos)
+
+    def accept(self, token: str) -> bool:
+        self.skip_spaces()
+        if self.peek(token):
+            self.pos += len(token)
+            return True
+        return False
+
+    def expect(self, token: str) -> None:
+        if not self.accept(token):
+            raise self.error(f"Expected '{token}'")
+
+    def match(self, pattern: "re.Pattern") -> Optional[str]:
+        found = pattern.match(self.text, self.pos)
+        if found is None:
+            return None
+        self.pos = found.end()
+        return found.group()
+
+    # Paths.
+
+    def parse_path(self) -> list:
+        self.skip_spaces()
+        steps = []
+        if not self.accept("$") and self.pos < len(self.text) and not self.peek(".") and not self.peek("["):
+            # A path may start with a member name: "users[0].name".
+            steps.append(_child_step(self.parse_dot_selector()))
+
+        while True:
+            self.skip_spaces()
+            if self.pos >= len(self.text):
+                return steps
+            if self.peek(".."):
+                self.pos += 2
+                selector = self.parse_bracket() if self.accept("[") else self.parse_dot_selector()
+                steps.append(_descendant_step(selector))
+            elif self.peek("."):
+                self.pos += 1
+                steps.append(_child_step(self.parse_dot_selector()))
+            elif self.peek("["):
+                self.pos += 1
+                steps.append(_child_step(self.parse_bracket()))
+            else:
+                raise self.error("Unexpected character")
+
+    def parse_dot_selector(self) -> Selector:
+        if self.accept("*"):
+            return _wildcard_selector
+        name = self.match(_NAME)
+        if name is None:
+            raise self.error("Expected a member name")
+        return _name_selector(name)
+
+    def parse_bracket(self) -> Selector:
+        """ Parses the contents of a bracket selector up to and including "]". """
+        self.skip_spaces()
+        if self.accept("*"):
+            selector = _wildcard_selector
+        elif self.accept("?"):
+            parenthesized = self.accept("(")
+            selector = _filter_selector(self.parse_or())
+            if parenthesized:
+                self.expect(")")
+        else:
+            selectors = [self.parse_union_member()]
+            while self.accept(","):
+                selectors.append(self.parse_union_member())
+            selector = selectors[0] if len(selectors) == 1 else _union_selector(selectors)
+        self.expect("]")
+        return selector
+
+    def parse_union_member(self) -> Selector:
+        self.skip_spaces()
+        if self.peek("'") or self.peek('"'):
+            return _name_selector(self.parse_string())
+
+        bounds = [self.parse_optional_index()]
+        while self.accept(":"):
+            bounds.append(self.parse_optional_index())
+        if len(bounds) == 1:
+            if bounds[0] is None:
+                raise self.error("Expected an index, a slice or a quoted name")
+            return _index_selector(bounds[0])
+        if len(bounds) > 3:
+            raise self.error("A slice has at most three parts")
+        return _slice_selector(*(bounds + [None] * (3 - len(bounds))))
+
+    def parse_optional_index(self) -> Optional[int]:
+        self.skip_spaces()
+        index = self.match(_INDEX)
+        return None if index is None else int(index)
+
+    def parse_string(self) -> str:
+        quote = self.text[self.pos]
+        self.pos += 1
+        chars = []
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            self.pos += 1
+            if char == "\\" and self.pos < len(self.text):
+                chars.append(self.text[self.pos])
+                self.pos += 1
+            elif char == quote:
+                return "".join(chars)
+            else:
+                chars.append(char)
+        raise self.error("Unterminated string")
+
+    # Filters.
+
+    def parse_or(self) -> Predicate:
+        predicates = [self.parse_and()]
+        while self.accept("||"):
+            predicates.append(self.parse_and())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda node: any(predicate(node) for predicate in predicates)
+
+    def parse_and(self) -> Predicate:
+        predicates = [self.parse_unary()]
+        while self.accept("&&"):
+            predicates.append(self.parse_unary())
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda node: all(predicate(node) for predicate in predicates)
+
+    def parse_unary(self) -> Predicate:
+        if self.accept("!"):
+            predicate = self.parse_unary()
+            return lambda node: not predicate(node)
+        if self.accept("("):
+            predicate = self.parse_or()
+            self.expect(")")
+            return predicate
+
+        left = self.parse_operand()
+        self.skip_spaces()
+        op = next((op for op in _COMPARISONS if self.peek(op)), None)
+        if op is None:
+            if left[0] != "path":
+                raise self.error("Expected a comparison")
+            resolve = left[1]
+            return lambda node: resolve(node) is not _MISSING
+
+        self.pos += len(op)
+        right = self.parse_operand()
+        left_value, right_value = self.operand_getter(left), self.operand_getter(right)
+        return lambda node: _compare(op, left_value(node), right_value(node))
+
+    def operand_getter(self, operand: tuple) -> Callable[[Any], Any]:
+        if operand[0] == "path":
+            return operand[1]
+        value = operand[1]
+        return lambda node: value
+
+    def parse_operand(self) -> tuple:
+        """ Returns ("path", resolver) for a relative path or ("literal", value). """
+        self.skip_spaces()
+        if self.accept("@"):
+            return "path", self.parse_relative_path()
+        if self.peek("'") or self.peek('"'):
+            return "literal", self.parse_string()
+        number = self.match(_NUMBER)
+        if number is not None:
+            return "literal", float(number) if any(c in number for c in ".eE") else int(number)
+        for word, value in _LITERALS.items():
+            if self.peek(word):
+                self.pos += len(word)
+                return "literal", value
+        raise self.error("Expected '@', a string, a number, true, false or null")
+
+    def parse_relative_path(self) -> Callable[[Any], Any]:
+        keys: List[Union[str, int]] = []
+        while True:
+            if self.peek(".") and not self.peek(".."):
+                self.pos += 1
+                name = self.match(_NAME)
+                if name is None:
+                    raise self.error("Expected a member name")
+                keys.append(name)
+            elif self.peek("["):
+                self.pos += 1
+                self.skip_spaces()
+                if self.peek("'") or self.peek('"'):
+                    keys.append(self.parse_string())
+                else:
+                    index = self.parse_optional_index()
+                    if index is None:
+                        raise self.error("Expected an index or a quoted name")
+                    keys.append(index)
+                self.expect("]")
+            else:
+                break
+
+        def resolve(node: Any) -> Any:
+            for key in keys:
+                node = _member(node, key)
+                if node is _MISSING:
+                    break
+            return node
+        return resolve
+
+
+class Query:
+    """
+    A compiled query expression. Compile expressions with `Query.compile`,
+    which caches the compiled queries of the most recently used expressions.
+
+    Matches are the values of entries and the subtrees themselves for trees,
+    and the plain values for dictionaries.
+
+    Attributes:
+        expression (str): The source expression.
+    """
+
+    # Compiled queries keyed by their expression.
+    _compiled = LRUCache(maxsize=256)
+
+    def __init__(self, expression: str) -> None:
+        """
+        Parses and compiles the expression. Prefer `Query.compile`, which reuses compiled queries.
+
+        Raises:
+            QueryException: If the expression is invalid.
+        """
+        if not isinstance(expression, str):
+            raise QueryException(f"A query must be a string, got {type(expression).__name__}.")
+        self.expression = expression
+        self._steps = _Parser(expression).parse_path()
+
+    @classmethod
+    def compile(cls, expression: Union[str, 'Query']) -> 'Query':
+        """ Returns the compiled query of the expression, from the cache when possible. """
+        if isinstance(expression, Query):
+            return expression
+
+        query = cls._compiled.get(expression)
+        if query is None:
+            query = cls(expression)
+            cls._compiled.set(expression, query)
+        return query
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """ Returns the statistics of the compiled query cache. """
+        return cls._compiled.info()
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """ Drops all compiled queries. """
+        cls._compiled.clear()
+
+    def iter_paths(self, document: Union[Dict[str, Any], BaseTree, list]) -> Iterator[Match]:
+        """ Yields `(path, value)` pairs of the matches; a path is a tuple of keys and array indexes. """
+        matches: Iterator[Match] = iter((((), document),))
+        for step in self._steps:
+            matches = step(matches)
+        return matches
+
+    def iter(self, document: Union[Dict[str, Any], BaseTree, list]) -> Iterator[Any]:
+        """ Yields the matching values one by one. """
+        return (value for _, value in self.iter_paths(document))
+
+    def find(self, document: Union[Dict[str, Any], BaseTree, list]) -> List[Any]:
+        """ Returns the list of matching values. """
+        return list(self.iter(document))
+
+    def first(self, document: Union[Dict[str, Any], BaseTree, list], default: Any = None) -> Any:
+        """ Returns the first matching value, or the default if nothing matches. """
+        return next(self.iter(document), default)
+
+    def __repr__(self) -> str:
+        return f"Query({self.expression!r})"
@@ -0,0 +1,359 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import bisect
+import copy
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .file import JsonFile
+
+_MISSING = object()
+
+
+def _index_key(value: Any) -> Hashable:
+    """ Returns the hash key of a field value, or `_MISSING` if the value can not be indexed. """
+    # JSON booleans are not numbers, but True == 1 in Python.
+    if isinstance(value, bool):
+        return ("bool", value)
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return _MISSING
+
+
+class RecordIndex:
+    """
+    A hash index from a field of the records of an array inside a JsonFile
+    to the positions of the records, e.g. `users[*].id`. Lookups by the
+    field value take constant time.
+
+    The index is rebuilt on the next lookup after the array (or one of its
+    parents) is replaced by `set_entry`, `del_entry`, `write`, a patch, a
+    rollback or a reload of a changed file. Records inserted, updated or
+    deleted through `insert`, `update` and `delete` are indexed
+    incrementally. Mutating the records of the buffer in place is not tracked.
+    In the concurrent mode of the file, lookups take the shared lock and the
+    helpers the exclusive one.
+
+    With a journal, `insert` and `update` journal only the changed records;
+    `delete` shifts the following records and journals the whole array.
+    Without a journal, every helper call rewrites the file, so bulk changes
+    belong inside `file.transaction()`.
+
+    Records without the field, and records whose field is an object or an
+    array, are not indexed.
+
+    Attributes:
+        array_path (List[str]): The keys leading to the array of records.
+        key_path (List[str]): The keys leading to the indexed field inside a record.
+        unique (bool): Whether a field value may belong to one record only.
+    """
+
+    def __init__(self,
+                 file: 'JsonFile',
+                 array_path: List[str],
+                 key_path: List[str],
+                 unique: bool = False,
+                 persist: bool = False):
+        """
+        Initializes a RecordIndex instance. Use `JsonFile.create_index` to create indexes.
+
+        Args:
+            file (JsonFile): The file that contains the array.
+            array_path (List[str]): The keys leading to the array of records.
+            key_path (List[str]): The keys leading to the indexed field inside a record.
+            unique (bool): Whether a field value may belong to one record only. Defaults to False.
+            persist (bool): Whether the index is saved in `<file>.indexes.json`. Defaults to False.
+        """
+        self.array_path = list(array_path)
+        self.key_path = list(key_path)
+        self.unique = unique
+        self.persist = persist
+
+        self._file = file
+        self._positions: Dict[Hashable, List[int]] = {}
+        self._array: Optional[list] = None
+        self._stale = True
+
+    @property
+    def name(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """ Returns the (array path, key path) pair that identifies the index. """
+        return tuple(self.array_path), tuple(self.key_path)
+
+    def get(self, value: Any, default: Any = None) -> Any:
+        """
+        Returns the record with the field value for a unique index, or the
+        list of records with the field value otherwise.
+
+        Args:
+            value (Any): The field value.
+            default (Any): Returned if no record has the value.
+        """
+        with self._file._shared_access(), self._file._lock:
+            array = self._ensure_current()
+            positions = self._positions.get(_index_key(value))
+            if not positions:
+                return default
+            if self.unique:
+                return array[positions[0]]
+            return [array[position] for position in positions]
+
+    def positions(self, value: Any) -> List[int]:
+        """ Returns the positions of the records with the field value in the array. """
+        with self._file._shared_access(), self._file._lock:
+            self._ensure_current()
+            return list(self._positions.get(_index_key(value), ()))
+
+    def __contains__(self, value: Any) -> bool:
+        with self._file._shared_access(), self._file._lock:
+            self._ensure_current()
+            return _index_key(value) in self._positions
+
+    def __len__(self) -> int:
+        """ Returns the number of distinct indexed values. """
+        with self._file._shared_access(), self._file._lock:
+            self._ensure_current()
+            return len(self._positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Iterates the distinct indexed values. """
+        with self._file._shared_access(), self._file._lock:
+            self._ensure_current()
+            keys = list(self._positions)
+        return (key[1] if isinstance(key, tuple) else key for key in keys)
+
+    def insert(self, record: Dict[str, Any]) -> None:
+        """
+        Appends a record to the array (creating the array if it is missing).
+        Every index of the array is updated.
+
+        Raises:
+            ValueError: If a unique index of the array already has the field value of the record.
+        """
+        file = self._file
+        with file._exclusive_access(), file._lock:
+            created = self._resolve(file._ensure_buffer()) is _MISSING
+            indexes = self._siblings()
+            # The array is created only once the record is known to fit, so an
+            # ignored duplicate leaves the buffer untouched.
+            if not self._check_unique(indexes, record):
+                return
+            array = self._ensure_current(create_if_missing=True)
+            if created:
+                indexes = self._siblings()
+
+            file._record_array_undo(array)
+            array.append(record)
+            for index in indexes:
+                index._added(len(array) - 1, record)
+            if created:
+                file._commit_change("set", self.array_path, array)
+            else:
+                file._commit_change("set", self.array_path + [len(array) - 1], record)
+
+    def update(self, value: Any, record: Dict[str, Any]) -> None:
+        """
+        Replaces the records with the field value by the record.
+        Every index of the array is updated.
+
+        Raises:
+            KeyError: If no record has the field value.
+            ValueError: If a unique index of the array has the new field value on another record.
+        """
+        file = self._file
+        with file._exclusive_access(), file._lock:
+            array = self._ensure_current()
+            positions = list(self._positions.get(_index_key(value), ()))
+            if not positions:
+                file._handle_exception(KeyError(f"No record with the value {value!r}."))
+                return
+            indexes = self._siblings()
+            if not self._check_unique(indexes, record, positions):
+                return
+
+            file._record_array_undo(array)
+            for position in positions:
+                old_record = array[position]
+                array[position] = record if len(positions) == 1 else copy.deepcopy(record)
+                for index in indexes:
+                    index._replaced(position, old_record, array[position])
+            file._commit_changes([("set", self.array_path + [position], array[position])
+                                  for position in positions])
+
+    def delete(self, value: Any) -> int:
+        """
+        Removes the records with the field value from the array. Every index
+        of the array is updated; the positions of the following records shift,
+        which takes linear time.
+
+        Returns:
+            int: The number of removed records.
+        """
+        file = self._file
+        with file._exclusive_access(), file._lock:
+            array = self._ensure_current()
+            positions = list(self._positions.get(_index_key(value), ()))
+            if not positions:
+                return 0
+            indexes = self._siblings()
+
+            file._record_array_undo(array)
+            records = [array[position] for position in positions]
+            for position in reversed(positions):
+                del array[position]
+            for index in indexes:
+                index._removed(positions, records)
+            # Journal records must be idempotent, which a removal by position is not.
+            file._commit_change("set", self.array_path, array)
+            return len(positions)
+
+    def rebuild(self) -> None:
+        """ Rebuilds the index from the array. """
+        with self._file._shared_access(), self._file._lock:
+            self._stale = True
+            self._ensure_current()
+
+    def save(self) -> None:
+        """ Saves the index together with the other persisted indexes of the file. """
+        self._file.save_indexes()
+
+    def to_json(self) -> Dict[str, Any]:
+        """ Returns the persisted form of the index. """
+        with self._file._shared_access(), self._file._lock:
+            self._ensure_current()
+            return {
+                "array_path": self.array_path,
+                "key_path": self.key_path,
+                "unique": self.unique,
+                "signature": repr(self._file._file_signature()),
+                "entries": [
+                    [list(key) if isinstance(key, tuple) else key, positions]
+                    for key, positions in self._positions.items()
+                ]
+            }
+
+    def load(self, data: Dict[str, Any]) -> bool:
+        """ Loads a persisted index if it matches the index and the current file; returns True on success. """
+        if (data.get("array_path") != self.array_path or data.get("key_path") != self.key_path
+                or data.get("unique") != self.unique
+                or data.get("signature") != repr(self._file._file_signature())):
+            return False
+
+        with self._file._shared_access(), self._file._lock:
+            node = self._resolve(self._file._ensure_buffer())
+            self._positions = {
+                tuple(key) if isinstance(key, list) else key: positions
+                for key, positions in data.get("entries", [])
+            }
+            self._array = node if isinstance(node, list) else None
+            self._stale = False
+            return True
+
+    def mark_stale(self) -> None:
+        """ Makes the next lookup rebuild the index. """
+        self._stale = True
+
+    def _ensure_current(self, create_if_missing: bool = False) -> list:
+        """ Returns the array, rebuilding the index if the array was replaced or changed. """
+        node = self._resolve(self._file._ensure_buffer())
+        array = node if isinstance(node, list) else None
+        if array is None and create_if_missing:
+            if node is not _MISSING:
+                raise TypeError(f"The value at {self.array_path} is not an array.")
+            # The caller writes the array together with its first record.
+            self._file._set_in_buffer(self.array_path, [])
+            array = self._resolve(self._file._ensure_buffer())
+
+        if self._stale or array is not self._array:
+            self._build(array)
+        return array if array is not None else []
+
+    def _build(self, array: Optional[list]) -> None:
+        """ Indexes the records of the array from scratch. """
+        positions: Dict[Hashable, List[int]] = {}
+        for position, record in enumerate(array or ()):
+            key = _index_key(self._field(record))
+            if key is _MISSING:
+                continue
+            if self.unique and key in positions:
+                # An ignored duplicate keeps the first record.
+                self._file._handle_exception(
+                    ValueError(f"Duplicate value {self._field(record)!r} in a unique index.")
+                )
+                continue
+            positions.setdefault(key, []).append(position)
+
+        self._positions = positions
+        self._array = array
+        self._stale = False
+
+    def _resolve(self, buffer: Dict[str, Any]) -> Any:
+        """ Returns the value at the array path, or `_MISSING`. """
+        node = buffer
+        for key in self.array_path:
+            if not isinstance(node, dict) or key not in node:
+                return _MISSING
+            node = node[key]
+        return node
+
+    def _field(self, record: Any) -> Any:
+        for key in self.key_path:
+            if not isinstance(record, dict) or key not in record:
+                return _MISSING
+            record = record[key]
+        return record
+
+    def _siblings(self) -> List['RecordIndex']:
+        """ Returns the up-to-date indexes of the same array, this one included. """
+        indexes = self._file._indexes_of(self.array_path)
+        if self not in indexes:
+            indexes.append(self)
+        for index in indexes:
+            index._ensure_current()
+        return indexes
+
+    def _check_unique(self, indexes: List['RecordIndex'], record: Any, replaced: List[int] = ()) -> bool:
+        """
+        Returns True if storing the record at the replaced positions (or
+        appending it) keeps the values of the unique indexes distinct.
+        """
+        for index in indexes:
+            if not index.unique:
+                continue
+            field = index._field(record)
+            key = _index_key(field)
+            if key is _MISSING:
+                continue
+            taken = index._positions.get(key, ())
+            if len(replaced) > 1 or any(position not in replaced for position in taken):
+                self._file._handle_exception(ValueError(f"Duplicate value {field!r} in a unique index."))
+                return False
+        return True
+
+    def _added(self, position: int, record: Any) -> None:
+        key = _index_key(self._field(record))
+        if key is not _MISSING:
+            bisect.insort(self._positions.setdefault(key, []), position)
+
+    def _discard(self, position: int, record: Any) -> None:
+        key = _index_key(self._field(record))
+        positions = self._positions.get(key)
+        if positions and position in positions:
+            positions.remove(position)
+            if not positions:
+                del self._positions[key]
+
+    def _replaced(self, position: int, old_record: Any, new_record: Any) -> None:
+        self._discard(position, old_record)
+        self._added(position, new_record)
+
+    def _removed(self, positions: List[int], records: List[Any]) -> None:
+        """ Drops the removed records and shifts the positions of the following ones. """
+        for position, record in zip(positions, records):
+            self._discard(position, record)
+        for key, key_positions in self._positions.items():
+            self._positions[key] = [
+                position - bisect.bisect_left(positions, position) for position in key_positions
+            ]
+
+    def __repr__(self) -> str:
+        return f"RecordIndex({self.array_path!r}, {self.key_path!r}, unique={self.unique})"
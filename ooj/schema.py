@@ -1,10 +1,14 @@
 # (c) KiryxaTech, 2024. Apache License 2.0
 
-import json
+import copy
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+from .cache import CacheInfo, LRUCache
+from .codec import get_codec
 
 
 class Schema:
@@ -28,11 +32,23 @@ class Schema:
         
         dump_to_file(file_path: Union[str, Path]) -> None:
             Dumps the schema to a JSON file.
+
+        compile() -> Validator:
+            Builds the validator of the schema once and returns it on later calls.
+
+        compile_file(file_path: Union[str, Path]) -> Validator:
+            Returns a cached validator for a schema file, rebuilt when the file changes.
+
+        cache_info() -> CacheInfo:
+            Returns the statistics of the schema file validator cache.
         
         _get_version(schema_link: str) -> str:
             Extracts the version from the schema link.
     """
 
+    # Validators built from schema files, keyed by the file identity, mtime and size.
+    _file_validators = LRUCache(maxsize=128)
+
     def __init__(
         self,
         title: str,
@@ -46,16 +62,18 @@ class Schema:
         Args:
             title (str): The title of the schema.
             type_ (Optional[str]): The type of the schema. Defaults to "object".
-            properties (Optional[Dict[str, Any]]): The properties of the schema. Defaults to an empty dictionary.
-            required (Optional[List[str]]): The required properties of the schema. Defaults to an empty list.
+            properties (Optional[Dict[str, Any]]): The properties of the schema; they are copied.
+                Defaults to an empty dictionary.
+            required (Optional[List[str]]): The required properties of the schema; they are copied.
+                Defaults to an empty list.
             version (Optional[str]): The version of the schema. Defaults to "draft-07".
         """
         
         self._title = title
         self._type = type_
-        self._properties = properties or {}
+        self._properties = copy.deepcopy(properties) if properties else {}
         self._version = version
-        self._required = required or []
+        self._required = list(required) if required else []
 
         self._schema = {
             "$schema": f"http://json-schema.org/{version}/schema#",
@@ -65,12 +83,19 @@ class Schema:
             "required": self._required
         }
 
+        self._validator: Optional[Validator] = None
+
     def to_dict(self) -> Dict[str, Any]:
         """Converts the schema to a dictionary format.
-        
+
+        The dictionary is the schema itself and may be changed to change the
+        schema, so the compiled validator is dropped and rebuilt by the next
+        `compile()`.
+
         Returns:
             Dict[str, Any]: The JSON schema as a dictionary.
         """
+        self._validator = None
         return self._schema
 
     @classmethod
@@ -83,8 +108,7 @@ class Schema:
         Returns:
             Schema: A Schema instance representing the loaded schema.
         """
-        with open(file_path, 'r') as schema_file:
-            schema_dict = json.load(schema_file)
+        schema_dict = get_codec().loads(Path(file_path).read_bytes())
         
         Validator.check_schema(schema_dict)
 
@@ -104,8 +128,70 @@ class Schema:
         Args:
             file_path (Union[str, Path]): The path to the JSON file where the schema will be dumped.
         """
-        with open(file_path, 'w') as schema_file:
-            json.dump(self._schema, schema_file, indent=4)
+        Path(file_path).write_bytes(get_codec().dumpb(self._schema, indent=4))
+
+    def compile(self) -> Validator:
+        """Builds the validator of the schema once and returns it on later calls.
+
+        The validator is built from a copy of the schema. `to_dict()` drops it,
+        since the returned dictionary may be changed, so change the schema
+        through a fresh `to_dict()` result rather than one kept from before
+        the last `compile()`.
+
+        Returns:
+            Validator: A validator instance for the schema.
+
+        Raises:
+            jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+        """
+        if self._validator is None:
+            self._validator = self._build_validator(copy.deepcopy(self._schema))
+        return self._validator
+
+    @classmethod
+    def compile_file(cls, file_path: Union[str, Path]) -> Validator:
+        """Returns a cached validator for a schema file.
+
+        The cache key is the file identity together with its modification time
+        and size, so an edited schema file is parsed and checked again.
+
+        Args:
+            file_path (Union[str, Path]): The path to the JSON file containing the schema.
+
+        Returns:
+            Validator: A validator instance for the schema in the file.
+
+        Raises:
+            jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+        """
+        stat = Path(file_path).stat()
+        cache_key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        validator = cls._file_validators.get(cache_key)
+        if validator is None:
+            schema_dict = get_codec().loads(Path(file_path).read_bytes())
+
+            validator = cls._build_validator(schema_dict)
+            cls._file_validators.set(cache_key, validator)
+
+        return validator
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """Returns the statistics of the schema file validator cache."""
+        return cls._file_validators.info()
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drops all cached schema file validators."""
+        cls._file_validators.clear()
+
+    @staticmethod
+    def _build_validator(schema_dict: Dict[str, Any]) -> Validator:
+        """Checks the schema and creates a validator of the matching draft."""
+        validator_class = validator_for(schema_dict)
+        validator_class.check_schema(schema_dict)
+        return validator_class(schema_dict)
 
     def _get_version(self, schema_link: str) -> str:
         """Extracts the version from the schema link.
@@ -1,16 +1,56 @@
 # (c) KiryxaTech, 2024. Apache License 2.0
 
+import io
 import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
-from typing import Any, Dict, List, Type, Optional, Union, get_args
+from typing import (IO, Any, Dict, Iterable, Iterator, List, Type,
+                    Optional, Union, get_args, get_type_hints)
 
-import jsonschema
 import jsonschema.exceptions
-from jsonschema.protocols import Validator
 
+from .cache import LRUCache
+from .codec import JsonCodec, get_codec
 from .entities import RootTree
 from .exceptions.exceptions import SchemaException, ValidationException
 from .field import Field
+from .schema import Schema
+
+
+# Kinds of field values remembered by a serialization plan.
+_SCALAR = 0
+_ARRAY = 1
+_OBJECT = 2
+
+
+# The number of field layouts remembered per class; instances with more
+# layouts than this are serialized with layouts that are not kept.
+_MAX_LAYOUTS = 16
+
+
+class _SerializationPlan:
+    """
+    The remembered layouts of a class: the name, value type, kind and nested
+    plan of every field, in the order of the instance `__dict__`, keyed by
+    the observed (name, type) pairs. `fields` is the layout used last, which
+    is tried first.
+    """
+    __slots__ = ("fields", "layouts")
+
+    def __init__(self) -> None:
+        self.fields = ()
+        self.layouts = {}
+
+
+def _types_key(types: Optional[Dict[str, Union[Type, Field]]]) -> Optional[tuple]:
+    """Returns a hashable key of field types; `Field` overrides are keyed by their types, not by identity."""
+    if types is None:
+        return None
+    return tuple(
+        (name, type_.type, _types_key(type_.types)) if isinstance(type_, Field) else (name, type_, None)
+        for name, type_ in sorted(types.items(), key=lambda item: item[0])
+    )
 
 
 class Serializer:
@@ -25,9 +65,43 @@ class Serializer:
                     seria_fields_types: Optional[Dict[str, Union[Type, Field]]] = None) -> object:
             Deserializes a JSON-compatible dictionary back into an object of the specified class.
         
-        validate(seria: Dict[str, Any], schema_file_path: Union[str, Path]) -> None:
+        validate(seria: Dict[str, Any], schema_file_path: Union[str, Path, Schema]) -> None:
             Validates the serialized data against a specified JSON schema.
 
+        compile(seria_type: Type, seria_fields_types: Optional[Dict[str, Union[Type, Field]]] = None)
+                -> CompiledDeserializer:
+            Resolves the field types of a class once into a reusable deserializer.
+
+        serialize_many(objects: Iterable[object], ...) -> List[Dict[str, Any]]:
+            Serializes a batch of objects in chunks, optionally in a process pool.
+
+        deserialize_many(serias: Iterable[Union[Dict[str, Any], RootTree]], seria_type: Type, ...) -> List[object]:
+            Deserializes a batch of dictionaries in chunks, optionally in a process pool.
+
+        dump(object_: Union[object, Iterable[object]], fp: IO, ...) -> None:
+            Writes the JSON text of an object or a JSON array of objects to a stream incrementally.
+
+        dumps_iter(object_: Union[object, Iterable[object]]) -> Iterator[str]:
+            Yields the JSON text of an object or a JSON array of objects in chunks.
+
+        dumps(object_: object, indent: Optional[int] = None, codec=None) -> str:
+            Serializes an object straight to JSON text with the selected codec.
+
+        dumpb(object_: object, indent: Optional[int] = None, codec=None, encoding: str = "utf-8") -> bytes:
+            Serializes an object straight to JSON bytes with the selected codec.
+
+        loads(data: Union[str, bytes], seria_type: Type, ...) -> object:
+            Decodes JSON text or bytes and deserializes it into an object of the specified class.
+
+        clear_cache() -> None:
+            Drops all cached serialization plans and compiled deserializers.
+
+    Serialization plans are cached per class, so serializing many objects of
+    the same class only checks that the instance fields still have the
+    remembered names and types. A class keeps a layout for every combination
+    of field types it is seen with (e.g. a field that is sometimes None), so
+    alternating types do not rebuild the plan.
+
     Usage Examples:
         Example of serialization:
         ```python
@@ -55,6 +129,16 @@ class Serializer:
         ```
     """
 
+    # Per-class serialization plans, bounded to the most recently used classes.
+    _plans = LRUCache(maxsize=512)
+
+    # Compiled deserializers keyed by the class and its field types.
+    _deserializers = LRUCache(maxsize=512)
+
+    # Batches smaller than this are converted in the current process even if
+    # a process pool is requested, since pickling would cost more than it saves.
+    PARALLEL_THRESHOLD = 100_000
+
     @classmethod
     def serialize(
         cls,
@@ -75,20 +159,375 @@ class Serializer:
         if schema_file_path is not None:
             seria["$schema"] = schema_file_path
         
-        object_items = object_.__dict__.items()
-        for field_name, field_value in object_items:
-            if cls.__is_array(field_value):
-                seria[field_name] = [cls.serialize(item) for item in field_value]
-            elif cls.__is_object(field_value):
-                seria[field_name] = cls.serialize(field_value)
-            else:
-                seria[field_name] = field_value
+        cls.__serialize_with_plan(object_, cls.__get_plan(type(object_)), seria)
 
         if schema_file_path is not None:
             cls.validate(seria, schema_file_path)
         
         return seria
 
+    @classmethod
+    def serialize_many(
+        cls,
+        objects: Iterable[object],
+        schema_file_path: Optional[Union[str, Path]] = None,
+        chunk_size: int = 1000,
+        max_workers: Optional[int] = None,
+        parallel_threshold: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Serializes a batch of objects, processing them in chunks.
+
+        Args:
+            objects (Iterable[object]): The objects to serialize.
+            schema_file_path (Optional[Union[str, Path]]): Optional path to the JSON schema file to validate against.
+            chunk_size (int): The number of objects handled per chunk. Defaults to 1000.
+            max_workers (Optional[int]): Opt-in number of worker processes. Defaults to None (no process pool).
+            parallel_threshold (Optional[int]): The minimal batch size that uses the process pool.
+                Defaults to `Serializer.PARALLEL_THRESHOLD`.
+
+        Returns:
+            List[Dict[str, Any]]: The serialized objects, in input order.
+        """
+        return cls.__run_batch(_serialize_chunk, objects, (schema_file_path,),
+                               chunk_size, max_workers, parallel_threshold)
+
+    @classmethod
+    def deserialize_many(
+        cls,
+        serias: Iterable[Union[Dict[str, Any], RootTree]],
+        seria_type: Type,
+        seria_fields_types: Optional[Dict[str, Union[Type, Field]]] = None,
+        chunk_size: int = 1000,
+        max_workers: Optional[int] = None,
+        parallel_threshold: Optional[int] = None
+    ) -> List[object]:
+        """Deserializes a batch of dictionaries into objects of the specified class.
+
+        The field types are resolved once with `compile` (once per worker
+        process when a process pool is used).
+
+        Args:
+            serias (Iterable[Union[Dict[str, Any], RootTree]]): The serialized dictionaries or RootTrees.
+            seria_type (Type): The class of the objects to create.
+            seria_fields_types (Optional[Dict[str, Union[Type, Field]]]): Optional mapping of field names to types.
+            chunk_size (int): The number of dictionaries handled per chunk. Defaults to 1000.
+            max_workers (Optional[int]): Opt-in number of worker processes. Defaults to None (no process pool).
+            parallel_threshold (Optional[int]): The minimal batch size that uses the process pool.
+                Defaults to `Serializer.PARALLEL_THRESHOLD`.
+
+        Returns:
+            List[object]: The deserialized objects, in input order.
+        """
+        cls.compile(seria_type, seria_fields_types)
+        return cls.__run_batch(_deserialize_chunk, serias, (seria_type, seria_fields_types),
+                               chunk_size, max_workers, parallel_threshold)
+
+    @classmethod
+    def __run_batch(
+        cls,
+        chunk_function,
+        items: Iterable[Any],
+        arguments: tuple,
+        chunk_size: int,
+        max_workers: Optional[int],
+        parallel_threshold: Optional[int]
+    ) -> List[Any]:
+        """Applies the chunk function to the items chunk by chunk, keeping the input order."""
+        if chunk_size < 1:
+            raise ValueError(f"The chunk size must be positive, got {chunk_size}.")
+
+        if parallel_threshold is None:
+            parallel_threshold = cls.PARALLEL_THRESHOLD
+
+        results = []
+        if max_workers is not None:
+            if not isinstance(items, (list, tuple)):
+                items = list(items)
+
+            if len(items) >= parallel_threshold:
+                chunks = _chunks(items, chunk_size)
+                arguments_columns = [repeat(argument) for argument in arguments]
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    # Executor.map yields the chunk results in submission order.
+                    for chunk_result in executor.map(chunk_function, chunks, *arguments_columns):
+                        results.extend(chunk_result)
+                return results
+
+        for chunk in _chunks(items, chunk_size):
+            results.extend(chunk_function(chunk, *arguments))
+        return results
+
+    @classmethod
+    def dump(
+        cls,
+        object_: Union[object, Iterable[object]],
+        fp: IO,
+        encoding: str = "utf-8",
+        buffer_size: int = 65536
+    ) -> None:
+        """Writes the JSON text of an object, or a JSON array of objects, to a stream.
+
+        The object graph is walked directly, without building the intermediate
+        dictionary, and the text is written in chunks of about `buffer_size`
+        characters. Any iterable that is not an object (e.g. a generator) is
+        written as a JSON array, so exporting a large dataset uses constant memory.
+
+        Args:
+            object_ (Union[object, Iterable[object]]): The object or iterable of objects to write.
+            fp (IO): A text or binary stream opened for writing.
+            encoding (str): The encoding used for binary streams. Defaults to "utf-8".
+            buffer_size (int): The approximate size of a single write. Defaults to 65536.
+        """
+        binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", "")
+
+        pending = []
+        pending_size = 0
+        for chunk in cls.dumps_iter(object_):
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= buffer_size:
+                text = "".join(pending)
+                fp.write(text.encode(encoding) if binary else text)
+                pending.clear()
+                pending_size = 0
+
+        if pending:
+            text = "".join(pending)
+            fp.write(text.encode(encoding) if binary else text)
+
+    @classmethod
+    def dumps_iter(cls, object_: Union[object, Iterable[object]]) -> Iterator[str]:
+        """Yields the JSON text of an object, or a JSON array of objects, in chunks.
+
+        The joined chunks are equal to `json.dumps(Serializer.serialize(object_))`
+        for an object, and to the JSON array of such texts for an iterable.
+
+        Args:
+            object_ (Union[object, Iterable[object]]): The object or iterable of objects to encode.
+
+        Returns:
+            Iterator[str]: The chunks of the JSON text.
+        """
+        encoder = json.JSONEncoder()
+
+        if cls.__is_array(object_) or cls.__is_iterable(object_):
+            return cls.__iter_array(object_, encoder)
+        if cls.__is_object(object_):
+            return cls.__iter_object(object_, encoder)
+        return iter((encoder.encode(object_),))
+
+    @classmethod
+    def dumps(
+        cls,
+        object_: object,
+        indent: Optional[int] = None,
+        codec: Union[str, JsonCodec, None] = None
+    ) -> str:
+        """Serializes an object straight to JSON text.
+
+        Args:
+            object_ (object): The object to serialize.
+            indent (Optional[int]): The indentation; None means compact output.
+            codec (Union[str, JsonCodec, None]): The JSON backend. Defaults to the default codec.
+
+        Returns:
+            str: The JSON text.
+        """
+        return get_codec(codec).dumps(cls.__to_json_value(object_), indent)
+
+    @classmethod
+    def dumpb(
+        cls,
+        object_: object,
+        indent: Optional[int] = None,
+        codec: Union[str, JsonCodec, None] = None,
+        encoding: str = "utf-8"
+    ) -> bytes:
+        """Serializes an object straight to JSON bytes, without an intermediate str
+        when the codec produces bytes natively.
+
+        Args:
+            object_ (object): The object to serialize.
+            indent (Optional[int]): The indentation; None means compact output.
+            codec (Union[str, JsonCodec, None]): The JSON backend. Defaults to the default codec.
+            encoding (str): The encoding of the bytes. Defaults to "utf-8".
+
+        Returns:
+            bytes: The encoded JSON text.
+        """
+        return get_codec(codec).dumpb(cls.__to_json_value(object_), indent, encoding)
+
+    @classmethod
+    def loads(
+        cls,
+        data: Union[str, bytes],
+        seria_type: Type,
+        seria_fields_types: Optional[Dict[str, Union[Type, Field]]] = None,
+        codec: Union[str, JsonCodec, None] = None,
+        encoding: str = "utf-8"
+    ) -> object:
+        """Decodes JSON text or bytes and deserializes it into an object of the specified class.
+        A JSON array is deserialized into a list of objects.
+
+        Args:
+            data (Union[str, bytes]): The JSON document.
+            seria_type (Type): The class of the object to create.
+            seria_fields_types (Optional[Dict[str, Union[Type, Field]]]): Optional mapping of field names to types.
+            codec (Union[str, JsonCodec, None]): The JSON backend. Defaults to the default codec.
+            encoding (str): The encoding of bytes input. Defaults to "utf-8".
+
+        Returns:
+            object: An instance of the specified class, or a list of them.
+        """
+        seria = get_codec(codec).loads(data, encoding)
+        deserializer = cls.compile(seria_type, seria_fields_types)
+        if isinstance(seria, list):
+            return deserializer.decode_many(seria)
+        return deserializer.decode(seria)
+
+    @classmethod
+    def __to_json_value(cls, object_: Union[object, Iterable[object]]) -> Any:
+        """Returns the JSON-compatible value of an object or an array of objects."""
+        if cls.__is_array(object_) or cls.__is_iterable(object_):
+            return cls.__serialize_array(object_)
+        if cls.__is_object(object_):
+            return cls.serialize(object_)
+        return object_
+
+    @classmethod
+    def __iter_object(cls, object_: object, encoder: json.JSONEncoder) -> Iterator[str]:
+        """Yields the JSON text of the object fields."""
+        separator = "{"
+        for field_name, field_value in object_.__dict__.items():
+            yield f"{separator}{encoder.encode(field_name)}: "
+            yield from cls.__iter_value(field_value, encoder)
+            separator = ", "
+
+        yield "}" if separator == ", " else "{}"
+
+    @classmethod
+    def __iter_array(cls, array: Iterable[Any], encoder: json.JSONEncoder) -> Iterator[str]:
+        """Yields the JSON text of the array items."""
+        separator = "["
+        for item in array:
+            yield separator
+            yield from cls.__iter_value(item, encoder)
+            separator = ", "
+
+        yield "]" if separator == ", " else "[]"
+
+    @classmethod
+    def __iter_value(cls, value: Any, encoder: json.JSONEncoder) -> Iterator[str]:
+        """Yields the JSON text of a field value or an array item."""
+        if cls.__is_array(value):
+            yield from cls.__iter_array(value, encoder)
+        elif cls.__is_object(value):
+            yield from cls.__iter_object(value, encoder)
+        else:
+            yield encoder.encode(value)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drops all cached serialization plans and compiled deserializers."""
+        cls._plans.clear()
+        cls._deserializers.clear()
+
+    @classmethod
+    def __get_plan(cls, object_type: Type) -> _SerializationPlan:
+        """Returns the cached plan of the class, creating an empty one on a miss.
+
+        An empty plan never matches an instance, so it is filled in by the
+        first serialization that uses it.
+        """
+        plan = cls._plans.get(object_type)
+        if plan is None:
+            plan = _SerializationPlan()
+            cls._plans.set(object_type, plan)
+        return plan
+
+    @classmethod
+    def __select_layout(cls, plan: _SerializationPlan, fields: Dict[str, Any]) -> None:
+        """Makes the layout of the given instance fields the current one, building it on a miss."""
+        signature = tuple(zip(fields, map(type, fields.values())))
+        layout = plan.layouts.get(signature)
+        if layout is None:
+            layout = cls.__build_layout(fields)
+            if len(plan.layouts) < _MAX_LAYOUTS:
+                plan.layouts[signature] = layout
+        plan.fields = layout
+
+    @classmethod
+    def __build_layout(cls, fields: Dict[str, Any]) -> tuple:
+        """Returns the layout of the given instance fields."""
+        layout = []
+        for field_name, field_value in fields.items():
+            value_type = type(field_value)
+            nested_plan = None
+
+            if cls.__is_array(field_value):
+                kind = _ARRAY
+            elif cls.__is_object(field_value):
+                kind = _OBJECT
+                nested_plan = cls.__get_plan(value_type)
+            else:
+                kind = _SCALAR
+
+            layout.append((field_name, value_type, kind, nested_plan))
+
+        return tuple(layout)
+
+    @classmethod
+    def __serialize_with_plan(
+        cls,
+        object_: object,
+        plan: _SerializationPlan,
+        seria: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Serializes the object fields into `seria` following the plan.
+
+        If the instance fields do not match the current layout (a field was
+        added, removed or changed its type), the layout of these fields is
+        selected, or built and remembered, and the object is serialized again.
+        """
+        fields = object_.__dict__
+
+        if len(plan.fields) == len(fields):
+            for (name, value_type, kind, nested_plan), (field_name, field_value) in zip(plan.fields, fields.items()):
+                if name != field_name or type(field_value) is not value_type:
+                    break
+
+                if kind == _SCALAR:
+                    seria[name] = field_value
+                elif kind == _OBJECT:
+                    seria[name] = cls.__serialize_with_plan(field_value, nested_plan, {})
+                else:
+                    seria[name] = cls.__serialize_array(field_value)
+            else:
+                return seria
+
+        cls.__select_layout(plan, fields)
+        return cls.__serialize_with_plan(object_, plan, seria)
+
+    @classmethod
+    def __serialize_array(cls, array: List[Any]) -> List[Any]:
+        """Serializes the items of a list or tuple."""
+        items = []
+        last_type = last_plan = None
+
+        for item in array:
+            item_type = type(item)
+            if item_type is last_type:
+                items.append(cls.__serialize_with_plan(item, last_plan, {}))
+            elif cls.__is_array(item):
+                items.append(cls.__serialize_array(item))
+            elif cls.__is_object(item):
+                last_type, last_plan = item_type, cls.__get_plan(item_type)
+                items.append(cls.__serialize_with_plan(item, last_plan, {}))
+            else:
+                items.append(item)
+
+        return items
+
     @classmethod
     def deserialize(
         cls,
@@ -106,55 +545,52 @@ class Serializer:
         Returns:
             object: An instance of the specified class with the deserialized data.
         """
-        if isinstance(seria, RootTree):
-            seria = seria.to_dict()
-        
-        seria.pop("$schema", None)
-
-        if seria_fields_types is not None:
-            seria_fields_types = Field.wrap_all_types(seria_fields_types)
-
-        parameters = {}
-        for key, value in seria.items():
-            field = cls.__get_field_type(key, value, seria_fields_types, seria_type)
-
-            if cls.__is_dict(value):
-                parameters[key] = cls.deserialize_dict(value, field)
-            elif cls.__is_array(value):
-                parameters[key] = cls.deserialize_array(value, field)
-            else:
-                parameters[key] = value
-
-        return seria_type(**parameters)
+        return cls.compile(seria_type, seria_fields_types).decode(seria)
 
     @classmethod
-    def __get_field_type(cls, key: str, value: Any, seria_fields_types: Optional[Dict[str, Union[Type, Field]]], seria_type: Type) -> Type:
-        """Gets the field type based on the serialized value and class annotations."""
-        if seria_fields_types is not None:
-            field = seria_fields_types.get(key, Field(None))
-        else:
-            field = Field(None)
+    def compile(
+        cls,
+        seria_type: Type,
+        seria_fields_types: Optional[Dict[str, Union[Type, Field]]] = None
+    ) -> 'CompiledDeserializer':
+        """Resolves the field types of a class once into a reusable deserializer.
+
+        Compiled deserializers are cached, so `deserialize` calls with the same
+        class and field types share one deserializer. `Field` overrides are
+        compared by their types, so a new `Field` for every call still hits.
 
-        field_type = field.type
+        Args:
+            seria_type (Type): The class of the objects to create.
+            seria_fields_types (Optional[Dict[str, Union[Type, Field]]]): Optional mapping of field names to types.
 
-        if cls.__has_annotations(seria_type):
-            field_type = seria_type.__init__.__annotations__.get(key, field_type)
+        Returns:
+            CompiledDeserializer: A deserializer for the specified class.
+        """
+        try:
+            cache_key = (seria_type, _types_key(seria_fields_types))
+            hash(cache_key)
+        except TypeError:
+            return CompiledDeserializer(seria_type, seria_fields_types)
 
-        return field_type
+        deserializer = cls._deserializers.get(cache_key)
+        if deserializer is None:
+            deserializer = CompiledDeserializer(seria_type, seria_fields_types)
+            cls._deserializers.set(cache_key, deserializer)
+        return deserializer
 
     @classmethod
     def deserialize_dict(cls, value: Dict[str, Any], field: Type) -> object:
         """Deserializes a dictionary using the specified field type."""
         if field is None:
             return value
-        return cls.deserialize(value, field, field.__init__.__annotations__ if cls.__has_annotations(field) else {})
+        return cls.compile(field).decode(value)
 
     @classmethod
     def deserialize_array(cls, value: List[Any], field: Type) -> List[Any]:
         """Deserializes an array using the specified field type."""
-        item_type = cls.__extract_type(field)
+        item_deserializer = cls.compile(cls.__extract_type(field))
         return [
-            cls.deserialize(item, item_type, field.__init__.__annotations__ if cls.__has_annotations(field) else {})
+            item_deserializer.decode(item)
             for item in value if item is not None
         ]
     
@@ -162,31 +598,43 @@ class Serializer:
     def validate(
         cls,
         seria: Dict[str, Any],
-        schema_file_path: Union[str, Path]
+        schema_file_path: Union[str, Path, Schema]
     ) -> None:
         """Validates the serialized data against a specified JSON schema.
 
+        The validator of the schema is built once and cached (see `Schema.compile`
+        and `Schema.compile_file`), so repeated validation only checks the data.
+
         Args:
             seria (Dict[str, Any]): The serialized data to validate.
-            schema_file_path (Union[str, Path]): The path to the JSON schema file.
+            schema_file_path (Union[str, Path, Schema]): The path to the JSON schema file or a Schema instance.
         
         Raises:
-            jsonschema.exceptions.ValidationError: If the serialized data does not conform to the schema.
+            SchemaException: If the schema itself is invalid.
+            ValidationException: If the serialized data does not conform to the schema.
         """
-        with open(schema_file_path, 'r') as file:
-            schema = json.load(file)
-
         try:
-            Validator.check_schema(schema)
-            jsonschema.validate(seria, schema)
+            if isinstance(schema_file_path, Schema):
+                validator = schema_file_path.compile()
+            else:
+                validator = Schema.compile_file(schema_file_path)
         except jsonschema.exceptions.SchemaError as e:
             raise SchemaException(e)
-        except jsonschema.exceptions.ValidationError as e:
-            raise ValidationException(e)
+
+        error = jsonschema.exceptions.best_match(validator.iter_errors(seria))
+        if error is not None:
+            raise ValidationException(error)
 
     @staticmethod
-    def __has_annotations(seria_type):
-        return hasattr(seria_type.__init__, "__annotations__")
+    def _get_annotations(seria_type: Type) -> Dict[str, Any]:
+        """Returns the resolved annotations of the class constructor."""
+        init = getattr(seria_type, "__init__", None)
+        if not hasattr(init, "__annotations__"):
+            return {}
+        try:
+            return get_type_hints(init)
+        except Exception:
+            return dict(init.__annotations__)
 
     @staticmethod
     def __extract_type(field_type: Type) -> Type:
@@ -229,6 +677,21 @@ class Serializer:
         """
         return hasattr(value, "__dict__")
     
+    @staticmethod
+    def __is_iterable(value: Any) -> bool:
+        """Checks if the given value is an iterable to be written as a JSON array.
+
+        Args:
+            value (Any): The value to check.
+
+        Returns:
+            bool: True if the value is an iterable other than a string, bytes,
+                a dictionary or an object with fields; otherwise, False.
+        """
+        return (hasattr(value, "__iter__")
+                and not hasattr(value, "__dict__")
+                and not isinstance(value, (str, bytes, bytearray, dict)))
+
     @staticmethod
     def __is_dict(value: Any) -> bool:
         """Checks if the given value is a dictionary.
@@ -239,4 +702,145 @@ class Serializer:
         Returns:
             bool: True if the value is a dictionary; otherwise, False.
         """
-        return isinstance(value, dict)
\ No newline at end of file
+        return isinstance(value, dict)
+
+
+def _chunks(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """Splits the items into lists of at most `chunk_size` elements."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _serialize_chunk(
+    objects: List[object],
+    schema_file_path: Optional[Union[str, Path]]
+) -> List[Dict[str, Any]]:
+    """Serializes a chunk of objects. Module level so process pools can pickle it."""
+    serialize = Serializer.serialize
+    return [serialize(object_, schema_file_path) for object_ in objects]
+
+
+def _deserialize_chunk(
+    serias: List[Union[Dict[str, Any], RootTree]],
+    seria_type: Type,
+    seria_fields_types: Optional[Dict[str, Union[Type, Field]]]
+) -> List[object]:
+    """Deserializes a chunk of dictionaries. Module level so process pools can pickle it."""
+    return Serializer.compile(seria_type, seria_fields_types).decode_many(serias)
+
+
+class _FieldDeserializer:
+    """
+    The resolved type of a single field and the lazily compiled
+    deserializers of its nested object and array items.
+    """
+    __slots__ = ("type", "types", "item_type", "_deserializer", "_item_deserializer")
+
+    def __init__(self, type_: Optional[Type], types: Optional[Dict[str, Union[Type, Field]]] = None) -> None:
+        self.type = type_
+        self.types = types
+        self.item_type = get_args(type_)[0] if hasattr(type_, "__origin__") and get_args(type_) else None
+        self._deserializer = None
+        self._item_deserializer = None
+
+    def decode_dict(self, value: Dict[str, Any]) -> Any:
+        """Deserializes a dictionary value of the field."""
+        if self.type is None:
+            return value
+        if self._deserializer is None:
+            self._deserializer = Serializer.compile(self.type, self.types)
+        return self._deserializer.decode(value)
+
+    def decode_array(self, value: List[Any]) -> List[Any]:
+        """Deserializes an array value of the field, skipping None items."""
+        if self.type is None:
+            return value
+        if self.item_type is None:
+            raise TypeError(f"{self.type} not supported.")
+        if self._item_deserializer is None:
+            self._item_deserializer = Serializer.compile(self.item_type)
+
+        decode = self._item_deserializer.decode
+        return [
+            decode(item) if isinstance(item, (dict, RootTree)) else item
+            for item in value if item is not None
+        ]
+
+
+class CompiledDeserializer:
+    """
+    A reusable deserializer for one class, created by `Serializer.compile`.
+
+    The constructor annotations, the `Field` overrides and the item types of
+    generic fields (e.g. `List[X]`) are resolved once, so decoding many
+    records does not repeat the type introspection for each of them.
+
+    Attributes:
+        seria_type (Type): The class of the objects to create.
+    """
+    __slots__ = ("seria_type", "_fields", "_untyped")
+
+    def __init__(
+        self,
+        seria_type: Type,
+        seria_fields_types: Optional[Dict[str, Union[Type, Field]]] = None
+    ) -> None:
+        """
+        Initializes a CompiledDeserializer instance.
+
+        Args:
+            seria_type (Type): The class of the objects to create.
+            seria_fields_types (Optional[Dict[str, Union[Type, Field]]]): Optional mapping of field names to types.
+        """
+        self.seria_type = seria_type
+
+        fields = Field.wrap_all_types(seria_fields_types) if seria_fields_types is not None else {}
+        annotations = Serializer._get_annotations(seria_type)
+        annotations.pop("return", None)
+
+        self._fields: Dict[str, _FieldDeserializer] = {}
+        for key in {**fields, **annotations}:
+            field = fields.get(key, Field(None))
+            # The constructor annotations take precedence over the Field overrides.
+            self._fields[key] = _FieldDeserializer(annotations.get(key, field.type), field.types)
+
+        self._untyped = _FieldDeserializer(None)
+
+    def __call__(self, seria: Union[Dict[str, Any], RootTree]) -> object:
+        return self.decode(seria)
+
+    def decode(self, seria: Union[Dict[str, Any], RootTree]) -> object:
+        """Deserializes a JSON-compatible dictionary into an object of the compiled class.
+
+        Args:
+            seria (Union[Dict[str, Any], RootTree]): The serialized dictionary or RootTree to deserialize.
+
+        Returns:
+            object: An instance of the compiled class with the deserialized data.
+        """
+        if isinstance(seria, RootTree):
+            seria = seria.to_dict()
+
+        fields = self._fields
+        untyped = self._untyped
+
+        parameters = {}
+        for key, value in seria.items():
+            if isinstance(value, dict):
+                parameters[key] = fields.get(key, untyped).decode_dict(value)
+            elif isinstance(value, (list, tuple)):
+                parameters[key] = fields.get(key, untyped).decode_array(value)
+            else:
+                parameters[key] = value
+
+        parameters.pop("$schema", None)
+        return self.seria_type(**parameters)
+
+    def decode_many(self, serias: List[Union[Dict[str, Any], RootTree]]) -> List[object]:
+        """Deserializes every dictionary of the list with this deserializer."""
+        decode = self.decode
+        return [decode(seria) for seria in serias]
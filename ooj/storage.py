@@ -0,0 +1,373 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+import atexit
+import os
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+from .codec import JsonCodec, get_codec
+
+
+def fsync_directory(directory: Union[str, Path]) -> None:
+    """
+    Flushes the directory entry changes (e.g. a rename) to disk where the
+    platform supports it.
+
+    Args:
+        directory (Union[str, Path]): The directory to flush.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(fp: Union[str, Path], data: bytes, fsync: bool = True) -> None:
+    """
+    Writes the data to a temporary file in the same directory and renames it
+    over the target, so readers see either the old or the new content and a
+    crash never leaves a partially written file.
+
+    Args:
+        fp (Union[str, Path]): The target file.
+        data (bytes): The content to write.
+        fsync (bool): Whether to flush the file and the directory to disk. Defaults to True.
+    """
+    fp = Path(fp)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{fp.name}.", suffix=".tmp", dir=fp.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+
+        try:
+            mode = fp.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+
+        os.replace(temp_path, fp)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync:
+        fsync_directory(fp.parent)
+
+
+class WriteBehindFlusher:
+    """
+    Calls a write function from a background thread, at most once per
+    `interval` seconds, or as soon as `threshold` changes are pending.
+
+    The write function always persists the latest state, so any number of
+    changes between two flushes cost a single write. Pending changes are also
+    flushed by `flush()`, `close()` and at interpreter exit.
+    """
+
+    def __init__(self, write: Callable[[], None], interval: float = 1.0, threshold: int = 100, name: str = None):
+        """
+        Initializes a WriteBehindFlusher instance.
+
+        Args:
+            write (Callable[[], None]): The function that persists the latest state.
+            interval (float): The maximal delay of a flush in seconds. Defaults to 1.0.
+            threshold (int): The number of pending changes that triggers an immediate flush. Defaults to 100.
+            name (str): The name of the background thread.
+        """
+        if interval <= 0:
+            raise ValueError(f"The flush interval must be positive, got {interval}.")
+        if threshold < 1:
+            raise ValueError(f"The flush threshold must be positive, got {threshold}.")
+
+        self._write = write
+        self.interval = interval
+        self.threshold = threshold
+        self._name = name or "ooj-write-behind"
+
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+        _flushers.add(self)
+
+    @property
+    def pending(self) -> int:
+        """ Returns the number of changes that are not flushed yet. """
+        return self._pending
+
+    def mark_dirty(self) -> None:
+        """ Registers a change that has to be flushed. """
+        with self._condition:
+            if self._closed:
+                raise ValueError("The write-behind flusher is closed.")
+            self._pending += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            if self._pending >= self.threshold:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """
+        Writes the pending changes in the calling thread.
+
+        Raises:
+            Exception: The error of a failed background flush, if any.
+        """
+        # Taking the write lock first waits out a background write in flight.
+        with self._write_lock:
+            with self._condition:
+                pending, self._pending = self._pending, 0
+                error, self._error = self._error, None
+
+            if pending:
+                try:
+                    self._write()
+                except BaseException:
+                    with self._condition:
+                        self._pending += pending
+                    raise
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """ Flushes the pending changes and stops the background thread. """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join()
+        _flushers.discard(self)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._closed and self._pending < self.threshold:
+                    self._condition.wait(self.interval)
+                if self._closed:
+                    return
+
+            # The pending counter is reset under the write lock, so a concurrent
+            # `flush` either writes the changes itself or waits for this write.
+            with self._write_lock:
+                with self._condition:
+                    if self._closed:
+                        return
+                    pending, self._pending = self._pending, 0
+                    if not pending:
+                        # Stop while idle so that the owner can be garbage collected;
+                        # the next change starts a new thread.
+                        self._thread = None
+                        return
+                try:
+                    self._write()
+                except BaseException as e:
+                    with self._condition:
+                        self._error = e
+                        self._pending += pending
+
+
+# Flushers that still have to write their pending changes at exit.
+_flushers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    for flusher in list(_flushers):
+        try:
+            flusher.close()
+        except Exception:
+            pass
+
+
+class Journal:
+    """
+    An append-only sidecar log of JSON patch records, one per line:
+    `{"op": "set", "path": [...], "value": ...}` or `{"op": "del", "path": [...]}`.
+    An integer at the end of a "set" path addresses an array item.
+
+    Records are idempotent, so replaying a journal over a base snapshot that
+    already contains some of them gives the same result.
+    """
+
+    def __init__(self,
+                 fp: Union[str, Path],
+                 encoding: str = "utf-8",
+                 fsync: bool = False,
+                 codec: Union[str, JsonCodec, None] = None):
+        """
+        Initializes a Journal instance.
+
+        Args:
+            fp (Union[str, Path]): The path to the journal file.
+            encoding (str): The encoding of the records. Defaults to "utf-8".
+            fsync (bool): Whether every append is flushed to disk with fsync. Defaults to False.
+            codec (Union[str, JsonCodec, None]): The JSON backend. Defaults to the default codec.
+        """
+        self.fp = Path(fp)
+        self._encoding = encoding
+        self._fsync = fsync
+        self._codec = get_codec(codec)
+        self._size: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """ Returns the size of the journal in bytes. """
+        if self._size is None:
+            try:
+                self._size = self.fp.stat().st_size
+            except FileNotFoundError:
+                self._size = 0
+        return self._size
+
+    def append(self, op: str, path: List[str], value: Any = None) -> None:
+        """ Appends a single record to the journal. """
+        self.extend([(op, path, value)])
+
+    def extend(self, records: List[Tuple[str, List[str], Any]]) -> None:
+        """
+        Appends the `(op, path, value)` records to the journal with a single
+        write. A partially written last record (e.g. after a crash) is cut off
+        first, so the callers must hold the exclusive lock of the file.
+        """
+        lines = []
+        for op, path, value in records:
+            record = {"op": op, "path": list(path)}
+            if op == "set":
+                record["value"] = value
+            lines.append(self._codec.dumps(record))
+        if not lines:
+            return
+
+        payload = ("\n".join(lines) + "\n").encode(self._encoding)
+        with self.fp.open('a+b') as f:
+            size = self._complete_size(f)
+            f.write(payload)
+            if self._fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._size = size + len(payload)
+
+    def _complete_size(self, f: BinaryIO) -> int:
+        """ Truncates the open journal after its last complete record and returns its size. """
+        size = f.seek(0, os.SEEK_END)
+        end = size
+        while end:
+            start = max(end - 4096, 0)
+            f.seek(start)
+            chunk = f.read(end - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+
+        if end != size:
+            f.truncate(end)
+        return end
+
+    def replay(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Applies the journal records to the data in place. A partially written
+        last record (e.g. after a crash) is skipped; it is cut off by the next
+        append, which holds the exclusive lock.
+
+        Args:
+            data (Dict[str, Any]): The base snapshot.
+
+        Returns:
+            Dict[str, Any]: The same dictionary with the records applied.
+
+        Raises:
+            ValueError: If a complete record can not be decoded.
+        """
+        try:
+            f = self.fp.open('rb')
+        except FileNotFoundError:
+            self._size = 0
+            return data
+
+        with f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b"\n"):
+                    # Only the last line can lack its newline.
+                    break
+                try:
+                    record = self._codec.loads(line, self._encoding)
+                except ValueError as e:
+                    raise ValueError(f"The journal {self.fp} is corrupted at line {number}: {e}") from e
+                apply_record(data, record["op"], record["path"], record.get("value"))
+            self._size = f.tell()
+        return data
+
+    def truncate(self) -> None:
+        """ Removes all records from the journal. """
+        self.fp.unlink(missing_ok=True)
+        self._size = 0
+
+
+def apply_record(data: Dict[str, Any], op: str, path: List[Union[str, int]], value: Any = None) -> None:
+    """
+    Applies a single `set` or `del` record to the data in place. Missing or
+    non-dictionary intermediate keys are replaced with dictionaries by `set`
+    and make `del` a no-op. A `set` of an array item replaces the item, or
+    appends it if the index is the length of the array; an index past the
+    end is ignored.
+
+    Args:
+        data (Dict[str, Any]): The data to change.
+        op (str): "set" or "del".
+        path (List[Union[str, int]]): The key path of the value.
+        value (Any): The new value for "set".
+    """
+    # The container of an array item is the array itself.
+    parents = len(path) - 1
+    item = op == "set" and isinstance(path[-1], int)
+
+    container = data
+    for position, key in enumerate(path[:-1]):
+        child = container.get(key)
+        if item and position == parents - 1 and isinstance(child, list):
+            container = child
+            break
+        if not isinstance(child, dict):
+            if op == "del":
+                return
+            child = container[key] = {}
+        container = child
+
+    if item and isinstance(container, list):
+        index = path[-1]
+        if index < len(container):
+            container[index] = value
+        elif index == len(container):
+            container.append(value)
+    elif op == "set":
+        container[path[-1]] = value
+    elif op == "del":
+        container.pop(path[-1], None)
+    else:
+        raise ValueError(f"Unknown journal operation '{op}'.")
@@ -0,0 +1,363 @@
+# (c) KiryxaTech, 2024. Apache License 2.0
+
+"""
+An incremental JSON parser that reads a text stream in fixed-size chunks.
+
+Only the tokens of the current chunk and the values that are explicitly
+built (see `iter_items` and `read_entry`) are held in memory, so huge
+documents can be iterated with bounded memory.
+
+Events are `(path, event, value)` tuples where `path` is the tuple of keys
+and array indexes leading to the value, and `event` is one of `start_map`,
+`key`, `end_map`, `start_array`, `end_array` and `value`. The `key`,
+`end_map` and `end_array` events carry the path of their container.
+
+Parse errors are reported as `json.JSONDecodeError` with the position,
+line and column of the offending character counted from the start of the
+stream (positions are character offsets, like in `json.loads`).
+"""
+
+import re
+from json import JSONDecodeError
+from json.decoder import scanstring
+from typing import IO, Any, Callable, Iterator, List, Sequence, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?")
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+_PUNCTUATION = frozenset("{}[]:,")
+
+# Parser states.
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+Event = Tuple[Tuple[Union[str, int], ...], str, Any]
+
+
+class _UnexpectedToken(Exception):
+    """ Thrown into the tokenizer by the parser, which knows where the last token started. """
+
+
+def _advance(buffer: str, pos: int, base: int, line: int, line_start: int) -> Tuple[int, int, int]:
+    """
+    Returns the stream offset of `buffer[pos]`, its line and the stream
+    offset of the start of that line, for a buffer that starts at `base`
+    on `line`, which starts at `line_start`.
+    """
+    newline = buffer.rfind("\n", 0, pos)
+    if newline != -1:
+        line_start = base + newline + 1
+    return base + pos, line + buffer.count("\n", 0, pos), line_start
+
+
+def _decode_error(msg: str, buffer: str, pos: int, base: int, line: int, line_start: int) -> JSONDecodeError:
+    """ Returns a JSONDecodeError for `buffer[pos]` with its position in the whole stream. """
+    offset, lineno, line_start = _advance(buffer, pos, base, line, line_start)
+    colno = offset - line_start + 1
+    error = JSONDecodeError(msg, "", 0)
+    error.args = (f"{msg}: line {lineno} column {colno} (char {offset})",)
+    error.pos, error.lineno, error.colno = offset, lineno, colno
+    return error
+
+
+def _iter_tokens(read: Callable[[int], str],
+                 chunk_size: int,
+                 unexpected_end: List[JSONDecodeError]) -> Iterator[Tuple[str, Any]]:
+    """
+    Splits the text returned by `read` into tokens.
+
+    Punctuation tokens are returned as `(char, None)`, strings as
+    `("string", str)` and other scalars as `("value", value)`. A token cut by
+    a chunk boundary is completed by reading the next chunk.
+
+    An `_UnexpectedToken` thrown into the generator is raised as a
+    JSONDecodeError at the last token. At the end of the stream, the error
+    to raise for an unexpected end is appended to `unexpected_end`.
+    """
+    buffer = read(chunk_size)
+    eof = not buffer
+    pos = start = 0
+    # The stream offset of buffer[0], its line and the offset where that line starts.
+    base, line, line_start = 0, 1, 0
+
+    try:
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+
+            if pos >= len(buffer) or (not eof and len(buffer) - pos < 8 and buffer[pos] not in _PUNCTUATION):
+                # Keep a short lookahead so that literals and numbers are never cut.
+                if eof:
+                    if pos >= len(buffer):
+                        unexpected_end.append(_decode_error("Unexpected end of the document", buffer, pos,
+                                                 base, line, line_start))
+                        return
+                else:
+                    chunk = read(chunk_size)
+                    eof = not chunk
+                    base, line, line_start = _advance(buffer, pos, base, line, line_start)
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+
+            start = pos
+            char = buffer[pos]
+
+            if char in _PUNCTUATION:
+                pos += 1
+                yield char, None
+
+            elif char == '"':
+                try:
+                    value, end = scanstring(buffer, pos + 1)
+                except JSONDecodeError:
+                    if eof:
+                        raise
+                    # The string continues in the next chunk.
+                    chunk = read(max(chunk_size, len(buffer) - pos))
+                    eof = not chunk
+                    base, line, line_start = _advance(buffer, pos, base, line, line_start)
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                pos = end
+                yield "string", value
+
+            elif char == "-" or "0" <= char <= "9":
+                match = _NUMBER.match(buffer, pos)
+                if match is None:
+                    raise JSONDecodeError("Expecting value", buffer, pos)
+                if not eof and (match.end() == len(buffer) or buffer[match.end()] in ".eE+-"):
+                    # The number may continue in the next chunk.
+                    chunk = read(chunk_size)
+                    eof = not chunk
+                    base, line, line_start = _advance(buffer, pos, base, line, line_start)
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                integer_part, fraction, exponent = match.group(), match.group(1), match.group(2)
+                pos = match.end()
+                yield "value", float(integer_part) if fraction or exponent else int(integer_part)
+
+            elif char in _LITERALS and buffer.startswith(_LITERALS[char][0], pos):
+                literal, value = _LITERALS[char]
+                pos += len(literal)
+                yield "value", value
+
+            else:
+                raise JSONDecodeError("Expecting value", buffer, pos)
+    except JSONDecodeError as e:
+        raise _decode_error(e.msg, buffer, e.pos, base, line, line_start) from None
+    except _UnexpectedToken as e:
+        raise _decode_error(str(e), buffer, start, base, line, line_start) from None
+
+
+def iter_events(fp: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Event]:
+    """
+    Parses a JSON text stream incrementally and yields its events.
+
+    Args:
+        fp (IO[str]): A text stream opened for reading.
+        chunk_size (int): The number of characters read at once. Defaults to 65536.
+
+    Yields:
+        Event: `(path, event, value)` tuples.
+
+    Raises:
+        json.JSONDecodeError: If the stream does not contain a single valid JSON document.
+    """
+    state = _VALUE
+    path: List[Union[str, int, None]] = []
+    containers: List[bool] = []  # True for maps, False for arrays.
+    unexpected_end: List[JSONDecodeError] = []
+    tokens = _iter_tokens(fp.read, chunk_size, unexpected_end)
+
+    for kind, value in tokens:
+        if state == _COMMA_OR_END:
+            in_map = containers[-1]
+            if kind == ",":
+                state = _KEY if in_map else _VALUE
+                continue
+            if kind == ("}" if in_map else "]"):
+                containers.pop()
+                path.pop()
+                yield tuple(path), "end_map" if in_map else "end_array", None
+                state = _COMMA_OR_END if containers else _DONE
+                continue
+            tokens.throw(_UnexpectedToken(f"Expecting ',' delimiter, got {kind!r}"))
+
+        if state == _KEY or state == _KEY_OR_END:
+            if kind == "string":
+                path[-1] = value
+                yield tuple(path[:-1]), "key", value
+                state = _COLON
+                continue
+            if kind == "}" and state == _KEY_OR_END:
+                containers.pop()
+                path.pop()
+                yield tuple(path), "end_map", None
+                state = _COMMA_OR_END if containers else _DONE
+                continue
+            tokens.throw(_UnexpectedToken("Expecting property name enclosed in double quotes"))
+
+        if state == _COLON:
+            if kind != ":":
+                tokens.throw(_UnexpectedToken("Expecting ':' delimiter"))
+            state = _VALUE
+            continue
+
+        if state == _DONE:
+            tokens.throw(_UnexpectedToken("Extra data"))
+
+        # _VALUE or _VALUE_OR_END
+        if kind == "]" and state == _VALUE_OR_END:
+            containers.pop()
+            path.pop()
+            yield tuple(path), "end_array", None
+            state = _COMMA_OR_END if containers else _DONE
+            continue
+
+        if containers and not containers[-1]:
+            path[-1] += 1
+
+        if kind == "{":
+            yield tuple(path), "start_map", None
+            containers.append(True)
+            path.append(None)
+            state = _KEY_OR_END
+        elif kind == "[":
+            yield tuple(path), "start_array", None
+            containers.append(False)
+            path.append(-1)
+            state = _VALUE_OR_END
+        elif kind == "string" or kind == "value":
+            yield tuple(path), "value", value
+            state = _COMMA_OR_END if containers else _DONE
+        else:
+            tokens.throw(_UnexpectedToken(f"Expecting value, got {kind!r}"))
+
+    if state != _DONE:
+        raise unexpected_end[0]
+
+
+def build_value(event: str, value: Any, events: Iterator[Event]) -> Any:
+    """
+    Builds the Python value that starts with the given event, consuming
+    the events of its subtree.
+
+    Args:
+        event (str): The event that starts the value.
+        value (Any): The value of that event.
+        events (Iterator[Event]): The remaining events of the stream.
+
+    Returns:
+        Any: The decoded value.
+    """
+    if event == "value":
+        return value
+
+    root = {} if event == "start_map" else []
+    stack = [root]
+    keys: List[Any] = [None]
+
+    for _, event, value in events:
+        container = stack[-1]
+
+        if event == "key":
+            keys[-1] = value
+            continue
+
+        if event == "end_map" or event == "end_array":
+            stack.pop()
+            keys.pop()
+            if not stack:
+                return root
+            continue
+
+        if event == "value":
+            item = value
+        else:
+            item = {} if event == "start_map" else []
+
+        if isinstance(container, dict):
+            container[keys[-1]] = item
+        else:
+            container.append(item)
+
+        if event != "value":
+            stack.append(item)
+            keys.append(None)
+
+    raise JSONDecodeError("Unexpected end of the document", "", 0)
+
+
+def iter_items(
+    fp: IO[str],
+    keys_path: Sequence[Union[str, int]] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Yields the items of the array at `keys_path`, one at a time. If the value
+    at the path is an object, `(key, value)` pairs are yielded instead.
+
+    Args:
+        fp (IO[str]): A text stream opened for reading.
+        keys_path (Sequence[Union[str, int]]): The keys and indexes leading to the container.
+        chunk_size (int): The number of characters read at once. Defaults to 65536.
+
+    Yields:
+        Any: The items of the container. Reading stops right after the container ends.
+    """
+    target = tuple(keys_path)
+    depth = len(target) + 1
+    events = iter_events(fp, chunk_size)
+
+    for path, event, value in events:
+        if len(path) != depth or path[:-1] != target or event == "key":
+            if path == target and event in ("end_map", "end_array", "value"):
+                # The container (or a scalar at the path) has ended.
+                return
+            continue
+        if event in ("end_map", "end_array"):
+            continue
+
+        item = build_value(event, value, events)
+        if isinstance(path[-1], str):
+            yield path[-1], item
+        else:
+            yield item
+
+
+def read_entry(
+    fp: IO[str],
+    keys_path: Sequence[Union[str, int]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Any:
+    """
+    Decodes only the value at `keys_path` and stops reading right after it.
+
+    Args:
+        fp (IO[str]): A text stream opened for reading.
+        keys_path (Sequence[Union[str, int]]): The keys and indexes leading to the value.
+        chunk_size (int): The number of characters read at once. Defaults to 65536.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        KeyError: If the document has no value at the path.
+    """
+    target = tuple(keys_path)
+    events = iter_events(fp, chunk_size)
+
+    for path, event, value in events:
+        if path == target and event in ("start_map", "start_array", "value"):
+            return build_value(event, value, events)
+
+    raise KeyError(f"Path {list(target)} not found.")
@@ -1,32 +1,113 @@
 # (c) KiryxaTech, 2024. Apache License 2.0
 
 import re
+import threading
 import requests
-import json
-from typing import Union, Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from typing import Any, Union, Optional, List, Dict, Iterable, NamedTuple
 from pathlib import Path
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
 
 from . import JsonBase, JsonFile
+from .codec import JsonCodec, get_codec
+from .http_cache import HttpCache
+
+_URL_REGEX = re.compile(
+    r'^(?:http|ftp)s?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain name
+    r'localhost|'  # or localhost
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  # or IPv4
+    r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  # or IPv6
+    r'(?::\d+)?'
+    r'(?:/?|[/?]\S+)$',
+    re.IGNORECASE
+)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class FetchResult(NamedTuple):
+    """
+    The outcome of fetching one URL with `JsonURL.fetch_many`: the decoded
+    data, or the exception that stopped the fetch.
+    """
+    url: str
+    data: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _fetch(url: str,
+           session: requests.Session,
+           codec: JsonCodec,
+           cache: Optional[HttpCache] = None,
+           timeout: Optional[float] = None) -> Any:
+    """ Requests and decodes the data of the URL, using and updating the cache if there is one. """
+    if cache is None:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+    cached = cache.get(url)
+    if cached is not None and cache.is_fresh(cached):
+        return cached.data
+
+    response = session.get(url, headers=cached.validators() if cached else None, timeout=timeout)
+    if response.status_code == 304 and cached is not None:
+        return cache.revalidated(cached).data
+    response.raise_for_status()
+
+    data = codec.loads(response.content)
+    cache.set(url, data, response.content,
+              response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return data
 
 
 class JsonURL(JsonBase):
     """
     A class to load JSON data from a URL and optionally save it to a file.
 
+    With an `HttpCache`, responses are cached in memory and optionally on
+    disk: a fresh response is served without a network call, and a stale one
+    is revalidated with a conditional request whose `304 Not Modified` reuses
+    the already parsed data.
+
+    Requests go through a shared `requests.Session` (see `get_session`), so
+    connections are kept alive and reused between instances. `fetch_many`
+    loads many URLs in parallel.
+
     Attributes:
         url (str): The URL to fetch JSON data from.
         output_file_path (Optional[Union[Path, str]]): The file path to save the JSON data.
         encoding (Optional[str]): The encoding for the output file.
         indent (Optional[int]): The indentation level for the JSON output.
         ignore_exceptions_list (Optional[List[Exception]]): A list of exceptions to ignore.
+        cache (Optional[HttpCache]): The response cache, or None.
+        timeout (Optional[float]): The timeout of a request in seconds, or None.
     """
 
+    # Size of the connection pools of the shared session: the number of hosts
+    # whose pools are kept, and the number of kept connections per host.
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 16
+
     def __init__(self,
                  url: str,
                  output_file_path: Optional[Union[Path, str]] = None,
                  encoding: Optional[str] = "utf-8",
                  indent: Optional[int] = 4,
-                 ignore_exceptions_list: Optional[List[Exception]] = None):
+                 ignore_exceptions_list: Optional[List[Exception]] = None,
+                 codec: Union[str, JsonCodec, None] = None,
+                 cache: Optional[HttpCache] = None,
+                 timeout: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initializes the JsonURL instance.
 
@@ -36,20 +117,34 @@ class JsonURL(JsonBase):
             encoding (Optional[str]): The encoding for the output file. Defaults to "utf-8".
             indent (Optional[int]): The indentation level for the JSON output. Defaults to 4.
             ignore_exceptions_list (Optional[List[Exception]]): A list of exceptions to ignore. Defaults to an empty list.
+            codec (Union[str, JsonCodec, None]): The JSON backend. Defaults to the default codec.
+            cache (Optional[HttpCache]): The response cache, usually shared by many instances.
+                Every load makes a full request if None.
+            timeout (Optional[float]): The timeout of a request in seconds. Defaults to no timeout.
+            session (Optional[requests.Session]): The session of the requests. Defaults to the
+                shared session (see `get_session`).
         """
+        super().__init__({})
+
         self._url = url
+        self._file_path = output_file_path
+        self._encoding = encoding
+        self._indent = indent
+        self._ignore_exceptions_list = ignore_exceptions_list or []
+        self._codec = get_codec(codec)
+        self.cache = cache
+        self.timeout = timeout
+        self._session = session
+        self._data = None
         self._validate_url()
 
-        super().__init__(
-            data=None,
-            file_path=output_file_path,
-            encoding=encoding,
-            indent=indent,
-            ignore_exceptions_list=ignore_exceptions_list or []
-        )
-
         self._data = self.load_from_url()
 
+    @property
+    def url(self) -> str:
+        """ Returns the URL. """
+        return self._url
+
     def load_from_url(self) -> Dict:
         """
         Loads JSON data from the URL.
@@ -63,10 +158,8 @@ class JsonURL(JsonBase):
         if self._data is not None:
             return self._data
         try:
-            response = requests.get(self._url)
-            response.raise_for_status()
-
-            self._data = response.json()
+            session = self._session or self.get_session()
+            self._data = _fetch(self._url, session, self._codec, self.cache, self.timeout)
             self._dump_to_file(self._data)
 
             return self._data
@@ -75,6 +168,82 @@ class JsonURL(JsonBase):
             self._dump_to_file({})
             return {}
 
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """
+        Returns the session shared by every JsonURL, creating it on first use.
+        Its adapters keep up to `POOL_MAXSIZE` connections per host alive.
+        """
+        global _session
+        if _session is None:
+            with _session_lock:
+                if _session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=cls.POOL_CONNECTIONS,
+                                          pool_maxsize=cls.POOL_MAXSIZE)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    _session = session
+        return _session
+
+    @classmethod
+    def fetch_many(cls,
+                   urls: Iterable[str],
+                   max_workers: int = 8,
+                   timeout: Optional[float] = 10.0,
+                   max_per_host: int = 6,
+                   cache: Optional[HttpCache] = None,
+                   codec: Union[str, JsonCodec, None] = None,
+                   session: Optional[requests.Session] = None) -> List[FetchResult]:
+        """
+        Fetches and decodes many URLs in parallel over pooled connections.
+
+        At most `max_workers` requests run at once, and at most `max_per_host`
+        of them go to the same host. A URL that appears several times is
+        fetched once. Errors do not stop the other fetches: they are reported
+        in the result of their URL.
+
+        Args:
+            urls (Iterable[str]): The URLs to fetch.
+            max_workers (int): The maximum number of parallel requests. Defaults to 8.
+            timeout (Optional[float]): The timeout of a request in seconds. Defaults to 10.
+            max_per_host (int): The maximum number of parallel requests to one host. Defaults to 6.
+            cache (Optional[HttpCache]): The response cache, or None.
+            codec (Union[str, JsonCodec, None]): The JSON backend. Defaults to the default codec.
+            session (Optional[requests.Session]): The session of the requests. Defaults to the
+                shared session.
+
+        Returns:
+            List[FetchResult]: One result per URL, in the order of `urls`.
+        """
+        urls = list(urls)
+        codec = get_codec(codec)
+        session = session or cls.get_session()
+
+        # Interleave the hosts, so the workers are not all waiting for the
+        # limit of one host while the URLs of the others are queued.
+        by_host: Dict[str, List[str]] = {}
+        for url in dict.fromkeys(urls):
+            by_host.setdefault(urlsplit(url).netloc.lower(), []).append(url)
+        order = [url for url in chain.from_iterable(zip_longest(*by_host.values())) if url is not None]
+        limits = {host: threading.BoundedSemaphore(max_per_host) for host in by_host}
+
+        def fetch(url: str) -> FetchResult:
+            if not _URL_REGEX.match(url):
+                return FetchResult(url, error=ValueError(f"Invalid URL: {url}"))
+            try:
+                with limits[urlsplit(url).netloc.lower()]:
+                    return FetchResult(url, _fetch(url, session, codec, cache, timeout))
+            except Exception as e:
+                return FetchResult(url, error=e)
+
+        results: Dict[str, FetchResult] = {}
+        if order:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(order))),
+                                    thread_name_prefix="ooj-fetch") as executor:
+                results = dict(zip(order, executor.map(fetch, order)))
+        return [results[url] for url in urls]
+
     def _dump_to_file(self, data: Dict) -> None:
         """
         Dumps JSON data to a file.
@@ -83,8 +252,8 @@ class JsonURL(JsonBase):
             data (Dict): The JSON data to be saved.
         """
         if self._file_path:
-            with open(self._file_path, 'w', encoding=self._encoding) as f:
-                json.dump(data, f, indent=self._indent)
+            with open(self._file_path, 'wb') as f:
+                f.write(self._codec.dumpb(data, self._indent, self._encoding))
 
     def to_json_file(self) -> JsonFile:
         """
@@ -94,12 +263,12 @@ class JsonURL(JsonBase):
             JsonFile: An instance of JsonFile containing the JSON data.
         """
         json_file = JsonFile(
-            data=self.load_from_url(),
-            save_path=self._file_path,
+            self._file_path,
             encoding=self._encoding,
             indent=self._indent,
             ignore_errors=self._ignore_exceptions_list
         )
+        json_file.write(self.load_from_url())
         return json_file
 
     def _validate_url(self) -> None:
@@ -109,16 +278,5 @@ class JsonURL(JsonBase):
         Raises:
             ValueError: If the URL is invalid.
         """
-        regex = re.compile(
-            r'^(?:http|ftp)s?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain name
-            r'localhost|'  # or localhost
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}|'  # or IPv4
-            r'\[?[A-F0-9]*:[A-F0-9:]+\]?)'  # or IPv6
-            r'(?::\d+)?'
-            r'(?:/?|[/?]\S+)$',
-            re.IGNORECASE
-        )
-
-        if not re.match(regex, self._url):
+        if not _URL_REGEX.match(self._url):
             self._handle_exception(ValueError(f"Invalid URL: {self._url}"))
\ No newline at end of file
@@ -1,2 +1,13 @@
 from .test_json_file import TestJsonFile
-from .test_serializer import TestSerializer
\ No newline at end of file
+from .test_json_lines_file import TestJsonLinesFile
+from .test_serializer import TestSerializer
+from .test_stream import TestStream
+from .test_offset_index import TestOffsetIndex
+from .test_codec import TestCodec
+from .test_entities import TestEntities
+from .test_patch import TestPatch
+from .test_query import TestQuery
+from .test_record_index import TestRecordIndex
+from .test_async_file import TestAsyncJsonFile
+from .test_locking import TestLocking
+from .test_url import TestJsonURL
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from pathlib import Path
+from ooj.async_file import AsyncJsonFile
+from ooj.entities import Entry, RootTree
+from ooj.file import JsonFile
+
+BASE_PATH = Path('tests/files/test_async_files')
+
+
+class TestAsyncJsonFile:
+    @pytest.fixture(scope="function", autouse=True)
+    def setup_teardown(self):
+        BASE_PATH.mkdir(parents=True, exist_ok=True)
+        yield
+        for json_file in BASE_PATH.glob("*.json*"):
+            json_file.unlink()
+
+    def test_read_write_round_trip(self):
+        async def main():
+            async with AsyncJsonFile(BASE_PATH / "round_trip.json") as file:
+                await file.write(RootTree(Entry("a", 1)))
+                await file.set_entry(["nested", "b"], [1, 2])
+                await file.del_entry("a")
+
+                assert await file.get_entry(["nested", "b"]) == [1, 2]
+                assert await file.read() == {"nested": {"b": [1, 2]}}
+                with pytest.raises(KeyError):
+                    await file.get_entry("a")
+
+        asyncio.run(main())
+        assert JsonFile(BASE_PATH / "round_trip.json").read() == {"nested": {"b": [1, 2]}}
+
+    def test_concurrent_writers_are_coalesced(self, monkeypatch):
+        writes = []
+        original = JsonFile._write_payload
+
+        def slow_write(self, payload):
+            time.sleep(0.05)
+            writes.append(payload)
+            original(self, payload)
+        monkeypatch.setattr(JsonFile, "_write_payload", slow_write)
+
+        async def main():
+            async with AsyncJsonFile(BASE_PATH / "coalesced.json") as file:
+                await file.write({})
+                writes.clear()
+                await asyncio.gather(*(file.set_entry(["items", str(i)], i) for i in range(100)))
+                return await file.get_entry("items")
+
+        items = asyncio.run(main())
+
+        assert len(items) == 100
+        assert len(writes) <= 2
+        assert JsonFile(BASE_PATH / "coalesced.json").read()["items"] == items
+
+    def test_overlapping_loads_are_shared(self, monkeypatch):
+        JsonFile(BASE_PATH / "shared.json").write({"a": 1})
+        reads = []
+        original = JsonFile.read
+
+        def slow_read(self):
+            reads.append(threading.current_thread().name)
+            time.sleep(0.05)
+            return original(self)
+        monkeypatch.setattr(JsonFile, "read", slow_read)
+
+        async def main():
+            async with AsyncJsonFile(BASE_PATH / "shared.json") as file:
+                results = await asyncio.gather(*(file.read() for _ in range(10)))
+                assert all(result == {"a": 1} for result in results)
+                assert len(reads) == 1
+
+                values = await asyncio.gather(*(file.get_entry("a") for _ in range(10)))
+                assert values == [1] * 10
+                assert len(reads) == 2
+
+        asyncio.run(main())
+        assert all(name.startswith("ooj-async") for name in reads)
+
+    def test_event_loop_is_not_blocked(self, monkeypatch):
+        original = JsonFile._write_payload
+        monkeypatch.setattr(JsonFile, "_write_payload",
+                            lambda self, payload: time.sleep(0.2) or original(self, payload))
+        stats = []
+        original_signature = JsonFile._file_signature
+        monkeypatch.setattr(JsonFile, "_file_signature",
+                            lambda self: stats.append(threading.current_thread().name) or original_signature(self))
+
+        async def ticker(ticks: list, stop: asyncio.Event):
+            while not stop.is_set():
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            ticks, stop = [], asyncio.Event()
+            task = asyncio.ensure_future(ticker(ticks, stop))
+            async with AsyncJsonFile(BASE_PATH / "not_blocked.json") as file:
+                await file.set_entry("a", 1)
+                assert await file.get_entry("a") == 1
+            stop.set()
+            await task
+            return ticks
+
+        assert len(asyncio.run(main())) >= 10
+        # The buffer freshness check stats the file in the executor.
+        assert stats and all(name.startswith("ooj-async") for name in stats)
+
+    def test_failed_write_is_retried(self, monkeypatch):
+        original = JsonFile._write_payload
+        failures = [OSError("disk full")]
+
+        def flaky_write(self, payload):
+            if failures:
+                raise failures.pop()
+            original(self, payload)
+        monkeypatch.setattr(JsonFile, "_write_payload", flaky_write)
+
+        async def main():
+            async with AsyncJsonFile(BASE_PATH / "retried.json") as file:
+                with pytest.raises(OSError):
+                    await file.set_entry("a", 1)
+                await file.set_entry("b", 2)
+
+        asyncio.run(main())
+        assert JsonFile(BASE_PATH / "retried.json").read() == {"a": 1, "b": 2}
+
+    def test_write_behind_is_rejected(self):
+        with pytest.raises(ValueError):
+            AsyncJsonFile(BASE_PATH / "rejected.json", write_mode="write_behind")
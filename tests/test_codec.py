@@ -0,0 +1,122 @@
+import dataclasses
+import datetime
+import json
+import uuid
+
+import pytest
+from ooj import codec as codec_module
+from ooj.codec import JsonCodec, StdlibCodec, available_codecs, get_codec, set_default_codec
+from ooj.file import JsonFile
+
+
+DOCUMENT = {
+    "name": "café \"quoted\" / \\ \n",
+    "numbers": [0, -1, 2.5, -3e-7, 1e300, True, False, None],
+    "nested": {"empty_map": {}, "empty_array": [], "deep": [[{"x": [1]}]]},
+}
+
+CODECS = available_codecs()
+
+
+class TestCodec:
+    @pytest.fixture(autouse=True)
+    def restore_default(self):
+        default = codec_module._default
+        yield
+        set_default_codec(default)
+
+    def test_stdlib_is_always_available(self):
+        assert "json" in CODECS
+        assert isinstance(get_codec("json"), StdlibCodec)
+        assert get_codec("auto").decoder.name == next(name for name in ("orjson", "ujson", "json") if name in CODECS)
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_auto_encodes_like_stdlib(self, indent):
+        codec = get_codec("auto")
+        document = {"floats": [1e16, 1e-7, 2.5e300, float("nan"), float("inf")], "big": 2 ** 70}
+        expected = JsonCodec().dumps(document, indent)
+
+        assert codec.dumps(document, indent) == expected
+        assert codec.dumpb(document, indent) == expected.encode()
+        for value in (datetime.date(2024, 1, 1), uuid.UUID(int=1)):
+            with pytest.raises(TypeError):
+                codec.dumps({"value": value}, indent)
+
+    @pytest.mark.parametrize("name", CODECS)
+    def test_rejects_non_json_types(self, name):
+        @dataclasses.dataclass
+        class Point:
+            x: int
+
+        for value in (datetime.datetime(2024, 1, 1), Point(1)):
+            with pytest.raises(TypeError):
+                get_codec(name).dumps({"value": value})
+
+    @pytest.mark.parametrize("name", CODECS)
+    @pytest.mark.parametrize("indent", [None, 2, 4])
+    def test_round_trip(self, name, indent):
+        codec = get_codec(name)
+
+        text = codec.dumps(DOCUMENT, indent)
+        data = codec.dumpb(DOCUMENT, indent)
+
+        assert json.loads(text) == DOCUMENT
+        assert codec.loads(text) == DOCUMENT
+        assert codec.loads(data) == DOCUMENT
+        assert codec.loads(bytearray(data)) == DOCUMENT
+
+    @pytest.mark.parametrize("name", CODECS)
+    def test_compact_output(self, name):
+        assert get_codec(name).dumps({"a": [1, 2], "b": {"c": None}}) == '{"a":[1,2],"b":{"c":null}}'
+
+    @pytest.mark.parametrize("name", CODECS)
+    def test_indent_matches_stdlib(self, name):
+        document = {"a": [1, {"b": 2.5, "c": []}], "e": {}}
+        for indent in (2, 4):
+            assert get_codec(name).dumps(document, indent) == json.dumps(document, indent=indent)
+
+    @pytest.mark.parametrize("name", CODECS)
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_non_ascii_matches_stdlib(self, name, indent):
+        document = {"ключ": ["café", "日本", "😀 \"/\\"], "ascii": "x"}
+        expected = JsonCodec().dumps(document, indent)
+
+        assert get_codec(name).dumps(document, indent) == expected
+        assert get_codec(name).dumpb(document, indent) == expected.encode("ascii")
+
+    @pytest.mark.parametrize("name", CODECS)
+    def test_falls_back_to_stdlib(self, name):
+        codec = get_codec(name)
+
+        assert json.loads(codec.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+        assert json.loads(codec.dumps({1: "a"})) == {"1": "a"}
+        assert codec.dumpb({"a": "é"}, encoding="utf-16") == json.dumps({"a": "é"}, separators=(",", ":")).encode("utf-16")
+        assert codec.loads('{"a": "ж"}'.encode("cp1251"), encoding="cp1251") == {"a": "ж"}
+
+    @pytest.mark.parametrize("name", CODECS)
+    @pytest.mark.parametrize("text", ['{"a": 1,}', '[1 2]', '', b'{"a"'])
+    def test_invalid_documents(self, name, text):
+        with pytest.raises(json.JSONDecodeError):
+            get_codec(name).loads(text)
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+        with pytest.raises(ValueError):
+            set_default_codec("yaml")
+
+    def test_default_codec(self, tmp_path):
+        class CountingCodec(JsonCodec):
+            calls = 0
+
+            def dumps(self, obj, indent=None):
+                CountingCodec.calls += 1
+                return super().dumps(obj, indent)
+
+        set_default_codec(CountingCodec())
+        file = JsonFile(tmp_path / "default.json", indent=None)
+        file.write({"a": 1})
+
+        assert CountingCodec.calls == 1
+        assert (tmp_path / "default.json").read_text() == '{"a":1}'
+        assert JsonFile(tmp_path / "default.json", codec="json").read() == {"a": 1}
@@ -0,0 +1,349 @@
+import time
+
+import pytest
+from ooj.entities import Entry, RootTree, Tree, TreeConverter
+
+
+def make_tree() -> RootTree:
+    return RootTree(
+        Entry("name", "config"),
+        Tree("db",
+            Entry("host", "localhost"),
+            Tree("pool", Entry("size", 10))
+        ),
+        Entry("dotted.key", 1)
+    )
+
+
+class TestEntities:
+    def test_duplicate_key_replaces_in_place(self):
+        tree = RootTree(Entry("a", 1), Entry("b", 2))
+        tree.add(Entry("a", 3))
+
+        assert len(tree) == 2
+        assert list(tree) == ["a", "b"]
+        assert tree.to_dict() == {"a": 3, "b": 2}
+
+    @pytest.mark.parametrize("key_s", [("db", "pool", "size"), ["db", "pool", "size"], "db.pool.size"])
+    def test_path_access(self, key_s):
+        tree = make_tree()
+
+        assert tree[key_s] == 10
+        assert key_s in tree
+        assert tree["dotted.key"] == 1
+        assert isinstance(tree["db"], Tree)
+        assert tree.get(("db", "missing"), "default") == "default"
+
+    def test_missing_keys(self):
+        tree = make_tree()
+
+        with pytest.raises(KeyError):
+            tree["missing"]
+        with pytest.raises(KeyError):
+            tree["name", "nested"]
+        with pytest.raises(KeyError):
+            del tree["db", "missing"]
+        assert ("db", "host", "x") not in tree
+
+    def test_setitem(self):
+        tree = make_tree()
+
+        tree["db", "host"] = "example.com"
+        tree["db", "pool", "timeout"] = 5
+        tree["new", "nested"] = {"x": {"y": 1}}
+        tree["entry"] = Entry("other", 2)
+
+        assert tree.to_dict() == {
+            "name": "config",
+            "db": {"host": "example.com", "pool": {"size": 10, "timeout": 5}},
+            "dotted.key": 1,
+            "new": {"nested": {"x": {"y": 1}}},
+            "entry": 2,
+        }
+
+    def test_delitem_and_remove(self):
+        tree = make_tree()
+
+        del tree["db", "pool"]
+        tree.remove("name")
+        tree.remove("missing")
+
+        assert tree.to_dict() == {"db": {"host": "localhost"}, "dotted.key": 1}
+
+    def test_tree_property_is_compatible(self):
+        tree = make_tree()
+
+        assert [entry.key for entry in tree.tree] == ["name", "db", "dotted.key"]
+        children = tree.tree
+        tree.tree = [Entry("x", 1)]
+        assert tree.to_dict() == {"x": 1}
+        assert TreeConverter.to_dict(tree) == {"x": 1}
+        assert [entry.key for entry in children] == ["x"]
+        assert children[0] == Entry("x", 1) and len(children) == 1
+
+        with pytest.raises(TypeError):
+            tree.tree.append(Entry("y", 2))
+        with pytest.raises(TypeError):
+            tree.tree[0] = Entry("y", 2)
+        tree.tree = tree.tree
+        assert tree.to_dict() == {"x": 1}
+
+    def test_empty_tree_is_truthy(self):
+        assert RootTree()
+        assert len(RootTree()) == 0
+
+    def test_wide_tree_access_is_constant_time(self):
+        tree = TreeConverter.to_root_tree({f"key{i}": i for i in range(100_000)})
+
+        start = time.perf_counter()
+        for i in range(0, 100_000, 10):
+            tree[f"key{i}"] = -i
+            assert tree[f"key{i}"] == -i
+            del tree[f"key{i}"]
+        elapsed = time.perf_counter() - start
+
+        assert len(tree) == 90_000
+        assert elapsed < 1.0
+
+    def test_structural_equality(self):
+        tree = make_tree()
+        reordered = RootTree(
+            Entry("dotted.key", 1),
+            Tree("db", Tree("pool", Entry("size", 10)), Entry("host", "localhost")),
+            Entry("name", "config")
+        )
+
+        assert tree == reordered
+        assert tree == reordered.to_dict()
+        assert reordered.to_dict() == tree
+        assert tree != RootTree(Entry("name", "config"))
+        assert tree != "{'name': 'config'}"
+        assert Entry("a", 1) == {"a": 1}
+        assert Entry("a", 1) != Entry("a", 2)
+        assert RootTree(Entry("a", {"b": 1})) == RootTree(Tree("a", Entry("b", 1)))
+
+    def test_content_hash(self):
+        tree = make_tree()
+        same = TreeConverter.to_root_tree(tree.to_dict())
+
+        assert tree.content_hash == same.content_hash
+        assert tree["db"].content_hash == same["db"].content_hash
+        assert Entry("a", 1).content_hash == RootTree(Entry("a", 1)).content_hash
+        assert RootTree(Entry("a", 1)).content_hash != RootTree(Entry("a", 1.0)).content_hash
+        assert RootTree(Entry("a", True)).content_hash != RootTree(Entry("a", 1)).content_hash
+        assert RootTree(Entry("a", "1")).content_hash != RootTree(Entry("a", 1)).content_hash
+        assert RootTree(Entry("a", [1, 2])).content_hash != RootTree(Entry("a", [2, 1])).content_hash
+
+    @pytest.mark.parametrize("mutate", [
+        lambda tree: tree.__setitem__(("db", "pool", "size"), 11),
+        lambda tree: tree["db"]["pool"].add(Entry("timeout", 5)),
+        lambda tree: tree["db"].remove("host"),
+        lambda tree: tree.__delitem__(("db", "pool", "size")),
+        lambda tree: tree["db"]["pool"]._child("size").__setattr__("key", "max_size"),
+        lambda tree: tree.__setitem__("db", {"host": "localhost"}),
+    ])
+    def test_content_hash_is_invalidated_on_mutation(self, mutate):
+        tree = make_tree()
+        before = tree.content_hash
+        untouched = TreeConverter.to_root_tree(tree.to_dict())
+        untouched.content_hash
+
+        mutate(tree)
+
+        assert tree.content_hash != before
+        assert tree.content_hash == TreeConverter.to_root_tree(tree.to_dict()).content_hash
+        assert tree != untouched
+
+    def test_cached_hash_comparison(self, monkeypatch):
+        left = TreeConverter.to_root_tree({f"key{i}": {"value": i} for i in range(1000)})
+        right = TreeConverter.to_root_tree(left.to_dict())
+        left.content_hash, right.content_hash
+
+        monkeypatch.setattr(RootTree, "_equals", lambda self, value: pytest.fail("The trees were walked."))
+
+        assert left == right
+
+    def test_hash_tells_key_types_apart(self):
+        numeric = TreeConverter.to_root_tree({1: "x", "nested": [{2: None}]})
+        textual = TreeConverter.to_root_tree({"1": "x", "nested": [{"2": None}]})
+
+        assert numeric != textual
+        assert numeric.content_hash != textual.content_hash
+        assert numeric != textual
+        assert Entry(1, "x").content_hash != Entry("1", "x").content_hash
+
+    def test_dicts_inside_arrays_become_trees(self):
+        data = {"users": [{"name": "a", "tags": [{"t": 1}]}, [{"deep": True}], 3], "empty": []}
+        tree = TreeConverter.to_root_tree(data)
+
+        users = tree["users"]
+        assert isinstance(users[0], RootTree)
+        assert isinstance(users[1][0], RootTree)
+        assert users[0]["tags"][0]["t"] == 1
+        assert tree.to_dict() == data
+        assert tree == data
+
+    def test_mutating_tree_inside_array_invalidates_hash(self):
+        tree = TreeConverter.to_root_tree({"users": [{"name": "a"}]})
+        before = tree.content_hash
+
+        tree["users"][0]["name"] = "b"
+
+        assert tree.content_hash != before
+        assert tree.to_dict() == {"users": [{"name": "b"}]}
+
+    def test_deep_document_does_not_hit_recursion_limit(self):
+        depth = 5000
+        data = current = {}
+        for _ in range(depth):
+            current["child"] = current = {}
+        current["leaf"] = 1
+
+        tree = TreeConverter.to_root_tree(data)
+
+        assert tree[["child"] * depth + ["leaf"]] == 1
+
+    def test_lazy_conversion(self):
+        data = {"a": {"b": {"c": 1}}, "list": [{"x": 1}], "scalar": 2}
+        tree = TreeConverter.to_root_tree(data, lazy=True)
+
+        assert tree._source is data
+        assert tree._shared_dict() is data
+        assert tree.to_dict() == data and tree.to_dict() is not data
+        assert tree.content_hash == TreeConverter.to_root_tree(data).content_hash
+
+        assert tree["a"]._source is data["a"]
+        assert tree["a", "b", "c"] == 1
+        assert tree["list"][0]["x"] == 1
+        assert tree == TreeConverter.to_root_tree(data)
+
+        tree["a", "b", "c"] = 5
+        assert tree.to_dict() == {"a": {"b": {"c": 5}}, "list": [{"x": 1}], "scalar": 2}
+        assert tree.content_hash != TreeConverter.to_root_tree(data).content_hash
+
+    def test_lazy_wrapping_is_instant(self):
+        data = {f"key{i}": {"value": i, "items": [{"n": i}]} for i in range(200_000)}
+
+        start = time.perf_counter()
+        tree = TreeConverter.to_root_tree(data, lazy=True)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.01
+        assert tree["key199999", "items"][0]["n"] == 199999
+
+    def test_to_dict_is_cached(self):
+        tree = make_tree()
+
+        first = tree._shared_dict()
+
+        assert tree._shared_dict() is first
+        assert tree["db"]._shared_dict() is first["db"]
+
+    def test_to_dict_returns_a_copy(self):
+        tree = TreeConverter.to_root_tree({"a": {"b": 1}, "list": [{"c": [2]}]})
+
+        result = tree.to_dict()
+        result["a"]["b"] = 99
+        result["list"][0]["c"].append(3)
+        tree["list"][0].to_dict()["c"].append(4)
+
+        assert tree.to_dict() == {"a": {"b": 1}, "list": [{"c": [2]}]}
+        assert tree["a", "b"] == 1
+
+        entry = Entry("items", [TreeConverter.to_root_tree({"c": 1})])
+        entry.to_dict()["items"][0]["c"] = 2
+        assert entry.to_dict() == {"items": [{"c": 1}]}
+
+    @pytest.mark.parametrize("mutate, expected", [
+        (lambda tree: tree.__setitem__(("db", "pool", "size"), 11), {"size": 11}),
+        (lambda tree: tree["db"]["pool"].add(Entry("timeout", 5)), {"size": 10, "timeout": 5}),
+        (lambda tree: tree["db"]["pool"].remove("size"), {}),
+        (lambda tree: tree["db"]["pool"]._child("size").__setattr__("value", 12), {"size": 12}),
+    ])
+    def test_to_dict_rebuilds_only_dirty_branches(self, mutate, expected):
+        tree = make_tree()
+        tree.add(Tree("other", Entry("x", 1)))
+        before = tree._shared_dict()
+        other = before["other"]
+
+        mutate(tree)
+        after = tree._shared_dict()
+
+        assert after is not before
+        assert after["db"]["pool"] == expected
+        assert after["other"] is other
+        assert after == TreeConverter.to_root_tree(after).to_dict()
+
+    def test_lazy_subtree_changes_reach_cached_parent(self):
+        tree = TreeConverter.to_root_tree({"a": {"b": {"c": 1}}}, lazy=True)
+        tree["a"]
+        tree.to_dict()
+
+        tree["a", "b", "c"] = 2
+
+        assert tree.to_dict() == {"a": {"b": {"c": 2}}}
+
+    def test_to_dict_of_deep_tree(self):
+        depth = 5000
+        data = current = {}
+        for _ in range(depth):
+            current["child"] = current = {}
+
+        result = TreeConverter.to_root_tree(data).to_dict()
+
+        for _ in range(depth):
+            assert list(result) == ["child"]
+            result = result["child"]
+        assert result == {}
+
+    def test_assigned_root_tree_keeps_its_children(self):
+        root = RootTree(Entry("a", 1))
+        tree = make_tree()
+        tree["x"] = root
+        tree.to_dict(), root.to_dict()
+
+        root["a"] = 2
+
+        assert root.to_dict() == {"a": 2}
+        assert tree.to_dict()["x"] == {"a": 1}
+
+    def test_shared_and_reattached_subtrees(self):
+        sub = Tree("sub", Entry("a", 1))
+        first = RootTree(sub)
+        second = RootTree(sub)
+        first.to_dict(), second.to_dict(), first.content_hash, second.content_hash
+
+        sub["a"] = 2
+
+        assert first.to_dict() == {"sub": {"a": 2}}
+        assert second.to_dict() == {"sub": {"a": 1}}
+        assert first.content_hash != second.content_hash
+
+        first.remove("sub")
+        third = RootTree()
+        third["moved"] = sub
+        third.to_dict()
+        sub["a"] = 3
+
+        assert sub.key == "moved"
+        assert third.to_dict() == {"moved": {"a": 3}}
+        assert first.to_dict() == {}
+
+    def test_hash_and_equality_of_deep_tree(self):
+        depth = 5000
+        data = current = {}
+        for _ in range(depth):
+            current["child"] = current = {}
+        current["leaf"] = [[1]]
+
+        left, right = TreeConverter.to_root_tree(data), TreeConverter.to_root_tree(data)
+        lazy = TreeConverter.to_root_tree(data, lazy=True)
+
+        assert left == right
+        assert left == data
+        assert left.content_hash == right.content_hash == lazy.content_hash
+        assert Entry("root", data).content_hash == RootTree(Entry("root", data)).content_hash
+
+        left[["child"] * depth + ["leaf"]] = [[2]]
+        assert left != right
+        assert left.content_hash != right.content_hash
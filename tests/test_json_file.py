@@ -1,7 +1,13 @@
+import json
+import os
+import threading
+import time
 import pytest
 from pathlib import Path
 from ooj.file import JsonFile
 from ooj.entities import RootTree, Tree, Entry
+from ooj.exceptions import PatchException
+from ooj.storage import WriteBehindFlusher
 
 # Базовый путь для тестов JSON файлов
 BASE_PATH = Path('tests/files/test_json_files')
@@ -21,7 +27,7 @@ class TestJsonFile:
         """Создает необходимые папки перед каждым тестом и удаляет после."""
         BASE_PATH.mkdir(parents=True, exist_ok=True)
         yield
-        for json_file in BASE_PATH.glob("*.json"):
+        for json_file in BASE_PATH.glob("*.json*"):
             json_file.unlink()  # Удаляем все тестовые файлы после каждого теста
 
     @pytest.mark.parametrize(
@@ -116,4 +122,408 @@ class TestJsonFile:
         file.write(test_tree)
 
         root_tree = file.read_tree()
-        assert root_tree == test_tree
\ No newline at end of file
+        assert root_tree == test_tree
+    def test_iter_items(self):
+        """Тестирование потокового чтения элементов массива."""
+        file = JsonFile(BASE_PATH / "test_iter_items.json")
+        users = [{"id": i, "name": f"user{i}", "tags": ["a", {"b": None}]} for i in range(50)]
+        file.write({"meta": {"count": 50}, "data": {"users": users}})
+
+        assert list(file.iter_items(["data", "users"], chunk_size=16)) == users
+        assert list(file.iter_items("meta")) == [("count", 50)]
+
+    def test_read_entry(self):
+        """Тестирование чтения одного поддерева без загрузки всего файла."""
+        file = JsonFile(BASE_PATH / "test_read_entry.json")
+        file.write({"data": {"users": [{"id": 1}, {"id": 2, "name": "Bob"}]}, "tail": True})
+
+        assert file.read_entry(["data", "users", 1], chunk_size=8) == {"id": 2, "name": "Bob"}
+        assert file.read_entry("tail") is True
+        with pytest.raises(KeyError):
+            file.read_entry(["data", "missing"])
+
+    def test_iter_events(self):
+        """Тестирование потока событий парсера."""
+        file = JsonFile(BASE_PATH / "test_iter_events.json")
+        file.write({"a": [1, {"b": "c"}]})
+
+        assert list(file.iter_events()) == [
+            ((), "start_map", None),
+            ((), "key", "a"),
+            (("a",), "start_array", None),
+            (("a", 0), "value", 1),
+            (("a", 1), "start_map", None),
+            (("a", 1), "key", "b"),
+            (("a", 1, "b"), "value", "c"),
+            (("a", 1), "end_map", None),
+            (("a",), "end_array", None),
+            ((), "end_map", None),
+        ]
+
+    def test_transaction_writes_once(self, monkeypatch):
+        """Тестирование группировки изменений в одну запись."""
+        file = JsonFile(BASE_PATH / "test_transaction.json")
+        file.create_if_not_exists()
+
+        dumps = []
+        original_encode = JsonFile._encode
+        monkeypatch.setattr(JsonFile, "_encode", lambda self, data: dumps.append(1) or original_encode(self, data))
+
+        with file.transaction():
+            for i in range(100):
+                file.set_entry(["items", str(i)], i)
+            file.del_entry(["items", "0"])
+            assert file.read() == {}
+
+        assert len(dumps) == 1
+        assert file.read() == {"items": {str(i): i for i in range(1, 100)}}
+
+    def test_transaction_rollback(self):
+        """Тестирование отката буфера при исключении."""
+        file = JsonFile(BASE_PATH / "test_rollback.json")
+        file.write({"a": 1, "nested": {"b": 2}})
+
+        with pytest.raises(RuntimeError):
+            with file.transaction():
+                file.set_entry("a", 10)
+                file.set_entry(["nested", "b", "c"], 3)
+                file.del_entry(["nested", "b", "c"])
+                file.set_entry("new", True)
+                file.write({"replaced": True})
+                file.set_entry("after", 1)
+                raise RuntimeError
+
+        assert file.get_entry("a") == 1
+        assert file.get_entry(["nested", "b"]) == 2
+        with pytest.raises(KeyError):
+            file.get_entry("new")
+        assert file.read() == {"a": 1, "nested": {"b": 2}}
+
+    def test_nested_transaction_rollback(self):
+        """Тестирование отката только вложенной транзакции."""
+        file = JsonFile(BASE_PATH / "test_nested_transaction.json")
+        file.write({})
+
+        with file.transaction():
+            file.set_entry("outer", 1)
+            with pytest.raises(ValueError):
+                with file.transaction():
+                    file.set_entry("inner", 2)
+                    raise ValueError
+
+        assert file.read() == {"outer": 1}
+
+    def test_apply_patch(self):
+        """Тестирование применения JSON Patch с одной записью и откатом."""
+        file = JsonFile(BASE_PATH / "test_patch.json")
+        file.write({"a": 1, "list": [1, 2], "nested": {"b": 2}})
+        target = {"list": [1, 2, 3], "nested": {"b": 3}, "c": True}
+
+        file.apply_patch(file.diff(target))
+        assert file.read() == target
+
+        with pytest.raises(PatchException):
+            file.apply_patch([
+                {"op": "add", "path": "/list/0", "value": 0},
+                {"op": "remove", "path": "/nested"},
+                {"op": "add", "path": "", "value": {}},
+                {"op": "test", "path": "/c", "value": False},
+            ])
+
+        assert file.get_entry("list") == [1, 2, 3]
+        assert file.get_entry("nested") == {"b": 3}
+        assert file.read() == target
+
+    def test_query(self):
+        """Тестирование запросов к данным файла."""
+        file = JsonFile(BASE_PATH / "test_query.json")
+        file.write({"users": [{"id": 1, "age": 25}, {"id": 2, "age": 40}, {"id": 3, "age": 35}]})
+
+        assert file.query("$.users[?(@.age > 30)].id") == [2, 3]
+        matches = file.iter_query("users[*].id")
+        assert next(matches) == 1
+        assert list(matches) == [2, 3]
+
+    def test_atomic_write(self, monkeypatch):
+        """Тестирование атомарной записи: при сбое файл остается прежним."""
+        fp = BASE_PATH / "test_atomic.json"
+        file = JsonFile(fp, write_mode="atomic")
+        file.write({"version": 1})
+        assert file.read() == {"version": 1}
+
+        def broken_replace(src, dst):
+            raise OSError("crash during rename")
+
+        monkeypatch.setattr(os, "replace", broken_replace)
+        with pytest.raises(OSError):
+            file.write({"version": 2})
+
+        assert file.read() == {"version": 1}
+        assert list(BASE_PATH.glob(".test_atomic.json.*")) == []
+
+    def test_write_behind(self):
+        """Тестирование отложенной записи в фоновом потоке."""
+        fp = BASE_PATH / "test_write_behind.json"
+        file = JsonFile(fp, write_mode="write_behind", flush_interval=60, flush_threshold=1000)
+
+        for i in range(10):
+            file.set_entry(str(i), i)
+
+        assert file.get_entry("9") == 9
+        assert not fp.exists()
+
+        file.flush()
+        assert file.read() == {str(i): i for i in range(10)}
+
+        file.set_entry("last", True)
+        file.close()
+        assert file.read()["last"] is True
+
+    def test_write_behind_threshold(self):
+        """Тестирование немедленного сброса при достижении порога изменений."""
+        fp = BASE_PATH / "test_write_behind_threshold.json"
+        with JsonFile(fp, write_mode="write_behind", flush_interval=60, flush_threshold=5) as file:
+            for i in range(5):
+                file.set_entry(str(i), i)
+
+            deadline = time.monotonic() + 5
+            while not fp.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert len(file.read()) >= 1
+
+    def test_flush_waits_for_background_write(self):
+        """Тестирование ожидания фоновой записи при сбросе."""
+        started, release = threading.Event(), threading.Event()
+        written = []
+
+        def write():
+            started.set()
+            release.wait(5)
+            written.append(True)
+
+        flusher = WriteBehindFlusher(write, interval=60, threshold=1)
+        flusher.mark_dirty()
+        assert started.wait(5)
+
+        flushed = threading.Thread(target=flusher.flush)
+        flushed.start()
+        flushed.join(0.2)
+        assert flushed.is_alive()
+
+        release.set()
+        flushed.join(5)
+        assert written == [True]
+        flusher.close()
+
+    def test_unknown_write_mode(self):
+        """Тестирование проверки режима записи."""
+        with pytest.raises(ValueError):
+            JsonFile(BASE_PATH / "test_mode.json", write_mode="lazy")
+
+    def test_journal_appends_instead_of_rewriting(self):
+        """Тестирование журнала изменений: файл не перезаписывается."""
+        fp = BASE_PATH / "test_journal.json"
+        file = JsonFile(fp, journal=True)
+        file.write({"users": {}})
+        base = fp.read_bytes()
+
+        for i in range(10):
+            file.set_entry(["users", str(i)], {"id": i})
+        file.del_entry(["users", "3"])
+
+        assert fp.read_bytes() == base
+        assert len((BASE_PATH / "test_journal.json.journal").read_text().splitlines()) == 11
+
+        reopened = JsonFile(fp, journal=True)
+        assert reopened.get_entry(["users", "9"]) == {"id": 9}
+        with pytest.raises(KeyError):
+            reopened.get_entry(["users", "3"])
+        assert reopened.read() == file.read()
+
+    def test_journal_compaction(self):
+        """Тестирование сжатия журнала в основной файл."""
+        fp = BASE_PATH / "test_journal_compaction.json"
+        journal_fp = BASE_PATH / "test_journal_compaction.json.journal"
+        file = JsonFile(fp, journal=True, journal_max_size=200)
+
+        for i in range(20):
+            file.set_entry(str(i), "x" * 10)
+
+        assert not journal_fp.exists() or journal_fp.stat().st_size <= 200
+        assert json.loads(fp.read_text()) != {}
+        assert JsonFile(fp, journal=True).read() == {str(i): "x" * 10 for i in range(20)}
+
+    def test_journal_transaction_and_torn_record(self):
+        """Тестирование транзакции с журналом и обрезанной последней записи."""
+        fp = BASE_PATH / "test_journal_transaction.json"
+        journal_fp = BASE_PATH / "test_journal_transaction.json.journal"
+        file = JsonFile(fp, journal=True)
+
+        with file.transaction():
+            file.set_entry("a", 1)
+            file.set_entry("b", 2)
+        with pytest.raises(RuntimeError):
+            with file.transaction():
+                file.set_entry("c", 3)
+                raise RuntimeError
+
+        assert len(journal_fp.read_text().splitlines()) == 2
+
+        with journal_fp.open("ab") as f:
+            f.write(b'{"op":"set","path":["d"],"val')
+
+        # Reading leaves the torn record in place; the next append cuts it off.
+        reopened = JsonFile(fp, journal=True)
+        assert reopened.read() == {"a": 1, "b": 2}
+        assert journal_fp.read_bytes().endswith(b'"val')
+        reopened.set_entry("d", 4)
+        assert JsonFile(fp, journal=True).read() == {"a": 1, "b": 2, "d": 4}
+
+    def test_journal_corrupted_in_the_middle(self):
+        """Тестирование ошибки при поврежденной записи в середине журнала."""
+        fp = BASE_PATH / "test_journal_corrupted.json"
+        journal_fp = BASE_PATH / "test_journal_corrupted.json.journal"
+        file = JsonFile(fp, journal=True)
+        file.set_entry("a", 1)
+        file.set_entry("b", 2)
+
+        lines = journal_fp.read_bytes().splitlines(keepends=True)
+        journal_fp.write_bytes(b"{broken\n" + lines[1])
+
+        with pytest.raises(ValueError):
+            JsonFile(fp, journal=True).read()
+        assert journal_fp.read_bytes() == b"{broken\n" + lines[1]
+
+    def test_streaming_reads_see_journal(self):
+        """Тестирование потокового чтения файла с журналом."""
+        fp = BASE_PATH / "test_stream_journal.json"
+        file = JsonFile(fp, journal=True)
+        file.write({"data": [1, 2]})
+        file.set_entry("data", [9, 9, 9])
+
+        assert list(file.iter_items("data")) == [9, 9, 9]
+        assert file.read_entry("data") == [9, 9, 9]
+        assert file.read() == {"data": [9, 9, 9]}
+
+        with file.transaction():
+            file.set_entry("data", [0])
+            assert file.read_entry("data") == [9, 9, 9]
+            file.set_entry("other", 1)
+        file.set_entry("data", [5])
+        with pytest.raises(RuntimeError):
+            with file.transaction():
+                file.read_entry("data")
+
+    def test_streaming_reads_see_write_behind(self):
+        """Тестирование потокового чтения при отложенной записи."""
+        fp = BASE_PATH / "test_stream_write_behind.json"
+        with JsonFile(fp, write_mode="write_behind", flush_interval=60, flush_threshold=1000) as file:
+            file.set_entry("data", [1, 2])
+
+            assert file.read_entry("data") == [1, 2]
+            file.set_entry("data", [3])
+            assert list(file.iter_items("data")) == [3]
+            assert [event for _, event, _ in file.iter_events()][0] == "start_map"
+
+    def test_buffer_is_loaded_lazily(self):
+        """Тестирование ленивой загрузки буфера из существующего файла."""
+        fp = BASE_PATH / "test_lazy.json"
+        fp.write_text(json.dumps({"a": {"b": 1}}))
+
+        file = JsonFile(fp)
+
+        assert file.get_entry(["a", "b"]) == 1
+
+    def test_buffer_reloads_only_when_file_changes(self, monkeypatch):
+        """Тестирование перечитывания файла только после его изменения."""
+        fp = BASE_PATH / "test_change_aware.json"
+        file = JsonFile(fp)
+        file.write({"value": 1})
+
+        reads = []
+        original_read = JsonFile.read
+        monkeypatch.setattr(JsonFile, "read", lambda self: reads.append(1) or original_read(self))
+
+        for _ in range(100):
+            assert file.get_entry("value") == 1
+        assert reads == []
+
+        JsonFile(fp).write({"value": 2, "other": True})
+
+        assert file.get_entry("value") == 2
+        assert file.get_entry("other") is True
+        assert len(reads) == 1
+
+    def test_set_entry_keeps_existing_data(self):
+        """Тестирование того, что set_entry сохраняет данные, записанные ранее."""
+        fp = BASE_PATH / "test_keep_data.json"
+        fp.write_text(json.dumps({"existing": 1}))
+
+        JsonFile(fp).set_entry("new", 2)
+
+        assert JsonFile(fp).read() == {"existing": 1, "new": 2}
+
+    def test_mmap_read_mode(self, monkeypatch):
+        """Тестирование чтения отдельных значений через индекс смещений без загрузки буфера."""
+        fp = BASE_PATH / "test_mmap.json"
+        data = {"users": {str(i): {"id": i} for i in range(100)}, "meta": {"count": 100}}
+        fp.write_text(json.dumps(data, indent=4))
+
+        monkeypatch.setattr(JsonFile, "read", lambda self: pytest.fail("The whole file was read."))
+        file = JsonFile(fp, read_mode="mmap", index_keys=[["users"]])
+
+        assert file.get_entry(["users", "42"]) == {"id": 42}
+        assert file.get_entry(["meta", "count"]) == 100
+        with pytest.raises(KeyError):
+            file.get_entry(["users", "1000"])
+        file.close()
+
+    def test_mmap_read_mode_sees_writes(self):
+        """Тестирование того, что режим mmap видит изменения файла."""
+        fp = BASE_PATH / "test_mmap_writes.json"
+        file = JsonFile(fp, read_mode="mmap", persist_index=True)
+        file.write({"a": 1})
+
+        file.set_entry("b", 2)
+        JsonFile(fp).set_entry("c", 3)
+
+        assert file.get_entry("b") == 2
+        assert file.get_entry("c") == 3
+        file.delete()
+        assert not (BASE_PATH / "test_mmap_writes.json.offsets.json").exists()
+
+    def test_mmap_read_mode_replaces_file(self):
+        """Тестирование того, что файл в режиме mmap не перезаписывается на месте."""
+        fp = BASE_PATH / "test_mmap_replace.json"
+        writer = JsonFile(fp, read_mode="mmap")
+        writer.write({"a": "x" * 100})
+        reader = JsonFile(fp, read_mode="mmap")
+        assert reader.get_entry("a") == "x" * 100
+        mapped = reader._offset_index._mmap
+        inode = fp.stat().st_ino
+
+        writer.write({"a": 1})
+
+        assert fp.stat().st_ino != inode
+        # The map of the reader still holds the old, complete content.
+        assert b"x" * 100 in mapped[:]
+        assert reader.get_entry("a") == 1
+        reader.close()
+        writer.close()
+
+    def test_mmap_read_mode_with_journal(self):
+        """Тестирование запрета сочетания режима mmap с журналом."""
+        with pytest.raises(ValueError):
+            JsonFile(BASE_PATH / "test_mmap_journal.json", read_mode="mmap", journal=True)
+
+    def test_written_tree_is_not_aliased(self):
+        """Тестирование того, что изменения буфера не затрагивают записанное дерево."""
+        file = JsonFile(BASE_PATH / "test_tree_alias.json")
+        tree = RootTree(Tree("tree", Entry("key", "value")))
+
+        file.write(tree)
+        file.set_entry(["tree", "key"], "changed")
+
+        assert tree.to_dict() == {"tree": {"key": "value"}}
+        assert file.read() == {"tree": {"key": "changed"}}
@@ -0,0 +1,116 @@
+import pytest
+from pathlib import Path
+from ooj.exceptions import FileExtensionException
+from ooj.file import JsonLinesFile
+
+# Базовый путь для тестов JSON Lines файлов
+BASE_PATH = Path('tests/files/test_json_lines_files')
+
+
+class TestJsonLinesFile:
+    @pytest.fixture(scope="function", autouse=True)
+    def setup_teardown(self):
+        """Создает необходимые папки перед каждым тестом и удаляет после."""
+        BASE_PATH.mkdir(parents=True, exist_ok=True)
+        yield
+        for file in BASE_PATH.glob("*"):
+            file.unlink()
+
+    def test_append_and_iterate(self):
+        """Тестирование добавления записей и потокового чтения."""
+        file = JsonLinesFile(BASE_PATH / "test_append.jsonl")
+
+        file.append({"event": "start"})
+        file.extend([{"event": "tick", "n": i} for i in range(3)])
+
+        assert list(file) == [{"event": "start"}] + [{"event": "tick", "n": i} for i in range(3)]
+        assert len(file) == 4
+
+    def test_append_does_not_rewrite_file(self):
+        """Тестирование того, что добавление записи дописывает только одну строку."""
+        file = JsonLinesFile(BASE_PATH / "test_append_only.jsonl")
+        file.extend([{"n": i} for i in range(100)])
+        size = file.fp.stat().st_size
+
+        file.append({"n": 100})
+
+        assert file.fp.stat().st_size - size == len(b'{"n":100}\n')
+
+    def test_get_by_index(self):
+        """Тестирование произвольного доступа по номеру записи."""
+        file = JsonLinesFile(BASE_PATH / "test_get.jsonl")
+        file.extend([{"n": i, "text": "line\nbreak"} for i in range(20)])
+
+        assert file.get(7) == {"n": 7, "text": "line\nbreak"}
+        assert file[-1]["n"] == 19
+
+        file.append({"n": 20})
+        assert file.get(20) == {"n": 20}
+
+        with pytest.raises(IndexError):
+            file.get(21)
+
+    def test_index_is_persisted_and_resumed(self):
+        """Тестирование сохранения индекса и дочитывания новых строк."""
+        fp = BASE_PATH / "test_index.jsonl"
+        file = JsonLinesFile(fp)
+        file.extend([{"n": i} for i in range(10)])
+        assert len(file) == 10
+        assert file.index_fp.exists()
+
+        with fp.open("ab") as f:
+            f.write(b'{"n":10}\n{"n":11}\n{"n":')
+
+        reopened = JsonLinesFile(fp)
+        assert len(reopened) == 12
+        assert reopened.get(11) == {"n": 11}
+
+    def test_index_of_a_changed_file_is_rebuilt(self):
+        """Тестирование перестроения индекса после изменения начала файла."""
+        fp = BASE_PATH / "test_index_changed.jsonl"
+        file = JsonLinesFile(fp)
+        file.extend([{"n": i} for i in range(10)])
+        file.save_index()
+
+        # Rewritten in place by another program: same inode, longer lines.
+        with fp.open("r+b") as f:
+            f.write(b"".join(b'{"n":%d,"x":1}\n' % i for i in range(12)))
+
+        reopened = JsonLinesFile(fp)
+        assert len(reopened) == 12
+        assert reopened.get(3) == {"n": 3, "x": 1}
+
+        # Appending only keeps the index, and the next save covers the new lines.
+        with fp.open("ab") as f:
+            f.write(b'{"n":12}\n')
+        assert JsonLinesFile(fp).get(12) == {"n": 12}
+        assert JsonLinesFile(fp)._load_persisted_index()[1] == fp.stat().st_size
+
+    def test_write_resets_index(self):
+        """Тестирование перезаписи файла."""
+        file = JsonLinesFile(BASE_PATH / "test_write.jsonl")
+        file.extend([{"n": i} for i in range(5)])
+        assert len(file) == 5
+
+        file.write([{"n": "new"}])
+
+        assert len(file) == 1
+        assert file.read() == [{"n": "new"}]
+
+    def test_failed_write_keeps_records(self):
+        """Тестирование того, что неудачная перезапись не портит файл."""
+        file = JsonLinesFile(BASE_PATH / "test_failed_write.jsonl")
+        file.extend([{"n": i} for i in range(3)])
+        assert file.get(2) == {"n": 2}
+
+        with pytest.raises(TypeError):
+            file.write([{"n": 10}, {"n": object()}])
+
+        assert file.read() == [{"n": i} for i in range(3)]
+        assert file.get(1) == {"n": 1}
+        assert list(BASE_PATH.glob(".test_failed_write.jsonl.*")) == []
+
+    def test_wrong_extension(self):
+        """Тестирование проверки расширения файла."""
+        with pytest.raises(FileExtensionException):
+            JsonLinesFile(BASE_PATH / "test.json")
@@ -0,0 +1,170 @@
+import multiprocessing
+import threading
+import time
+import pytest
+from pathlib import Path
+from ooj.file import JsonFile
+from ooj.locking import ProcessLock, ReadWriteLock
+
+BASE_PATH = Path('tests/files/test_json_files')
+
+
+def _increment(fp: str, times: int) -> None:
+    file = JsonFile(fp, concurrent=True)
+    for _ in range(times):
+        with file.transaction():
+            file.set_entry("count", file.get_entry("count") + 1)
+    file.close()
+
+
+class TestLocking:
+    @pytest.fixture(scope="function", autouse=True)
+    def setup_teardown(self):
+        """Создает необходимые папки перед каждым тестом и удаляет после."""
+        BASE_PATH.mkdir(parents=True, exist_ok=True)
+        yield
+        for json_file in BASE_PATH.glob("*.json*"):
+            json_file.unlink()
+
+    def test_readers_run_in_parallel(self):
+        """Тестирование того, что читатели не блокируют друг друга."""
+        lock = ReadWriteLock()
+        barrier = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read_locked():
+                barrier.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not barrier.broken
+
+    def test_writer_excludes_readers(self):
+        """Тестирование того, что писатель исключает читателей."""
+        lock = ReadWriteLock()
+        events = []
+
+        def reader():
+            with lock.read_locked():
+                events.append("read")
+
+        with lock.write_locked():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            time.sleep(0.05)
+            events.append("written")
+        thread.join()
+        assert events == ["written", "read"]
+
+    def test_reentrancy_and_upgrade(self):
+        """Тестирование повторного захвата и запрета повышения блокировки."""
+        lock = ReadWriteLock()
+        with lock.write_locked():
+            with lock.write_locked(), lock.read_locked():
+                pass
+        with lock.read_locked():
+            with lock.read_locked():
+                pass
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+    def test_process_lock_generation(self):
+        """Тестирование счетчика записей в файле блокировки."""
+        fp = BASE_PATH / "test_generation.json.lock"
+        first, second = ProcessLock(fp), ProcessLock(fp)
+        assert first.generation() == 0
+
+        with first.locked(exclusive=True):
+            first.bump()
+        assert second.generation() == 1
+        first.close()
+        second.close()
+
+    def test_concurrent_mode_sees_changes_of_another_instance(self):
+        """Тестирование перечитывания файла, измененного другим экземпляром."""
+        fp = BASE_PATH / "test_concurrent_reload.json"
+        first, second = JsonFile(fp, concurrent=True), JsonFile(fp, concurrent=True)
+        first.write({"count": 0})
+
+        # Writes of the same size within one timestamp tick keep the stat
+        # signature; the write generation still tells them apart.
+        for i in range(1, 6):
+            first.set_entry("count", i)
+            assert second.get_entry("count") == i
+        assert first.lock_fp.exists()
+        first.close()
+        second.close()
+
+    def test_concurrent_threads_do_not_lose_updates(self):
+        """Тестирование параллельных писателей и читателей в потоках."""
+        fp = BASE_PATH / "test_concurrent_threads.json"
+        file = JsonFile(fp, concurrent=True)
+        file.write({"count": 0})
+        errors = []
+
+        def writer():
+            for _ in range(50):
+                with file.transaction():
+                    file.set_entry("count", file.get_entry("count") + 1)
+
+        def reader():
+            try:
+                for _ in range(200):
+                    assert isinstance(file.get_entry("count"), int)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert JsonFile(fp).read() == {"count": 200}
+        file.close()
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+    def test_concurrent_processes_do_not_lose_updates(self):
+        """Тестирование параллельных писателей в разных процессах."""
+        fp = BASE_PATH / "test_concurrent_processes.json"
+        JsonFile(fp).write({"count": 0})
+
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=_increment, args=(str(fp), 50)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert all(process.exitcode == 0 for process in processes)
+        assert JsonFile(fp).read() == {"count": 200}
+
+    def test_iterators_hold_the_shared_lock(self):
+        """Тестирование удержания общей блокировки во время итерации."""
+        fp = BASE_PATH / "test_concurrent_iterators.json"
+        file = JsonFile(fp, concurrent=True)
+        file.write({"items": [1, 2, 3]})
+
+        for iterator in (file.iter_query("$.items[*]"), file.iter_items("items"), file.iter_events()):
+            assert next(iterator) is not None
+            writer = threading.Thread(target=file.set_entry, args=("items", [4]))
+            writer.start()
+            writer.join(0.1)
+            assert writer.is_alive()
+
+            rest = list(iterator)
+            writer.join()
+            assert rest
+            file.set_entry("items", [1, 2, 3])
+        file.close()
+
+    def test_concurrent_mode_with_write_behind(self):
+        """Тестирование запрета сочетания режима concurrent с write_behind."""
+        with pytest.raises(ValueError):
+            JsonFile(BASE_PATH / "test_concurrent_write_behind.json", concurrent=True,
+                     write_mode="write_behind")
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+import pytest
+from ooj.offset_index import OffsetIndex
+
+
+BASE_PATH = Path('tests/files/test_offset_index')
+
+DOCUMENT = {
+    "name": "café \"quoted\" \\ ]}",
+    "users": {str(i): {"id": i, "tags": ["a", "]"], "score": i * 1.5} for i in range(50)},
+    "matrix": [[1, 2], [3, {"x": None}]],
+    "flag": True,
+    "empty": {},
+}
+
+
+class TestOffsetIndex:
+    @pytest.fixture(scope="function", autouse=True)
+    def setup_teardown(self):
+        BASE_PATH.mkdir(parents=True, exist_ok=True)
+        yield
+        for fp in BASE_PATH.glob("*.json*"):
+            fp.unlink()
+
+    @pytest.mark.parametrize("indent", [None, 4])
+    def test_lookups_match_document(self, indent):
+        fp = BASE_PATH / "document.json"
+        fp.write_text(json.dumps(DOCUMENT, indent=indent, ensure_ascii=False), encoding="utf-8")
+        index = OffsetIndex(fp, nested_keys=[["users"], ["matrix", 1]])
+
+        for key, value in DOCUMENT.items():
+            assert index.get([key]) == value
+        assert index.get(["users", "42"]) == DOCUMENT["users"]["42"]
+        assert index.get(["users", "42", "tags", 1]) == "]"
+        assert index.get(["matrix", 1, 1]) == {"x": None}
+        assert ("users", "42") in index
+        assert ("matrix", 1, 1) in index
+        assert index.get([]) == DOCUMENT
+        index.close()
+
+    def test_missing_keys(self):
+        fp = BASE_PATH / "missing.json"
+        fp.write_text(json.dumps(DOCUMENT))
+        index = OffsetIndex(fp, nested_keys=[["users"]])
+
+        with pytest.raises(KeyError):
+            index.get(["nothing"])
+        with pytest.raises(KeyError):
+            index.get(["users", "1000"])
+        with pytest.raises(KeyError):
+            index.get(["flag", "x"])
+        index.close()
+
+    def test_rebuilds_after_change(self):
+        fp = BASE_PATH / "change.json"
+        fp.write_text(json.dumps({"a": 1}))
+        index = OffsetIndex(fp)
+        assert index.get(["a"]) == 1
+
+        fp.write_text(json.dumps({"a": [1, 2, 3], "b": 2}))
+
+        assert index.get(["a"]) == [1, 2, 3]
+        assert index.get(["b"]) == 2
+        index.close()
+
+    def test_persisted_index_is_reused(self, monkeypatch):
+        fp = BASE_PATH / "persist.json"
+        fp.write_text(json.dumps(DOCUMENT))
+        OffsetIndex(fp, nested_keys=[["users"]], persist=True).refresh()
+        assert (BASE_PATH / "persist.json.offsets.json").exists()
+
+        monkeypatch.setattr(OffsetIndex, "_build", lambda self: pytest.fail("The index was rebuilt."))
+        index = OffsetIndex(fp, nested_keys=[["users"]], persist=True)
+
+        assert index.get(["users", "7", "id"]) == 7
+        index.close()
+
+    def test_empty_and_missing_file(self):
+        fp = BASE_PATH / "empty.json"
+        index = OffsetIndex(fp)
+        assert len(index) == 0
+
+        fp.write_text("{}")
+        assert index.get([]) == {}
+        with pytest.raises(KeyError):
+            index.get(["a"])
+        index.close()
@@ -0,0 +1,162 @@
+import copy
+
+import pytest
+from ooj.entities import Entry, RootTree, TreeConverter
+from ooj.exceptions import PatchException
+from ooj.patch import apply_patch, diff
+
+
+SOURCE = {
+    "name": "config",
+    "db": {"host": "localhost", "pool": {"size": 10}},
+    "tags": ["a", "b", "c"],
+    "users": [{"id": 1, "name": "Ann"}, {"id": 2, "name": "Bob"}],
+    "a/b~c": 1
+}
+
+
+def changed(data: dict) -> dict:
+    data = copy.deepcopy(data)
+    data["db"]["pool"]["size"] = 20
+    del data["name"]
+    data["tags"] = ["a", "x", "b", "c", "d"]
+    data["users"][1]["name"] = "Bill"
+    data["a/b~c"] = 2
+    data["new"] = {"nested": [1, 2]}
+    return data
+
+
+class TestPatch:
+    @pytest.mark.parametrize("target", [
+        changed(SOURCE),
+        {},
+        {"tags": []},
+        {**SOURCE, "users": [{"id": 2, "name": "Bob"}]},
+        {**SOURCE, "tags": ["c", "b", "a"], "db": 1},
+    ])
+    def test_diff_round_trip(self, target):
+        document = copy.deepcopy(SOURCE)
+        patch = diff(document, target)
+
+        assert apply_patch(document, patch) == target
+        assert diff(target, target) == []
+
+    def test_tree_diff_round_trip(self):
+        source, target = TreeConverter.to_root_tree(SOURCE), TreeConverter.to_root_tree(changed(SOURCE))
+        patch = diff(source, target)
+
+        apply_patch(source, patch)
+
+        assert source == changed(SOURCE)
+        assert source.content_hash == target.content_hash
+        assert source["users"][1]["name"] == "Bill"
+        assert isinstance(source["new"]["nested"], list)
+
+    def test_diff_is_minimal(self):
+        target = copy.deepcopy(SOURCE)
+        target["db"]["pool"]["size"] = 11
+        target["users"][0]["name"] = "Anna"
+
+        patch = diff(TreeConverter.to_root_tree(SOURCE), TreeConverter.to_root_tree(target))
+
+        assert sorted(patch, key=lambda operation: operation["path"]) == [
+            {"op": "replace", "path": "/db/pool/size", "value": 11},
+            {"op": "replace", "path": "/users/0/name", "value": "Anna"},
+        ]
+
+    def test_diff_skips_unchanged_subtrees(self, monkeypatch):
+        source = TreeConverter.to_root_tree({"big": {str(i): {"v": i} for i in range(100)}, "x": 1})
+        target = TreeConverter.to_root_tree({"big": {str(i): {"v": i} for i in range(100)}, "x": 2})
+        source.content_hash, target.content_hash
+
+        visited = []
+        original = type(source["big"])._equals
+        monkeypatch.setattr(type(source["big"]), "_equals", lambda self, value: visited.append(self) or original(self, value))
+
+        assert diff(source, target) == [{"op": "replace", "path": "/x", "value": 2}]
+        assert visited == []
+
+    @pytest.mark.parametrize("source, target", [
+        ({"a": True}, {"a": 1}),
+        ({"a": 1}, {"a": 1.0}),
+        ({"a": [0, {"b": False}]}, {"a": [0, {"b": 0}]}),
+    ])
+    def test_diff_tells_json_types_apart(self, source, target):
+        for a, b in ((source, target), (target, source)):
+            patch = diff(a, b)
+            tree_patch = diff(TreeConverter.to_root_tree(a), TreeConverter.to_root_tree(b))
+
+            assert patch and tree_patch
+            document = apply_patch(copy.deepcopy(a), patch)
+            assert document == b and diff(document, b) == []
+            assert diff(apply_patch(TreeConverter.to_root_tree(a), tree_patch).to_dict(), b) == []
+
+    def test_diff_values_are_copies(self):
+        target = {"new": {"list": [1]}}
+        patch = diff({}, target)
+        patch[0]["value"]["list"].append(2)
+
+        assert target == {"new": {"list": [1]}}
+
+    def test_operations(self):
+        document = {"a": {"b": 1}, "list": [1, 2, 3]}
+        apply_patch(document, [
+            {"op": "add", "path": "/list/-", "value": 4},
+            {"op": "add", "path": "/list/0", "value": 0},
+            {"op": "remove", "path": "/list/1"},
+            {"op": "move", "from": "/a/b", "path": "/c"},
+            {"op": "copy", "from": "/list", "path": "/copied"},
+            {"op": "test", "path": "/c", "value": 1},
+            {"op": "replace", "path": "/a", "value": [True]},
+        ])
+
+        assert document == {"a": [True], "list": [0, 2, 3, 4], "c": 1, "copied": [0, 2, 3, 4]}
+        assert document["copied"] is not document["list"]
+
+    def test_tree_operations_keep_caches_current(self):
+        tree = TreeConverter.to_root_tree({"a": {"b": 1}, "list": [{"id": 1}]})
+        tree.to_dict(), tree.content_hash
+
+        apply_patch(tree, [
+            {"op": "add", "path": "/list/-", "value": {"id": 2}},
+            {"op": "replace", "path": "/list/0/id", "value": 10},
+            {"op": "move", "from": "/a", "path": "/moved"},
+        ])
+
+        expected = {"list": [{"id": 10}, {"id": 2}], "moved": {"b": 1}}
+        assert tree.to_dict() == expected
+        assert tree.content_hash == TreeConverter.to_root_tree(expected).content_hash
+        assert isinstance(tree["list"][1], RootTree)
+
+    def test_test_compares_numbers_by_value(self):
+        document = {"a": 1, "nested": {"list": [2.0, {"x": 3}]}, "flags": [1]}
+        tree = TreeConverter.to_root_tree(document)
+
+        for target in (document, tree):
+            apply_patch(target, [
+                {"op": "test", "path": "/a", "value": 1.0},
+                {"op": "test", "path": "/nested", "value": {"list": [2, {"x": 3.0}]}},
+            ])
+            with pytest.raises(PatchException):
+                apply_patch(target, [{"op": "test", "path": "/flags", "value": [True]}])
+
+    @pytest.mark.parametrize("operation", [
+        {"op": "remove", "path": "/missing"},
+        {"op": "replace", "path": "/list/5", "value": 1},
+        {"op": "add", "path": "/list/01", "value": 1},
+        {"op": "test", "path": "/a", "value": 2},
+        {"op": "test", "path": "/a", "value": True},
+        {"op": "move", "from": "/nested", "path": "/nested/child"},
+        {"op": "unknown", "path": "/a"},
+        {"path": "/a"},
+        {"op": "add", "path": "a", "value": 1},
+    ])
+    def test_invalid_operations(self, operation):
+        with pytest.raises(PatchException):
+            apply_patch({"a": 1, "list": [1], "nested": {}}, [operation])
+
+    def test_pointer_escaping(self):
+        patch = diff({}, {"a/b~c": 1})
+
+        assert patch == [{"op": "add", "path": "/a~1b~0c", "value": 1}]
+        assert apply_patch(RootTree(Entry("x", 0)), patch).to_dict() == {"x": 0, "a/b~c": 1}
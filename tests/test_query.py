@@ -0,0 +1,90 @@
+import pytest
+from ooj.entities import RootTree, Tree, TreeConverter
+from ooj.exceptions import QueryException
+from ooj.query import Query
+
+
+STORE = {
+    "store": {
+        "book": [
+            {"title": "A", "price": 8, "isbn": "1"},
+            {"title": "B", "price": 12, "available": True},
+            {"title": "C", "price": 9.5, "tags": ["new"]}
+        ],
+        "bicycle": {"price": 20}
+    },
+    "a.b": 1
+}
+
+
+class TestQuery:
+    @pytest.mark.parametrize("expression, expected", [
+        ("$.store.book[*].title", ["A", "B", "C"]),
+        ("store.book[-1].title", ["C"]),
+        ("$['store']['book'][0]['title']", ["A"]),
+        ("$.store.book[0:2].title", ["A", "B"]),
+        ("$.store.book[::-1].title", ["C", "B", "A"]),
+        ("$.store.book[0, 2].title", ["A", "C"]),
+        ("$['a.b']", [1]),
+        ("$..price", [8, 12, 9.5, 20]),
+        ("$..book[1].title", ["B"]),
+        ("$.store.book[?(@.price < 10)].title", ["A", "C"]),
+        ("$.store.book[?@.isbn].title", ["A"]),
+        ("$.store.book[?(@.price >= 9 && !@.isbn)].title", ["B", "C"]),
+        ("$.store.book[?(@.tags[0] == 'new' || @.title == \"A\")].title", ["A", "C"]),
+        ("$.store.book[?(@.available == true)].title", ["B"]),
+        ("$.store.book[?(@.price == true)].title", []),
+        ("$.store.*[?(@ > 10)]", [20]),
+        ("$.store.missing[0]", []),
+    ])
+    def test_find(self, expression, expected):
+        assert Query.compile(expression).find(STORE) == expected
+
+    def test_tree_documents(self):
+        tree = TreeConverter.to_root_tree(STORE)
+        query = Query.compile("$.store.book[?(@.price > 9)]")
+
+        assert query.find(tree) == [STORE["store"]["book"][1], STORE["store"]["book"][2]]
+        assert isinstance(query.first(tree), RootTree)
+        assert isinstance(Query.compile("$.store").first(tree), Tree)
+        assert Query.compile("$..title").find(TreeConverter.to_root_tree(STORE, lazy=True)) == ["A", "B", "C"]
+
+    def test_iter_is_lazy(self):
+        document = {"items": list(range(10))}
+        matches = Query.compile("$.items[*]").iter(document)
+
+        assert next(matches) == 0
+        document["items"][1] = "changed"
+        assert next(matches) == "changed"
+
+    def test_iter_paths(self):
+        assert list(Query.compile("$..price").iter_paths(STORE))[-2:] == [
+            (("store", "book", 2, "price"), 9.5),
+            (("store", "bicycle", "price"), 20),
+        ]
+
+    def test_compiled_queries_are_cached(self):
+        Query.cache_clear()
+
+        query = Query.compile("$.store.book[0]")
+
+        assert Query.compile("$.store.book[0]") is query
+        assert Query.compile(query) is query
+        assert Query.cache_info().hits == 1
+        assert Query.cache_info().currsize == 1
+
+    def test_deep_documents(self):
+        document = value = {}
+        for _ in range(5000):
+            value["child"] = {}
+            value = value["child"]
+        value["leaf"] = True
+
+        assert Query.compile("$..leaf").find(document) == [True]
+
+    @pytest.mark.parametrize("expression", [
+        "$.", "$[", "$[0", "$['a", "$[?(@.a <)]", "$[1:2:0]", "$[?(1)]", "$.a b", "$[1:2:3:4]"
+    ])
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(QueryException):
+            Query.compile(expression)
@@ -0,0 +1,179 @@
+import json
+import pytest
+from pathlib import Path
+from ooj.file import JsonFile
+from ooj.record_index import RecordIndex
+
+BASE_PATH = Path('tests/files/test_record_indexes')
+
+
+def make_file(name: str, count: int = 10, **kwargs) -> JsonFile:
+    file = JsonFile(BASE_PATH / name, **kwargs)
+    file.write({"data": {"users": [{"id": i, "profile": {"group": i % 3}} for i in range(count)]}})
+    return file
+
+
+class TestRecordIndex:
+    @pytest.fixture(scope="function", autouse=True)
+    def setup_teardown(self):
+        BASE_PATH.mkdir(parents=True, exist_ok=True)
+        yield
+        for json_file in BASE_PATH.glob("*.json*"):
+            json_file.unlink()
+
+    def test_lookups(self):
+        file = make_file("lookups.json")
+        ids = file.create_index(["data", "users"], "id", unique=True)
+        groups = file.create_index(["data", "users"], ["profile", "group"])
+
+        assert ids.get(5) == {"id": 5, "profile": {"group": 2}}
+        assert ids.get(100, "missing") == "missing"
+        assert [user["id"] for user in groups.get(1)] == [1, 4, 7]
+        assert groups.positions(0) == [0, 3, 6, 9]
+        assert 9 in ids and 10 not in ids
+        assert sorted(groups) == [0, 1, 2]
+        assert file.create_index(["data", "users"], "id", unique=True) is ids
+
+    def test_lookups_do_not_rebuild(self, monkeypatch):
+        file = make_file("no_rebuild.json", count=1000)
+        ids = file.create_index(["data", "users"], "id", unique=True)
+
+        builds = []
+        original = RecordIndex._build
+        monkeypatch.setattr(RecordIndex, "_build", lambda self, array: builds.append(1) or original(self, array))
+
+        for i in range(1000):
+            assert ids.get(i)["id"] == i
+        ids.insert({"id": 1000})
+        ids.delete(0)
+        assert ids.get(1000)["id"] == 1000
+        assert builds == []
+
+    def test_helpers_update_every_index(self):
+        file = make_file("helpers.json")
+        ids = file.create_index(["data", "users"], "id", unique=True)
+        groups = file.create_index(["data", "users"], ["profile", "group"])
+
+        ids.insert({"id": 10, "profile": {"group": 1}})
+        assert groups.positions(1) == [1, 4, 7, 10]
+
+        assert ids.delete(3) == 1
+        assert ids.positions(4) == [3]
+        assert groups.positions(0) == [0, 5, 8]
+
+        ids.update(4, {"id": 40, "profile": {"group": 0}})
+        assert ids.get(4) is None
+        assert groups.positions(0) == [0, 3, 5, 8]
+
+        assert file.read()["data"]["users"][3] == {"id": 40, "profile": {"group": 0}}
+        assert JsonFile(file.fp).create_index(["data", "users"], "id", unique=True).positions(40) == [3]
+
+    def test_helpers_journal_changed_records(self, monkeypatch):
+        file = make_file("journaled.json", journal=True)
+        ids = file.create_index(["data", "users"], "id", unique=True)
+        journal_fp = BASE_PATH / "journaled.json.journal"
+
+        ids.insert({"id": 10})
+        ids.update(3, {"id": 30})
+        records = [json.loads(line) for line in journal_fp.read_text().splitlines()]
+        assert records == [
+            {"op": "set", "path": ["data", "users", 10], "value": {"id": 10}},
+            {"op": "set", "path": ["data", "users", 3], "value": {"id": 30}},
+        ]
+
+        ids.delete(0)
+        expected = file.read()
+        assert JsonFile(file.fp, journal=True).read() == expected
+
+        # The records are idempotent: replaying them over the compacted file changes nothing.
+        journal = journal_fp.read_bytes()
+        file.compact()
+        journal_fp.write_bytes(journal)
+        assert JsonFile(file.fp, journal=True).read() == expected
+
+        # A missing array is written once, together with its first record.
+        writes = []
+        monkeypatch.setattr(JsonFile, "_append_journal", lambda self, records: writes.append(records))
+        file.create_index("tags", "name").insert({"name": "a"})
+        assert writes == [[("set", ["tags"], [{"name": "a"}])]]
+
+    def test_unique_violations(self):
+        file = make_file("unique.json")
+        ids = file.create_index(["data", "users"], "id", unique=True)
+
+        with pytest.raises(ValueError):
+            ids.insert({"id": 1})
+        with pytest.raises(ValueError):
+            file.create_index(["data", "users"], ["profile", "group"], unique=True)
+        with pytest.raises(KeyError):
+            ids.update(100, {"id": 100})
+
+        assert len(file.read()["data"]["users"]) == 10
+
+    def test_rejected_insert_leaves_buffer_untouched(self, monkeypatch):
+        file = JsonFile(BASE_PATH / "rejected.json", ignore_errors=[ValueError])
+        file.write({"data": {}})
+        ids = file.create_index(["data", "users"], "id", unique=True)
+        ids.insert({"id": 1})
+        assert ids.insert({"id": 1}) is None
+        assert file.data == {"data": {"users": [{"id": 1}]}}
+
+        # A rejected record does not create a missing array either.
+        emails = file.create_index(["data", "admins"], "email", unique=True)
+        monkeypatch.setattr(RecordIndex, "_check_unique", lambda self, indexes, record, replaced=(): False)
+        emails.insert({"email": "a@b.c"})
+
+        assert file.data == {"data": {"users": [{"id": 1}]}}
+        assert file.read() == {"data": {"users": [{"id": 1}]}}
+
+    def test_replaced_array_is_reindexed(self):
+        file = make_file("replaced.json")
+        ids = file.create_index(["data", "users"], "id", unique=True)
+
+        file.set_entry(["data", "users"], [{"id": "a"}, {"id": True}, {"id": None}])
+        assert ids.get("a") == {"id": "a"}
+        assert ids.get(True) == {"id": True}
+        assert ids.get(1) is None
+        assert ids.positions(None) == [2]
+
+        file.del_entry("data")
+        assert ids.get("a") is None
+        ids.insert({"id": "b"})
+        assert file.read() == {"data": {"users": [{"id": "b"}]}}
+
+        file.write({"data": {"users": [{"id": "c"}]}})
+        assert ids.get("c") == {"id": "c"}
+
+    def test_rollback_and_patch(self):
+        file = make_file("rollback.json")
+        ids = file.create_index(["data", "users"], "id", unique=True)
+
+        with pytest.raises(RuntimeError):
+            with file.transaction():
+                ids.insert({"id": 10})
+                ids.delete(0)
+                raise RuntimeError
+
+        assert ids.positions(0) == [0]
+        assert 10 not in ids
+
+        file.apply_patch([{"op": "remove", "path": "/data/users/0"}])
+        assert ids.positions(1) == [0]
+
+    def test_persisted_index(self, monkeypatch):
+        file = make_file("persisted.json")
+        file.create_index(["data", "users"], "id", unique=True, persist=True)
+        file.close()
+        assert file.indexes_fp.exists()
+
+        monkeypatch.setattr(RecordIndex, "_build", lambda self, array: pytest.fail("rebuilt"))
+        ids = JsonFile(file.fp).create_index(["data", "users"], "id", unique=True, persist=True)
+        assert ids.get(7) == {"id": 7, "profile": {"group": 1}}
+
+        monkeypatch.undo()
+        file.set_entry(["data", "users"], [{"id": "new"}])
+        file.close()
+        assert JsonFile(file.fp).create_index(["data", "users"], "id", unique=True, persist=True).get("new")
+
+        file.delete()
+        assert not file.indexes_fp.exists()
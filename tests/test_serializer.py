@@ -1,4 +1,13 @@
+import copy
+import json
+import os
+
 import pytest
+from typing import List
+
+from ooj.exceptions import SchemaException, ValidationException
+from ooj.field import Field
+from ooj.schema import Schema
 from ooj.serializer import Serializer
 
 
@@ -41,6 +50,15 @@ class Company:
         return False
 
 
+ADDRESS_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "title": "Address",
+    "type": "object",
+    "properties": {"street": {"type": "string"}, "zip_code": {"type": "integer"}},
+    "required": ["street"]
+}
+
+
 class TestSerializer:
     @pytest.mark.parametrize("obj, expected_dict", [
         (
@@ -107,4 +125,225 @@ class TestSerializer:
         assert deserialized_obj.__dict__ == expected_obj.__dict__
         if isinstance(expected_obj, Company):
             for emp_deserialized, emp_expected in zip(deserialized_obj.employees, expected_obj.employees):
-                assert emp_deserialized.__dict__ == emp_expected.__dict__
\ No newline at end of file
+                assert emp_deserialized.__dict__ == emp_expected.__dict__
+
+    def test_serialize_reuses_plan_for_same_class(self):
+        Serializer.clear_cache()
+        people = [Person(name=f"P{i}", age=i, address=Address("Main St", "New York", i)) for i in range(10)]
+
+        serialized = [Serializer.serialize(person) for person in people]
+
+        assert serialized[3] == {"name": "P3", "age": 3, "address": {"street": "Main St", "city": "New York", "zip_code": 3}}
+        assert len(Serializer._plans) == 2
+        assert Serializer._plans.info().hits >= len(people) - 1
+
+    def test_serialize_rebuilds_plan_when_shape_changes(self):
+        Serializer.clear_cache()
+        address = Address(street="Main St", city="New York", zip_code=10001)
+        assert Serializer.serialize(address) == {"street": "Main St", "city": "New York", "zip_code": 10001}
+
+        address.zip_code = [1, 2]
+        address.country = Address("Lane", "Paris", 75001)
+        assert Serializer.serialize(address) == {
+            "street": "Main St", "city": "New York", "zip_code": [1, 2],
+            "country": {"street": "Lane", "city": "Paris", "zip_code": 75001}
+        }
+
+        del address.country
+        address.zip_code = 10001
+        assert Serializer.serialize(address) == {"street": "Main St", "city": "New York", "zip_code": 10001}
+
+    def test_alternating_field_types_do_not_rebuild_plan(self, monkeypatch):
+        Serializer.clear_cache()
+        addresses = [Address("Main St", "New York", None if i % 2 else i) for i in range(10)]
+        Serializer.serialize(addresses[0])
+        Serializer.serialize(addresses[1])
+
+        builds = []
+        original = Serializer._Serializer__build_layout
+        monkeypatch.setattr(Serializer, "_Serializer__build_layout",
+                            classmethod(lambda cls, fields: builds.append(1) or original(fields)))
+
+        serialized = [Serializer.serialize(address) for address in addresses]
+        assert [seria["zip_code"] for seria in serialized] == [None if i % 2 else i for i in range(10)]
+        assert builds == []
+
+    def test_plan_cache_is_bounded(self):
+        Serializer.clear_cache()
+        maxsize = Serializer._plans.maxsize
+        for i in range(maxsize + 10):
+            Serializer.serialize(type(f"Dynamic{i}", (), {})())
+
+        assert len(Serializer._plans) == maxsize
+
+    def test_compile_is_cached_and_reusable(self):
+        Serializer.clear_cache()
+        deserializer = Serializer.compile(Company)
+
+        assert Serializer.compile(Company) is deserializer
+
+        company = deserializer.decode({
+            "company_name": "TechCorp",
+            "employees": [
+                {"name": "John Doe", "age": 30, "address": {"street": "Main St", "city": "New York", "zip_code": 10001}},
+                None,
+            ]
+        })
+        assert company == Company("TechCorp", [Person("John Doe", 30, Address("Main St", "New York", 10001))])
+
+    def test_compile_cache_compares_field_overrides_by_type(self):
+        Serializer.clear_cache()
+        deserializer = Serializer.compile(Person, {"address": Field(Address)})
+
+        assert Serializer.compile(Person, {"address": Field(Address)}) is deserializer
+        assert Serializer.compile(Person, {"address": Address}) is deserializer
+        assert Serializer.compile(Person, {"address": Field(Person)}) is not deserializer
+        assert len(Serializer._deserializers) == 2
+
+    def test_compile_uses_field_overrides(self):
+        class Box:
+            def __init__(self, content, tags):
+                self.content = content
+                self.tags = tags
+
+        deserializer = Serializer.compile(Box, {"content": Field(Address), "tags": List[Address]})
+        box = deserializer({
+            "$schema": "schema.json",
+            "content": {"street": "Main St", "city": "New York", "zip_code": 10001},
+            "tags": [{"street": "Lane", "city": "Paris", "zip_code": 75001}],
+        })
+
+        assert box.content == Address("Main St", "New York", 10001)
+        assert box.tags == [Address("Lane", "Paris", 75001)]
+
+    def test_deserialize_does_not_modify_input(self):
+        seria = {"$schema": "schema.json", "street": "Main St", "city": "New York", "zip_code": 10001}
+        assert Serializer.deserialize(seria, Address) == Address("Main St", "New York", 10001)
+        assert "$schema" in seria
+
+    def test_validate_caches_schema_file_validator(self, tmp_path):
+        Schema.cache_clear()
+        schema_path = tmp_path / "address.schema.json"
+        schema_path.write_text(json.dumps(ADDRESS_SCHEMA))
+
+        for zip_code in range(5):
+            Serializer.serialize(Address("Main St", "New York", zip_code), schema_file_path=schema_path)
+
+        info = Schema.cache_info()
+        assert (info.misses, info.hits, info.currsize) == (1, 4, 1)
+
+        with pytest.raises(ValidationException):
+            Serializer.validate({"street": 1}, schema_path)
+
+    def test_validate_rebuilds_validator_when_schema_file_changes(self, tmp_path):
+        Schema.cache_clear()
+        schema_path = tmp_path / "address.schema.json"
+        schema_path.write_text(json.dumps(ADDRESS_SCHEMA))
+        Serializer.validate({"street": "Main St"}, schema_path)
+
+        changed_schema = dict(ADDRESS_SCHEMA, required=["street", "city"])
+        schema_path.write_text(json.dumps(changed_schema, indent=2))
+        stat = schema_path.stat()
+        os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with pytest.raises(ValidationException):
+            Serializer.validate({"street": "Main St"}, schema_path)
+        assert Schema.cache_info().misses == 2
+
+    def test_validate_with_compiled_schema(self):
+        schema = Schema("Address", properties={"street": {"type": "string"}}, required=["street"])
+
+        assert schema.compile() is schema.compile()
+        Serializer.validate({"street": "Main St"}, schema)
+        with pytest.raises(ValidationException):
+            Serializer.validate({}, schema)
+
+    def test_compiled_schema_follows_changes(self):
+        properties = {"zip_code": {"type": "integer"}}
+        schema = Schema("Address", properties=properties)
+        Serializer.validate({"zip_code": 1}, schema)
+
+        # The caller's dictionary is copied; changing it does not change the schema.
+        properties["zip_code"]["type"] = "string"
+        Serializer.validate({"zip_code": 1}, schema)
+
+        schema.to_dict()["properties"]["zip_code"]["type"] = "string"
+        with pytest.raises(ValidationException):
+            Serializer.validate({"zip_code": 1}, schema)
+
+    def test_compiled_schema_is_not_compared_per_call(self, monkeypatch):
+        schema = Schema("Address", properties={"zip_code": {"type": "integer"}})
+        validator = schema.compile()
+
+        monkeypatch.setattr(copy, "deepcopy", lambda value: pytest.fail("The schema was copied."))
+        for _ in range(3):
+            assert schema.compile() is validator
+
+    def test_validate_invalid_schema(self):
+        schema = Schema("Broken", type_="not-a-type")
+
+        with pytest.raises(SchemaException):
+            Serializer.validate({}, schema)
+
+    @pytest.mark.parametrize("max_workers", [None, 2])
+    def test_serialize_many(self, max_workers):
+        people = (Person(f"P{i}", i, Address("Main St", "New York", i)) for i in range(25))
+
+        serialized = Serializer.serialize_many(people, chunk_size=4, max_workers=max_workers, parallel_threshold=0)
+
+        assert len(serialized) == 25
+        assert [seria["age"] for seria in serialized] == list(range(25))
+        assert serialized[7]["address"] == {"street": "Main St", "city": "New York", "zip_code": 7}
+
+    @pytest.mark.parametrize("max_workers", [None, 2])
+    def test_deserialize_many(self, max_workers):
+        serias = [
+            {"name": f"P{i}", "age": i, "address": {"street": "Main St", "city": "New York", "zip_code": i}}
+            for i in range(25)
+        ]
+
+        people = Serializer.deserialize_many(serias, Person, chunk_size=4, max_workers=max_workers, parallel_threshold=0)
+
+        assert people == [Person(f"P{i}", i, Address("Main St", "New York", i)) for i in range(25)]
+
+    def test_batch_rejects_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            Serializer.serialize_many([], chunk_size=0)
+
+    def test_dumps_iter_matches_serialize(self):
+        company = Company("TechCorp", [
+            Person("John Doe", 30, Address("Main St", "New York", 10001)),
+            Person("Jane Smith", 25, Address("Second St", "Boston", 2215)),
+        ])
+        company.tags = ("a", ["b", None])
+        company.meta = {"founded": 1999}
+
+        assert "".join(Serializer.dumps_iter(company)) == json.dumps(Serializer.serialize(company))
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_dump_generator_as_array(self, tmp_path, binary):
+        path = tmp_path / "people.json"
+        people = (Person(f"P{i}", i, Address("Main St", "New York", i)) for i in range(100))
+
+        with path.open("wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+            Serializer.dump(people, f, buffer_size=128)
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert len(data) == 100
+        assert data[42] == {"name": "P42", "age": 42, "address": {"street": "Main St", "city": "New York", "zip_code": 42}}
+
+    def test_dump_empty_array(self):
+        assert "".join(Serializer.dumps_iter(iter([]))) == "[]"
+        assert "".join(Serializer.dumps_iter(type("Empty", (), {})())) == "{}"
+
+    @pytest.mark.parametrize("codec", ["json", "auto"])
+    def test_dumps_and_loads_round_trip(self, codec):
+        people = [Person("Jöhn", 30, Address("Main St", "New York", 10001)), Person("Jane", 25, Address("B", "C", 1))]
+
+        text = Serializer.dumps(people, codec=codec)
+        data = Serializer.dumpb(people[0], indent=2, codec=codec)
+
+        assert json.loads(text) == Serializer.serialize_many(people)
+        assert json.loads(data) == Serializer.serialize(people[0])
+        assert Serializer.loads(text, Person, codec=codec) == people
+        assert Serializer.loads(data, Person, codec=codec) == people[0]
@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+from ooj import stream
+
+
+DOCUMENT = {
+    "name": "café \"quoted\" \\ \n",
+    "numbers": [0, -1, 2.5, -3e-7, 12345678901234567890, 1E+3],
+    "flags": [True, False, None],
+    "nested": {"empty_map": {}, "empty_array": [], "deep": [[{"x": [1]}]]},
+}
+
+
+class TestStream:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 65536])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_events_rebuild_document(self, chunk_size, indent):
+        text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=indent is None)
+        events = stream.iter_events(io.StringIO(text), chunk_size)
+
+        _, event, value = next(events)
+        assert stream.build_value(event, value, events) == DOCUMENT
+
+    @pytest.mark.parametrize("text", ['{"a": 1,}', '[1 2]', '{"a" 1}', '[1, 2', 'tru', '{"a": 1} x', '', '1.'])
+    def test_invalid_documents(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            list(stream.iter_events(io.StringIO(text), 2))
+
+    def test_iter_items_of_nested_array(self):
+        text = json.dumps({"skip": [1, 2, {"a": 3}], "data": {"records": [{"id": i} for i in range(10)]}})
+
+        assert list(stream.iter_items(io.StringIO(text), ["data", "records"], 5)) == [{"id": i} for i in range(10)]
+
+    def test_iter_items_stops_after_container(self):
+        reader = io.StringIO('{"items": [1, 2, 3], "rest": [' + "1, " * 1000 + "1]}")
+
+        assert list(stream.iter_items(reader, ["items"], 16)) == [1, 2, 3]
+        assert reader.tell() < 100
+
+    @pytest.mark.parametrize("chunk_size", [1, 4, 65536])
+    def test_error_position(self, chunk_size):
+        text = '{\n  "a": [1,\n  2 3]}'
+        with pytest.raises(json.JSONDecodeError) as error:
+            list(stream.iter_events(io.StringIO(text), chunk_size))
+
+        assert (error.value.pos, error.value.lineno, error.value.colno) == (17, 3, 5)
+        assert str(error.value).endswith("line 3 column 5 (char 17)")
+
+    def test_read_entry_stops_after_value(self):
+        reader = io.StringIO('{"first": {"a": [1, 2]}, "second": ' + "1" * 1000 + "}")
+
+        assert stream.read_entry(reader, ["first", "a"], 16) == [1, 2]
+        assert reader.tell() < 100
@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from ooj.http_cache import HttpCache
+from ooj.url import FetchResult, JsonURL
+
+BASE_PATH = Path('tests/files/test_url_cache')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so connection reuse can be observed through the client ports.
+    protocol_version = "HTTP/1.1"
+
+    # path -> [body, validator header, validator value]; the server adds
+    # "requests", "ports" and the "active"/"peak" counts of parallel requests.
+    documents = {}
+
+    def do_GET(self):
+        server = self.server
+        with server.counter_lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.ports.add(self.client_address[1])
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            self._respond()
+        finally:
+            with server.counter_lock:
+                server.active -= 1
+
+    def _respond(self):
+        if self.path.startswith("/slow/"):
+            time.sleep(0.05)
+            self.documents[self.path] = [{"id": int(self.path[6:])}, "ETag", '"slow"']
+
+        document = self.documents.get(self.path)
+        if document is None:
+            self._send_empty(404)
+            return
+
+        body, header, value = document
+        condition = "If-None-Match" if header == "ETag" else "If-Modified-Since"
+        if self.headers.get(condition) == value:
+            self._send_empty(304)
+            return
+
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_empty(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestJsonURL:
+    @pytest.fixture(autouse=True)
+    def http_server(self):
+        _Handler.documents = {
+            "/etag": [{"name": "etag"}, "ETag", '"v1"'],
+            "/modified": [{"name": "modified"}, "Last-Modified", "Wed, 21 Oct 2015 07:28:00 GMT"],
+        }
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        server.requests = []
+        server.ports = set()
+        server.counter_lock = threading.Lock()
+        server.active = server.peak = 0
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.server = server
+        self.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        yield
+        server.shutdown()
+        server.server_close()
+        for fp in BASE_PATH.glob("*.json"):
+            fp.unlink()
+
+    def test_load_without_cache(self):
+        """Тестирование загрузки данных без кэша."""
+        assert JsonURL(self.base_url + "/etag").load_from_url() == {"name": "etag"}
+        assert JsonURL(self.base_url + "/etag").load_from_url() == {"name": "etag"}
+        assert len(self.server.requests) == 2
+
+    def test_fresh_response_makes_no_request(self):
+        """Тестирование ответа из кэша в пределах TTL без обращения к сети."""
+        cache = HttpCache(ttl=60)
+        first = JsonURL(self.base_url + "/etag", cache=cache).load_from_url()
+        second = JsonURL(self.base_url + "/etag", cache=cache).load_from_url()
+
+        assert second is first
+        assert len(self.server.requests) == 1
+
+    @pytest.mark.parametrize("path, header", [("/etag", "If-None-Match"),
+                                              ("/modified", "If-Modified-Since")])
+    def test_not_modified_reuses_parsed_data(self, path, header):
+        """Тестирование условного запроса и повторного использования данных при 304."""
+        cache = HttpCache(ttl=0)
+        first = JsonURL(self.base_url + path, cache=cache).load_from_url()
+        second = JsonURL(self.base_url + path, cache=cache).load_from_url()
+
+        assert second is first
+        assert len(self.server.requests) == 2
+        assert header in self.server.requests[1][1]
+
+    def test_changed_response_is_reloaded(self):
+        """Тестирование загрузки измененного документа."""
+        cache = HttpCache(ttl=0)
+        JsonURL(self.base_url + "/etag", cache=cache)
+        _Handler.documents["/etag"] = [{"name": "changed"}, "ETag", '"v2"']
+
+        assert JsonURL(self.base_url + "/etag", cache=cache).load_from_url() == {"name": "changed"}
+        assert cache.get(self.base_url + "/etag").etag == '"v2"'
+
+    def test_disk_cache(self):
+        """Тестирование дискового кэша, общего для разных экземпляров кэша."""
+        JsonURL(self.base_url + "/etag", cache=HttpCache(BASE_PATH, ttl=60))
+        assert JsonURL(self.base_url + "/etag",
+                       cache=HttpCache(BASE_PATH, ttl=60)).load_from_url() == {"name": "etag"}
+        assert len(self.server.requests) == 1
+
+        assert JsonURL(self.base_url + "/etag",
+                       cache=HttpCache(BASE_PATH, ttl=0)).load_from_url() == {"name": "etag"}
+        assert self.server.requests[1][1]["If-None-Match"] == '"v1"'
+
+    def test_errors_are_not_cached(self):
+        """Тестирование того, что ошибочные ответы не кэшируются."""
+        cache = HttpCache(ttl=60)
+        with pytest.raises(Exception):
+            JsonURL(self.base_url + "/missing", cache=cache)
+        assert cache.get(self.base_url + "/missing") is None
+
+    def test_output_file(self):
+        """Тестирование сохранения загруженных данных в файл."""
+        BASE_PATH.mkdir(parents=True, exist_ok=True)
+        fp = BASE_PATH / "output.json"
+        JsonURL(self.base_url + "/etag", output_file_path=fp)
+
+        assert json.loads(fp.read_text()) == {"name": "etag"}
+
+    def test_connections_are_reused(self):
+        """Тестирование повторного использования соединений общей сессией."""
+        for _ in range(3):
+            JsonURL(self.base_url + "/etag")
+        assert len(self.server.ports) == 1
+
+    def test_fetch_many(self):
+        """Тестирование параллельной загрузки с результатами в исходном порядке."""
+        urls = [f"{self.base_url}/slow/{i}" for i in range(12)]
+        urls += [self.base_url + "/missing", "not a url", urls[0]]
+
+        results = JsonURL.fetch_many(urls, max_workers=8, max_per_host=3)
+
+        assert [result.url for result in results] == urls
+        assert [result.data for result in results[:12]] == [{"id": i} for i in range(12)]
+        assert all(isinstance(result, FetchResult) and result.ok for result in results[:12])
+        assert not results[12].ok and not results[13].ok
+        assert isinstance(results[13].error, ValueError)
+        assert results[14] == results[0]
+
+        # Every URL but the invalid one is requested once, at most 3 at a time.
+        assert len(self.server.requests) == 13
+        assert 1 < self.server.peak <= 3
+
+    def test_fetch_many_with_cache(self):
+        """Тестирование параллельной загрузки через кэш."""
+        cache = HttpCache(ttl=60)
+        JsonURL(self.base_url + "/etag", cache=cache)
+
+        results = JsonURL.fetch_many([self.base_url + "/etag", self.base_url + "/modified"], cache=cache)
+
+        assert [result.data for result in results] == [{"name": "etag"}, {"name": "modified"}]
+        assert len(self.server.requests) == 2